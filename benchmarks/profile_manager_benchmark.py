@@ -0,0 +1,66 @@
+"""Time ProfileManager lookups, saves and deletes on a large profiles file.
+
+Usage: python benchmarks/profile_manager_benchmark.py [--profiles 50000]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.profile_manager import ProfileManager
+
+
+def _timed(label: str, func, repeat: int = 1):
+    """Run func repeat times and print the mean time per call"""
+    # ProfileManager reports every write on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+    mean_ms = (time.perf_counter() - start) * 1000.0 / repeat
+    print(f"{label:<32} {mean_ms:10.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=50000, help="Number of profiles in the file")
+    parser.add_argument("--repeat", type=int, default=1000, help="Repetitions for lookups")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        profiles_file = os.path.join(temp_dir, "profiles.json")
+        with open(profiles_file, 'w') as f:
+            json.dump([asdict(ConnectionProfile(name=f"host{i}", host=f"10.0.{i // 256}.{i % 256}",
+                                                username="admin"))
+                       for i in range(args.profiles)], f, indent=2)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager = ProfileManager(None, None, profiles_file=profiles_file)
+        last = f"host{args.profiles - 1}"
+
+        print(f"{args.profiles} profiles")
+        _timed("first load", manager.get_all_profiles)
+        _timed("get_profile_by_name", lambda: manager.get_profile_by_name(last), args.repeat)
+        _timed("get_profile_index", lambda: manager.get_profile_index(last), args.repeat)
+        _timed("get_profile_at", lambda: manager.get_profile_at(args.profiles - 1), args.repeat)
+        _timed("save_profile (update)",
+               lambda: manager.save_profile(ConnectionProfile(name=last, host="10.9.9.9", username="root")), 10)
+        _timed("save_profile (new)",
+               lambda: manager.save_profile(ConnectionProfile(name="new", host="10.9.9.9", username="root")))
+        _timed("delete_profile", lambda: manager.delete_profile("new"))
+
+        # Another writer touches the file: the next lookup reloads it
+        os.utime(profiles_file, ns=(0, 0))
+        _timed("reload after external change", lambda: manager.get_profile_by_name(last))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Throughput and latency of fleet queries against simulated QnA endpoints.
+
+Usage: python benchmarks/qna_benchmark.py [--hosts 1 10 100 1000] [--transport ssh|fake]
+
+Each level queries that many simulated hosts at once through FleetExecutor, so the numbers
+cover SSHManager (or the in-process fake transport), QnACommandBuilder and output parsing.
+Every run is appended to a JSON-lines history and compared with the median of the last five
+runs of the same configuration; a drop in queries/sec or a rise in p95 latency beyond
+--tolerance is reported as a regression (and fails the run with --fail-on-regression).
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.qna_simulator import SimulatedSSHServer
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.fake_transport import FakeQnA, FakeTransport
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+
+SIMULATED_TRANSPORT = "simulated"
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "qna_benchmark.jsonl")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+def _answered_error(result: HostResult) -> bool:
+    """Whether QnA answered the query with an E: line"""
+    return bool(result.answer_set and result.answer_set.errors)
+
+
+def _profiles(args: argparse.Namespace, hosts: int, port: int) -> List[ConnectionProfile]:
+    """One profile per simulated host; distinct usernames keep every connection separate"""
+    if args.transport == "fake":
+        return [ConnectionProfile(name=f"sim{i}", host=f"sim{i}", os=OSType.LINUX.value,
+                                  qna_path="/opt/BESClient/bin/qna", transport=SIMULATED_TRANSPORT)
+                for i in range(hosts)]
+    qna_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "qna_simulator.py"))
+    return [ConnectionProfile(name=f"sim{i}", host="127.0.0.1", port=port, username=f"sim{i}",
+                              password="simulated", os=OSType.LINUX.value, qna_path=qna_path)
+            for i in range(hosts)]
+
+
+def run_level(args: argparse.Namespace, hosts: int, port: int) -> Dict:
+    """Query every simulated host once per query and summarize the run"""
+    queries = [f'number of processes whose (name of it = "service{i}")' for i in range(args.queries)]
+    tracker = LatencyTracker(window=hosts * (args.queries + 1))
+    executor = FleetExecutor(max_workers=hosts, host_timeout=args.timeout, tracker=tracker)
+
+    start = time.perf_counter()
+    results = list(executor.execute_many(_profiles(args, hosts, port), queries, use_batch=args.batch))
+    wall = time.perf_counter() - start
+
+    # E: answers are the simulated QnA doing its job; failed means no answer came back at all
+    qna_errors = sum(1 for result in results if _answered_error(result))
+    failed = [result for result in results if not result.success and not _answered_error(result)]
+    latencies = sorted(result.duration * 1000.0 for result in results
+                       if result.success or _answered_error(result))
+    connect = tracker.percentiles("connect") or {}
+    return {
+        'hosts': hosts,
+        'results': len(results),
+        'failed': len(failed),
+        'qna_errors': qna_errors,
+        'wall_s': round(wall, 3),
+        'queries_per_s': round(len(latencies) / wall, 1) if wall else 0.0,
+        'p50_ms': round(_percentile(latencies, 0.50), 2),
+        'p95_ms': round(_percentile(latencies, 0.95), 2),
+        'p99_ms': round(_percentile(latencies, 0.99), 2),
+        'connect_p95_ms': round(connect.get('p95', 0.0) * 1000.0, 2),
+        'first_error': failed[0].error if failed else "",
+    }
+
+
+def _config(args: argparse.Namespace) -> Dict:
+    """Settings a run must share with an earlier one to be comparable"""
+    return {
+        'transport': args.transport, 'shell': args.shell, 'batch': args.batch,
+        'queries': args.queries, 'answers': args.answers, 'delay_ms': args.delay_ms,
+        'error_rate': args.error_rate,
+    }
+
+
+def _baseline(history: str, config: Dict, hosts: int, runs: int = 5) -> Optional[Dict]:
+    """Median numbers of the last runs recorded with the same configuration"""
+    if not os.path.exists(history):
+        return None
+    previous = []
+    with open(history, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('config') == config and record.get('hosts') == hosts:
+                previous.append(record)
+    if not previous:
+        return None
+    previous = previous[-runs:]
+    return {metric: statistics.median(record[metric] for record in previous)
+            for metric in ('queries_per_s', 'p95_ms', 'failed')}
+
+
+def _regressions(level: Dict, baseline: Optional[Dict], tolerance: float) -> List[str]:
+    """What got worse than the baseline by more than tolerance"""
+    if baseline is None:
+        return []
+    problems = []
+    if level['queries_per_s'] < baseline['queries_per_s'] * (1.0 - tolerance):
+        problems.append(f"queries/s {baseline['queries_per_s']} -> {level['queries_per_s']}")
+    if level['p95_ms'] > baseline['p95_ms'] * (1.0 + tolerance):
+        problems.append(f"p95 {baseline['p95_ms']} ms -> {level['p95_ms']} ms")
+    if level['failed'] > baseline['failed']:
+        problems.append(f"failed {baseline['failed']} -> {level['failed']}")
+    return problems
+
+
+def _raise_file_limit(hosts: int):
+    """Every simulated host holds sockets on both ends of its connection"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = hosts * 8 + 256
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, nargs="+", default=[1, 10, 100, 1000],
+                        help="Concurrent simulated hosts per level")
+    parser.add_argument("--transport", choices=["ssh", "fake"], default="ssh",
+                        help="ssh: through the local SSH server stand-in; fake: in-process")
+    parser.add_argument("--shell", action="store_true",
+                        help="Have the SSH stand-in start the fake QnA executable for every command")
+    parser.add_argument("--batch", action="store_true", help="Send each host's queries in one batch")
+    parser.add_argument("--queries", type=int, default=5, help="Queries per host")
+    parser.add_argument("--answers", type=int, default=10, help="Answers per query")
+    parser.add_argument("--delay-ms", type=float, default=1.0, help="Simulated evaluation time per query")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of queries answering E:")
+    parser.add_argument("--timeout", type=int, default=300, help="Per-host timeout in seconds")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON-lines file the results are appended to")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before reporting a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    _raise_file_limit(max(args.hosts))
+    simulator = FakeQnA(eval_time_ms=args.delay_ms, answer_count=args.answers,
+                        error_rate=args.error_rate, seed=0)
+    TransportFactory.register(SIMULATED_TRANSPORT,
+                              lambda pool, tracker: FakeTransport(qna=simulator, tracker=tracker))
+    # The fake QnA executable reads its settings from the environment the SSH stand-in passes on
+    os.environ.update(QNA_SIM_ANSWERS=str(args.answers), QNA_SIM_DELAY_MS=str(args.delay_ms),
+                      QNA_SIM_ERROR_RATE=str(args.error_rate))
+
+    server = None
+    if args.transport == "ssh":
+        server = SimulatedSSHServer(simulator, shell=args.shell)
+        server.start()
+
+    config = _config(args)
+    regressions = []
+    os.makedirs(os.path.dirname(os.path.abspath(args.history)), exist_ok=True)
+    print(f"{'hosts':>6} {'queries/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'connect p95':>12} {'failed':>7} {'E:':>5}")
+    try:
+        for hosts in args.hosts:
+            level = run_level(args, hosts, server.port if server else 0)
+            print(f"{hosts:>6} {level['queries_per_s']:>10} {level['p50_ms']:>9} {level['p95_ms']:>9} "
+                  f"{level['p99_ms']:>9} {level['connect_p95_ms']:>12} {level['failed']:>7} "
+                  f"{level['qna_errors']:>5}")
+            if level['first_error']:
+                print(f"       ✗ {level['first_error']}")
+
+            problems = _regressions(level, _baseline(args.history, config, hosts), args.tolerance)
+            regressions.extend(f"{hosts} hosts: {problem}" for problem in problems)
+
+            record = {'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"), 'python': platform.python_version(),
+                      'machine': platform.node(), 'config': config}
+            record.update(level)
+            with open(args.history, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + "\n")
+    finally:
+        if server is not None:
+            server.stop()
+
+    for regression in regressions:
+        print(f"✗ Regression at {regression}")
+    if not regressions:
+        print(f"✓ No regressions (results appended to {args.history})")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
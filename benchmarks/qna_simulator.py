@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""Simulated QnA endpoints: a fake QnA executable and a local SSH server stand-in.
+
+Usage:
+    python benchmarks/qna_simulator.py [qna] [FILE] [--answers 3 --delay-ms 5 --error-rate 0.01]
+    python benchmarks/qna_simulator.py serve [--port 2222 --shell]
+
+The qna command reads relevance from FILE or stdin like the real QnA and prints Q:/A:/E:/T:
+lines; QNA_SIM_ANSWERS, QNA_SIM_DELAY_MS and QNA_SIM_ERROR_RATE set its defaults, so it can
+be used as a profile's QnA path (qna is the default command). The serve command accepts any
+password and answers the commands QnACommandBuilder builds, in-process by default or through
+a real shell with --shell.
+"""
+import argparse
+import logging
+import os
+import socket
+import subprocess
+import sys
+import threading
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.fake_transport import FakeQnA, FakeTransport
+
+
+LOG_CHANNEL = "qna_simulator.ssh"
+logging.getLogger(LOG_CHANNEL).addHandler(logging.NullHandler())
+
+
+def _interface_class():
+    """paramiko ServerInterface that accepts any password and hands exec requests to the server"""
+    import paramiko
+
+    class SimulatedInterface(paramiko.ServerInterface):
+        def __init__(self, server: "SimulatedSSHServer"):
+            self.server = server
+
+        def get_allowed_auths(self, username):
+            return "password"
+
+        def check_auth_password(self, username, password):
+            return paramiko.AUTH_SUCCESSFUL
+
+        def check_channel_request(self, kind, chanid):
+            return paramiko.OPEN_SUCCEEDED
+
+        def check_channel_exec_request(self, channel, command):
+            threading.Thread(target=self.server.run_command, args=(channel, command.decode()),
+                             daemon=True).start()
+            return True
+
+    return SimulatedInterface
+
+
+class SimulatedSSHServer:
+    """Threaded paramiko SSH server standing in for any number of Unix endpoints"""
+
+    def __init__(self, qna: Optional[FakeQnA] = None, host: str = "127.0.0.1", port: int = 0,
+                 shell: bool = False):
+        self.qna = qna or FakeQnA(answer_count=1)
+        self.host = host
+        self.port = port
+        self.shell = shell
+        self._socket = None
+        self._transports = []
+        self._lock = threading.Lock()
+
+    def start(self) -> int:
+        """Listen in the background and return the port"""
+        import paramiko
+
+        self._host_key = paramiko.RSAKey.generate(2048)
+        self._interface = _interface_class()
+        self._socket = socket.socket()
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((self.host, self.port))
+        self._socket.listen(1024)
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self.port
+
+    def stop(self):
+        """Stop listening and drop every connection"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        with self._lock:
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _accept_loop(self):
+        import paramiko
+
+        while self._socket is not None:
+            try:
+                client, _ = self._socket.accept()
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self._host_key)
+            # Clients dropping their connection is routine here, not worth a traceback
+            transport.set_log_channel(LOG_CHANNEL)
+            # With an event, negotiation runs on the transport's own thread
+            transport.start_server(event=threading.Event(), server=self._interface(self))
+            with self._lock:
+                self._transports = [t for t in self._transports if t.is_active()]
+                self._transports.append(transport)
+
+    def run_command(self, channel, command: str):
+        """Answer one exec request and report its exit status"""
+        try:
+            if self.shell:
+                exit_status = self._run_shell(channel, command)
+            else:
+                exit_status = self._run_fake(channel, command)
+            channel.send_exit_status(exit_status)
+            channel.close()
+        except Exception:
+            # The client already went away
+            pass
+
+    def _run_fake(self, channel, command: str) -> int:
+        """Interpret the command with FakeTransport, as an endpoint with a QnA would run it"""
+        transport = FakeTransport(qna=self.qna)
+        transport.connect(ConnectionProfile(name="simulated", host="simulated", os=OSType.LINUX.value))
+        fake_channel = transport.open_process(command)
+        return self._pump(channel, fake_channel.sendall, fake_channel.shutdown_write,
+                          fake_channel.recv, fake_channel.recv_stderr, fake_channel.recv_exit_status,
+                          fake_channel.close)
+
+    def _run_shell(self, channel, command: str) -> int:
+        """Run the command in a real shell, process start-up included"""
+        process = subprocess.Popen(command, shell=True, stdin=subprocess.PIPE,
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+        def write(data: bytes):
+            process.stdin.write(data)
+            process.stdin.flush()
+
+        return self._pump(channel, write, process.stdin.close, process.stdout.read1,
+                          process.stderr.read1, process.wait, process.kill)
+
+    @staticmethod
+    def _pump(channel, write, close_input, read, read_stderr, wait, kill) -> int:
+        """Copy the SSH channel's stdin to a command and its output back"""
+        # paramiko acknowledges the exec request only after the handler returned; the client
+        # writes (or closes stdin) once it has that reply, so until then the channel stays open
+        acknowledged = threading.Event()
+
+        def copy_input():
+            try:
+                for data in iter(lambda: channel.recv(32768), b""):
+                    acknowledged.set()
+                    write(data)
+                close_input()
+            except Exception:
+                pass
+            finally:
+                acknowledged.set()
+
+        def copy_stderr():
+            for data in iter(lambda: read_stderr(32768), b""):
+                channel.sendall_stderr(data)
+
+        threading.Thread(target=copy_input, daemon=True).start()
+        stderr_thread = threading.Thread(target=copy_stderr, daemon=True)
+        stderr_thread.start()
+        try:
+            for data in iter(lambda: read(32768), b""):
+                channel.sendall(data)
+        except Exception:
+            # The client went away (e.g. a cancelled query); stop the command too
+            kill()
+            raise
+        stderr_thread.join()
+        acknowledged.wait(30)
+        return wait()
+
+
+def qna(args: argparse.Namespace) -> int:
+    """Behave like the QnA executable"""
+    simulator = FakeQnA(eval_time_ms=args.delay_ms, answer_count=args.answers,
+                        error_rate=args.error_rate, seed=args.seed)
+    source = open(args.file, 'r', encoding='utf-8') if args.file else sys.stdin
+    try:
+        for line in source:
+            # Line by line with a flush, so interactive sessions see each answer at once
+            sys.stdout.write(simulator.evaluate(line))
+            sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Run the SSH server stand-in until interrupted"""
+    simulator = FakeQnA(eval_time_ms=args.delay_ms, answer_count=args.answers,
+                        error_rate=args.error_rate, seed=args.seed)
+    server = SimulatedSSHServer(simulator, host=args.host, port=args.port, shell=args.shell)
+    print(f"✓ Simulated SSH endpoint listening on {args.host}:{server.start()}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    qna_parser = commands.add_parser("qna", help="Act as the QnA executable")
+    qna_parser.add_argument("file", nargs="?", help="Relevance file (default: stdin)")
+    qna_parser.set_defaults(func=qna)
+
+    serve_parser = commands.add_parser("serve", help="Run the SSH server stand-in")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=2222)
+    serve_parser.add_argument("--shell", action="store_true",
+                              help="Run commands in a shell instead of answering them in-process")
+    serve_parser.set_defaults(func=serve)
+
+    for sub in (qna_parser, serve_parser):
+        sub.add_argument("--answers", type=int, default=int(os.environ.get("QNA_SIM_ANSWERS", "1")),
+                         help="Answers per query")
+        sub.add_argument("--delay-ms", type=float, default=float(os.environ.get("QNA_SIM_DELAY_MS", "0")),
+                         help="Evaluation time per query")
+        sub.add_argument("--error-rate", type=float,
+                         default=float(os.environ.get("QNA_SIM_ERROR_RATE", "0")),
+                         help="Fraction of queries answering with E:")
+        sub.add_argument("--seed", type=int, help="Seed for reproducible errors")
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ("qna", "serve", "-h", "--help"):
+        # Run as a profile's QnA path, which is invoked without arguments or with a file
+        argv.insert(0, "qna")
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Time as-you-type searches of the query history at 100k stored queries.
+
+Usage: python benchmarks/query_history_benchmark.py [--queries 100000]
+
+Queries are built from a small relevance vocabulary, so common words such as "of" match most
+of the history, which is the slow case for ranking.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bigfix_universal_remote_qna.services.query_history_store import QueryHistoryStore
+
+WORDS = ("names of running services version of client exists file whose name of folder windows system "
+         "value of setting registry key software bigfix enterprise operating ram size free space drive "
+         "ip addresses adapters network mac address processes pid packages rpm debian installed "
+         "applications lines containing now time uptime").split()
+
+SEARCHES = ("", "n", "na", "of", "names of", "version of cl", "running services version", "zzz")
+
+
+def _timed(label: str, func, repeat: int = 1):
+    """Run func repeat times and print the mean time per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    mean_ms = (time.perf_counter() - start) * 1000.0 / repeat
+    print(f"{label:<40} {mean_ms:10.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", type=int, default=100000, help="Number of stored queries")
+    parser.add_argument("--repeat", type=int, default=100, help="Repetitions per search")
+    parser.add_argument("--limit", type=int, default=15, help="Suggestions per search")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    now = time.time()
+    queries = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10))) + f" {i}"
+               for i in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = QueryHistoryStore(os.path.join(temp_dir, "history.db"))
+        start = time.perf_counter()
+        store.add_runs(queries, now - 30 * 86400)
+        # Some queries are run again, at random times over the last month
+        for query in rng.sample(queries, len(queries) // 5):
+            store.add_run(query, now - rng.random() * 30 * 86400)
+        print(f"{store.count()} queries stored in {time.perf_counter() - start:.1f} s")
+
+        _timed("add_run", lambda: store.add_run(rng.choice(queries)), 100)
+        for text in SEARCHES:
+            # The first search after a run rebuilds the in-memory window
+            store.add_run(queries[0])
+            _timed(f"search {text!r} (first)", lambda: store.search(text, args.limit))
+            _timed(f"search {text!r}", lambda: store.search(text, args.limit), args.repeat)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time SQLiteProfileStore targeting selections on a large inventory.
+
+Usage: python benchmarks/sqlite_profile_store_benchmark.py [--profiles 100000]
+
+Profiles get one of three OSes, a site, a group and two to four of a handful of tags, so
+selections range from a few thousand profiles (os + tag + site) to a third of them (os).
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.sqlite_profile_store import SQLiteProfileStore
+
+OSES = ("windows", "linux", "mac")
+TAGS = ("prod", "dev", "test", "dmz", "db", "web", "pci", "legacy")
+SITES = [f"site{i}" for i in range(8)]
+GROUPS = [f"group{i}" for i in range(50)]
+
+SELECTIONS = [
+    ("os+tag+site", dict(os="linux", tags=["prod"], site="site3")),
+    ("group", dict(group="group7")),
+    ("tags=prod", dict(tags=["prod"])),
+    ("tags=prod,db", dict(tags=["prod", "db"])),
+    ("os=linux", dict(os="linux")),
+    ("name_like", dict(name_like="host12%")),
+]
+
+
+def _timed(label: str, func, repeat: int = 1):
+    """Run func repeat times and print the mean time per call and the result size"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    mean_ms = (time.perf_counter() - start) * 1000.0 / repeat
+    print(f"{label:<32} {mean_ms:10.3f} ms  {len(result):>7} profiles")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=100000, help="Number of stored profiles")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetitions per selection")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    profiles = [ConnectionProfile(name=f"host{i}", host=f"10.{i // 65536}.{i // 256 % 256}.{i % 256}",
+                                  username="admin", os=rng.choice(OSES), site=rng.choice(SITES),
+                                  group=rng.choice(GROUPS), tags=rng.sample(TAGS, rng.randint(2, 4)),
+                                  last_seen=rng.random() * 1e9)
+                for i in range(args.profiles)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = SQLiteProfileStore(os.path.join(temp_dir, "profiles.db"))
+        start = time.perf_counter()
+        store.save_profiles(profiles)
+        print(f"{store.count()} profiles stored in {time.perf_counter() - start:.1f} s")
+
+        for label, criteria in SELECTIONS:
+            _timed(f"select {label}", lambda: store.select(**criteria), args.repeat)
+        _timed("get_profile_by_name", lambda: [store.get_profile_by_name("host99")], 1000)
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import sys
+from bigfix_universal_remote_qna.cli import main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+"""Headless command-line entry point: python -m bigfix_universal_remote_qna run ...
+
+Must never import tkinter (directly or through the GUI modules) so it starts fast
+and runs on minimal, display-less machines.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from dataclasses import replace
+from typing import Dict, List, Optional, TextIO
+
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.models.os_type import OSType, DEFAULT_QNA_PATHS
+from bigfix_universal_remote_qna.models.transport_type import TransportType
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bigfix_universal_remote_qna",
+        description="Run BigFix relevance queries over SSH without the GUI"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run = subparsers.add_parser("run", help="Run queries against profiles or hosts, writing JSON lines")
+    
+    targets = run.add_argument_group("targets")
+    targets.add_argument("--profile", action="append", default=[], metavar="NAME",
+                         help="Saved profile name (repeatable)")
+    targets.add_argument("--all-profiles", action="store_true", help="Use every saved profile")
+    _add_store_arguments(targets)
+    _add_selector_arguments(targets)
+    targets.add_argument("--host", action="append", default=[], metavar="USER@HOST[:PORT]",
+                         help="Ad-hoc host (repeatable)")
+    targets.add_argument("--hosts-file", help="File with one USER@HOST[:PORT] per line")
+    targets.add_argument("--os", default=OSType.LINUX.value, choices=[e.value for e in OSType],
+                         help="OS of ad-hoc hosts (default: %(default)s)")
+    targets.add_argument("--transport", default=TransportType.SSH.value,
+                         choices=[e.value for e in TransportType],
+                         help="Transport for ad-hoc hosts; 'local' runs QnA on this machine (default: %(default)s)")
+    targets.add_argument("--password-env", default="BIGFIX_QNA_PASSWORD",
+                         help="Environment variable holding the password for ad-hoc hosts")
+    targets.add_argument("--master-key-env", default="BIGFIX_QNA_MASTER_KEY",
+                         help="Environment variable holding the master key passphrase for saved profiles")
+    
+    queries = run.add_argument_group("queries")
+    queries.add_argument("--query", action="append", default=[], help="Relevance query (repeatable)")
+    queries.add_argument("--queries-file", help="File with one relevance query per line ('-' for stdin)")
+    queries.add_argument("--qna-path", help="QnA path override for all targets")
+    queries.add_argument("--probe", action="store_true",
+                         help="Detect each host's OS and QnA path with one command, cached in "
+                              "~/.bigfix_host_probes.json")
+    queries.add_argument("--batch", action="store_true",
+                         help="Send each host's queries to a single QnA invocation")
+    queries.add_argument("--no-precheck", action="store_true",
+                         help="Send queries even if the local relevance syntax check finds a problem")
+    
+    run.add_argument("--output", "-o", help="Write JSON lines here instead of stdout")
+    run.add_argument("--group-answers", action="store_true",
+                     help="Write one line per group of hosts with identical answers instead of one per host")
+    run.add_argument("--export", metavar="FILE",
+                     help="Also write one row per (host, query, answer) to FILE; "
+                          "format by extension: .xlsx, .csv or .jsonl")
+    run.add_argument("--max-workers", type=int, default=10, help="Hosts queried concurrently")
+    run.add_argument("--timeout", type=int, default=60, help="Per-host, per-query timeout in seconds")
+    
+    polling = run.add_argument_group("polling")
+    polling.add_argument("--poll", type=float, metavar="SECONDS",
+                         help="Re-run the queries every SECONDS until interrupted, writing only changed answers")
+    polling.add_argument("--poll-jitter", type=float, default=0.1,
+                         help="Random spread of the poll interval as a fraction of it (default: %(default)s)")
+    polling.add_argument("--poll-max-backoff", type=float, default=300.0,
+                         help="Longest wait in seconds between polls of a failing host (default: %(default)s)")
+    
+    profiles = subparsers.add_parser("profiles", help="Bulk import or export saved profiles")
+    profiles.add_argument("action", choices=["import", "export"])
+    profiles.add_argument("file", help="JSON or CSV file (format chosen by extension)")
+    _add_store_arguments(profiles)
+    _add_selector_arguments(profiles)
+    
+    return parser.parse_args(argv)
+
+
+def _add_store_arguments(group):
+    """Options choosing where saved profiles live"""
+    group.add_argument("--profiles-file", default=os.path.expanduser("~/.bigfix_profiles.json"),
+                       help="Profiles JSON file (default: %(default)s)")
+    group.add_argument("--profiles-db", help="Use this SQLite profile database instead of the JSON file")
+
+
+def _add_selector_arguments(group):
+    """Options selecting saved profiles by inventory fields"""
+    group.add_argument("--tag", action="append", default=[], help="Saved profiles carrying this tag (repeatable)")
+    group.add_argument("--group", help="Saved profiles in this group")
+    group.add_argument("--site", help="Saved profiles at this site")
+    group.add_argument("--target-os", choices=[e.value for e in OSType],
+                       help="Saved profiles whose (detected) OS is this")
+
+
+def _has_selector(args: argparse.Namespace) -> bool:
+    return bool(args.tag or args.group or args.site or args.target_os)
+
+
+def _profile_manager(args: argparse.Namespace, security_manager=None):
+    """ProfileManager for the store chosen on the command line"""
+    from bigfix_universal_remote_qna.services.profile_manager import ProfileManager
+    
+    # ProfileManager reports on stdout, which carries the JSON lines here
+    with contextlib.redirect_stdout(sys.stderr):
+        return ProfileManager(None, security_manager, profiles_file=args.profiles_file,
+                              db_file=args.profiles_db)
+
+
+def _select(profile_manager, args: argparse.Namespace) -> List[ConnectionProfile]:
+    """Saved profiles matching the selector options"""
+    return profile_manager.select(os=args.target_os, tags=args.tag, group=args.group, site=args.site)
+
+
+def _read_lines(path: str) -> List[str]:
+    """Non-empty, non-comment lines of a file ('-' reads stdin)"""
+    handle = sys.stdin if path == "-" else open(path, 'r', encoding='utf-8')
+    try:
+        return [line.strip() for line in handle if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def _parse_host(spec: str, os_type: str, password: str,
+                transport: str = TransportType.SSH.value) -> ConnectionProfile:
+    """Profile for a USER@HOST[:PORT] spec"""
+    username, _, address = spec.rpartition("@")
+    host, _, port = address.partition(":")
+    return ConnectionProfile(
+        name=spec, host=host, port=int(port) if port else 22,
+        username=username, password=password, os=os_type, transport=transport
+    )
+
+
+def _load_profiles(args: argparse.Namespace) -> List[ConnectionProfile]:
+    """Resolve profile names and ad-hoc hosts into connectable profiles"""
+    profiles = []
+    
+    if args.profile or args.all_profiles or _has_selector(args):
+        from bigfix_universal_remote_qna.services.security_manager import SecurityManager
+        
+        security_manager = SecurityManager()
+        profile_manager = _profile_manager(args, security_manager)
+        if args.all_profiles:
+            saved = profile_manager.get_all_profiles()
+        else:
+            saved = profile_manager.get_profiles_by_names(args.profile)
+            if _has_selector(args):
+                saved += [profile for profile in _select(profile_manager, args)
+                          if profile.name not in set(args.profile)]
+        
+        missing = set(args.profile) - {profile.name for profile in saved}
+        if missing:
+            raise SystemExit(f"Unknown profile(s): {', '.join(sorted(missing))}")
+        
+        passphrase = os.environ.get(args.master_key_env, "")
+        if passphrase:
+            record = _master_key_record()
+            if not record:
+                print(f"✗ No master key is set up in the shared configuration; ignoring {args.master_key_env}",
+                      file=sys.stderr)
+            elif not security_manager.unlock(passphrase, record):
+                raise SystemExit("Master key passphrase is incorrect")
+        
+        for profile in saved:
+            if profile.password:
+                try:
+                    password = security_manager.decrypt_profile_password(
+                        profile.password, f"{profile.username}@{profile.host}")
+                except RuntimeError as e:
+                    raise SystemExit(f"{e} (set {args.master_key_env})")
+                profile = replace(profile, password=password)
+            profiles.append(profile)
+    
+    host_specs = list(args.host)
+    if args.hosts_file:
+        host_specs.extend(_read_lines(args.hosts_file))
+    if host_specs:
+        password = os.environ.get(args.password_env, "")
+        profiles.extend(_parse_host(spec, args.os, password, args.transport) for spec in host_specs)
+    
+    if args.qna_path:
+        profiles = [replace(profile, qna_path=args.qna_path) for profile in profiles]
+    return profiles
+
+
+def _master_key_record() -> str:
+    """The profile store master key record from the shared configuration, "" when unavailable"""
+    try:
+        from bigfix_universal_remote_qna.services.config_initializer import ConfigInitializer
+    except ImportError:
+        return ""
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        config_manager = ConfigInitializer.initialize_config()
+    return config_manager.get_setting("master_key_record")
+
+
+def _default_qna_paths() -> Dict[str, str]:
+    """QnA paths from the shared configuration when available, else built-in defaults"""
+    try:
+        from bigfix_universal_remote_qna.services.config_initializer import ConfigInitializer
+    except ImportError:
+        return dict(DEFAULT_QNA_PATHS)
+    
+    with contextlib.redirect_stdout(sys.stderr):
+        config_manager = ConfigInitializer.initialize_config()
+    return {os_type.value: config_manager.get_setting(f"qna_path_{os_type.value}") for os_type in OSType}
+
+
+def _precheck(queries: List[str]) -> bool:
+    """Check every query's syntax locally, reporting problems on stderr; True if all pass"""
+    from bigfix_universal_remote_qna.services.relevance_checker import RelevanceChecker
+    
+    passed = True
+    for number, query in enumerate(queries, 1):
+        issue = RelevanceChecker.check(query)
+        if issue is None:
+            continue
+        passed = False
+        line = " ".join(query.splitlines())
+        print(f"Query {number}, column {issue.position + 1}: {issue.message}\n  {line}\n"
+              f"  {' ' * issue.position}{'^' * max(issue.length, 1)}", file=sys.stderr)
+    if not passed:
+        print("Not sending any query (use --no-precheck to send them anyway)", file=sys.stderr)
+    return passed
+
+
+def result_to_record(result: HostResult) -> Dict:
+    """JSON-serializable record for one (host, query) result"""
+    answer_set = result.answer_set
+    return {
+        'profile': result.profile_name,
+        'host': result.host,
+        'query': result.query,
+        'success': result.success,
+        'exit_code': result.exit_code,
+        'answers': answer_set.answers if answer_set else [],
+        'answer_type': answer_set.answer_type if answer_set else "",
+        'eval_time_ms': answer_set.eval_time_ms if answer_set else None,
+        'errors': answer_set.errors if answer_set else [],
+        'stderr': result.error,
+        'duration': round(result.duration, 4),
+    }
+
+
+def group_to_record(group) -> Dict:
+    """JSON-serializable record for one group of hosts with identical answers"""
+    return {
+        'query': group.query,
+        'host_count': len(group.hosts),
+        'answers': list(group.answers),
+        'error': group.error,
+        'hosts': group.hosts,
+    }
+
+
+def delta_to_record(delta) -> Dict:
+    """JSON-serializable record for one polled change"""
+    return {
+        'profile': delta.profile_name,
+        'host': delta.host,
+        'query': delta.query,
+        'added': delta.added,
+        'removed': delta.removed,
+        'error': delta.error,
+        'first': delta.first,
+        'timestamp': round(delta.timestamp, 3),
+    }
+
+
+def poll(args: argparse.Namespace, executor, profiles: List[ConnectionProfile], queries: List[str],
+         out: TextIO) -> int:
+    """Poll until interrupted, writing one JSON line per changed (host, query)"""
+    import time
+    from bigfix_universal_remote_qna.services.query_poller import QueryPoller
+    
+    def emit(delta):
+        out.write(json.dumps(delta_to_record(delta)) + "\n")
+        out.flush()
+    
+    poller = QueryPoller(profiles, queries, emit, interval=args.poll, jitter=args.poll_jitter,
+                         max_backoff=args.poll_max_backoff, executor=executor)
+    poller.start()
+    try:
+        while poller.running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        poller.stop(wait=True)
+    return 0
+
+
+def run(args: argparse.Namespace, out: TextIO) -> int:
+    """Execute the run command, returning the process exit code"""
+    from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+    from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+    
+    queries = list(args.query)
+    if args.queries_file:
+        queries.extend(_read_lines(args.queries_file))
+    if not queries:
+        print("No queries given (use --query or --queries-file)", file=sys.stderr)
+        return 2
+    if not args.no_precheck and not _precheck(queries):
+        return 2
+    
+    profiles = _load_profiles(args)
+    if not profiles:
+        print("No targets given (use --profile, --all-profiles, --tag/--group/--site/--target-os, "
+              "--host or --hosts-file)", file=sys.stderr)
+        return 2
+    
+    qna_paths = _default_qna_paths()
+    prober = None
+    if args.probe:
+        from bigfix_universal_remote_qna.services.host_probe_cache import HostProbeCache
+        from bigfix_universal_remote_qna.services.host_prober import HostProber
+        prober = HostProber(qna_paths, HostProbeCache(os.path.expanduser("~/.bigfix_host_probes.json")))
+    
+    pool = SSHConnectionPool(max_connections=max(args.max_workers, 1))
+    executor = FleetExecutor(
+        max_workers=args.max_workers,
+        host_timeout=args.timeout,
+        default_qna_paths=qna_paths,
+        pool=pool,
+        prober=prober
+    )
+    
+    if args.poll:
+        if args.export:
+            print("--export cannot be combined with --poll", file=sys.stderr)
+            return 2
+        try:
+            return poll(args, executor, profiles, queries, out)
+        finally:
+            pool.close_all()
+    
+    grouper = None
+    if args.group_answers:
+        from bigfix_universal_remote_qna.services.answer_grouper import AnswerGrouper
+        grouper = AnswerGrouper()
+    
+    exporter = None
+    if args.export:
+        from bigfix_universal_remote_qna.services.result_exporter import ResultExporter
+        try:
+            exporter = ResultExporter(args.export)
+        except (ValueError, OSError) as e:
+            print(f"Cannot export to {args.export}: {str(e)}", file=sys.stderr)
+            pool.close_all()
+            return 2
+    
+    from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+    
+    cancel_token = CancelToken()
+    results = executor.execute_many(profiles, queries, use_batch=args.batch, cancel_token=cancel_token)
+    failures = 0
+    try:
+        for result in results:
+            if not result.success:
+                failures += 1
+            if exporter is not None:
+                exporter.write_result(result)
+            if grouper is not None:
+                grouper.add(result)
+                continue
+            out.write(json.dumps(result_to_record(result)) + "\n")
+            out.flush()
+    except KeyboardInterrupt:
+        # Closing the sweep cancels it and waits until running hosts stopped their QnA
+        results.close()
+        print("Interrupted; stopped QnA on the hosts still running", file=sys.stderr)
+        return 130
+    finally:
+        pool.close_all()
+        if exporter is not None:
+            exporter.close()
+    
+    if grouper is not None:
+        for query in dict.fromkeys(queries):
+            for group in grouper.groups(query):
+                out.write(json.dumps(group_to_record(group)) + "\n")
+    
+    return 1 if failures else 0
+
+
+def profiles(args: argparse.Namespace) -> int:
+    """Execute the profiles command: bulk import or export"""
+    profile_manager = _profile_manager(args)
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.action == "import":
+            count = profile_manager.import_profiles(args.file)
+        else:
+            selected = _select(profile_manager, args) if _has_selector(args) else None
+            count = profile_manager.export_profiles(args.file, selected)
+    print(f"✓ {'Imported' if args.action == 'import' else 'Exported'} {count} profiles", file=sys.stderr)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    args = _parse_args(argv)
+    if args.command == "profiles":
+        return profiles(args)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            return run(args, out)
+    return run(args, sys.stdout)
@@ -0,0 +1,14 @@
+from dataclasses import dataclass, field
+from typing import List
+
+
+@dataclass(slots=True)
+class AnswerDelta:
+    profile_name: str
+    host: str
+    query: str
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    error: str = ""
+    first: bool = False
+    timestamp: float = 0.0
@@ -0,0 +1,11 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass(slots=True)
+class AnswerGroup:
+    digest: str
+    query: str
+    answers: Tuple[str, ...] = ()
+    error: str = ""
+    hosts: List[str] = field(default_factory=list)
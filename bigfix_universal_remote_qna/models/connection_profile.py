@@ -1,5 +1,7 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import List
 from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.models.transport_type import TransportType
 
 
 @dataclass
@@ -10,4 +12,10 @@ class ConnectionProfile:
     username: str = ""
     password: str = ""
     os: str = OSType.WINDOWS.value
-    qna_path: str = ""
\ No newline at end of file
+    qna_path: str = ""
+    tags: List[str] = field(default_factory=list)
+    group: str = ""
+    site: str = ""
+    last_seen: float = 0.0
+    detected_os: str = ""
+    transport: str = TransportType.SSH.value
\ No newline at end of file
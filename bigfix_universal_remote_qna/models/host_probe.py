@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class HostProbe:
+    os: str = ""
+    os_version: str = ""
+    qna_path: str = ""
+    probed_at: float = 0.0
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from typing import Optional
+from bigfix_universal_remote_qna.models.qna_answer_set import QnAAnswerSet
+
+
+@dataclass
+class HostResult:
+    profile_name: str
+    host: str
+    query: str
+    output: str = ""
+    error: str = ""
+    exit_code: int = -1
+    success: bool = False
+    duration: float = 0.0
+    answer_set: Optional[QnAAnswerSet] = None
@@ -4,4 +4,12 @@ from enum import Enum
 class OSType(Enum):
     WINDOWS = "windows"
     LINUX = "linux"
-    MAC = "mac"
\ No newline at end of file
+    MAC = "mac"
+
+
+# Default QnA executable locations for each OS
+DEFAULT_QNA_PATHS = {
+    OSType.WINDOWS.value: r'C:\Program Files (x86)\BigFix Enterprise\BES Client\QnA.exe',
+    OSType.LINUX.value: "/opt/BESClient/bin/qna",
+    OSType.MAC.value: "/Library/BESAgent/BESAgent.app/Contents/MacOS/QnA",
+}
@@ -0,0 +1,12 @@
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class QnAAnswerSet:
+    query: str = ""
+    answers: List[str] = field(default_factory=list)
+    answer_count: int = 0
+    answer_type: str = ""
+    eval_time_ms: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
@@ -0,0 +1,11 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class QueryHistoryEntry:
+    query: str
+    run_count: int = 0
+    last_run: float = 0.0
+    avg_duration: Optional[float] = None
+    host_count: int = 0
@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class RelevanceIssue:
+    position: int
+    length: int
+    message: str
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class TransportType(Enum):
+    SSH = "ssh"
+    LOCAL = "local"
+    FAKE = "fake"
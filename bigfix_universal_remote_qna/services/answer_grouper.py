@@ -0,0 +1,106 @@
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from bigfix_universal_remote_qna.models.answer_group import AnswerGroup
+from bigfix_universal_remote_qna.models.host_result import HostResult
+
+
+class AnswerGrouper:
+    """Groups fleet results into classes of hosts that gave identical answers.
+    
+    Results are keyed by a hash of their content, so each distinct answer set (or error) is
+    stored once and a host only adds its name; memory grows with distinct answers, not hosts.
+    Groups are updated as results arrive, and a host reported again moves to its new group.
+    """
+    
+    def __init__(self):
+        self._groups: Dict[str, AnswerGroup] = {}
+        self._host_groups: Dict[Tuple[str, str], str] = {}
+    
+    def __len__(self) -> int:
+        return len(self._groups)
+    
+    @property
+    def host_count(self) -> int:
+        return len(self._host_groups)
+    
+    def add(self, result: HostResult) -> AnswerGroup:
+        """File one host's result under its group and return the group"""
+        answers, error = self._content(result)
+        digest = self.digest(result.query, answers, error)
+        host_key = (result.profile_name, result.query)
+        
+        previous = self._host_groups.get(host_key)
+        if previous == digest:
+            return self._groups[digest]
+        if previous is not None:
+            self._remove_host(previous, result.profile_name)
+        
+        group = self._groups.get(digest)
+        if group is None:
+            group = self._groups[digest] = AnswerGroup(digest=digest, query=result.query,
+                                                       answers=answers, error=error)
+        group.hosts.append(result.profile_name)
+        self._host_groups[host_key] = digest
+        return group
+    
+    def groups(self, query: Optional[str] = None) -> List[AnswerGroup]:
+        """Groups (of one query, or all), largest first"""
+        groups = [group for group in self._groups.values() if query is None or group.query == query]
+        groups.sort(key=lambda group: len(group.hosts), reverse=True)
+        return groups
+    
+    def group_of(self, profile_name: str, query: str) -> Optional[AnswerGroup]:
+        digest = self._host_groups.get((profile_name, query))
+        return self._groups.get(digest) if digest is not None else None
+    
+    def clear(self):
+        self._groups.clear()
+        self._host_groups.clear()
+    
+    def summary(self, query: Optional[str] = None, max_hosts: int = 10) -> str:
+        """One block per group: '412 hosts: 10.0.19045' followed by (some of) its hosts"""
+        lines = []
+        for group in self.groups(query):
+            lines.append(f"{len(group.hosts)} host{'s' if len(group.hosts) != 1 else ''}: "
+                         f"{self.describe(group)}")
+            shown = group.hosts[:max_hosts]
+            more = len(group.hosts) - len(shown)
+            lines.append("    " + ", ".join(shown) + (f" ... and {more} more" if more else ""))
+        return "\n".join(lines)
+    
+    @staticmethod
+    def describe(group: AnswerGroup, width: int = 100) -> str:
+        """Short label of a group's content"""
+        if group.error:
+            text = f"error {group.error}"
+        elif not group.answers:
+            text = "(no answers)"
+        else:
+            text = " | ".join(group.answers)
+        return text if len(text) <= width else text[:width - 3] + "..."
+    
+    @staticmethod
+    def digest(query: str, answers: Tuple[str, ...], error: str) -> str:
+        """Content hash identifying a group"""
+        content = "\x1e".join((query, error) + answers)
+        return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    
+    def _remove_host(self, digest: str, profile_name: str):
+        """Take a host out of a group, dropping the group once it is empty"""
+        group = self._groups[digest]
+        group.hosts.remove(profile_name)
+        if not group.hosts:
+            del self._groups[digest]
+    
+    @staticmethod
+    def _content(result: HostResult) -> Tuple[Tuple[str, ...], str]:
+        """Answers and error that decide a result's group"""
+        answer_set = result.answer_set
+        if answer_set is not None and (result.success or answer_set.errors):
+            return tuple(answer_set.answers), "; ".join(answer_set.errors)
+        
+        error = (result.error.strip() or f"exit code {result.exit_code}").splitlines()[0]
+        # Connection errors name the host, which would put every failing host in its own group
+        if result.host:
+            error = error.replace(result.host, "<host>")
+        return (), error
@@ -0,0 +1,265 @@
+import asyncio
+import concurrent.futures
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+from bigfix_universal_remote_qna.services.command_stream import CommandStream
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+from bigfix_universal_remote_qna.services.transport import Transport
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+
+
+Target = Union[ConnectionProfile, Transport]
+
+
+class AsyncQnAClient:
+    """asyncio facade over the transports (SSHManager etc.) and QnACommandBuilder.
+    
+    Blocking SSH work runs on one bounded executor; a semaphore limits how many queries
+    run at once. Cancelling a query closes its remote channel. A query's output is read
+    at most queue_size chunks ahead of its consumer.
+    """
+    
+    _END = object()
+    # Longest a cancelled query waits for its remote QnA to be killed (kill_remote allows 15 s)
+    KILL_TIMEOUT = 20
+    
+    def __init__(self, max_concurrency: int = 10, max_workers: Optional[int] = None,
+                 pool: Optional[SSHConnectionPool] = None, tracker: Optional[LatencyTracker] = None,
+                 default_qna_paths: Optional[Dict[str, str]] = None, timeout: int = 60,
+                 queue_size: int = 64):
+        self.max_concurrency = max(1, max_concurrency)
+        self.pool = pool
+        self.tracker = tracker
+        self.default_qna_paths = default_qna_paths or {}
+        self.timeout = timeout
+        self.queue_size = max(1, queue_size)
+        self.command_builder = QnACommandBuilder()
+        # A few spare workers so connects and teardown never wait behind running queries
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.max_concurrency + 4,
+                                            thread_name_prefix="qna-async")
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def __aenter__(self) -> "AsyncQnAClient":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def close(self):
+        """Wait for in-flight blocking calls and shut the executor down"""
+        await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(self._executor.shutdown, wait=True))
+    
+    async def connect(self, profile: ConnectionProfile, timeout: int = 30) -> Transport:
+        """Connect to a host over the profile's transport, returning the connected transport"""
+        ssh_manager = TransportFactory.create(profile, pool=self.pool, tracker=self.tracker)
+        future = self._submit(ssh_manager.connect, profile, timeout)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The handshake cannot be interrupted; drop the connection once it finishes
+            future.add_done_callback(lambda _: ssh_manager.disconnect())
+            raise
+        return ssh_manager
+    
+    async def disconnect(self, ssh_manager: Transport):
+        """Release or close a connection made by connect()"""
+        await self._submit(ssh_manager.disconnect)
+    
+    async def stream_query(self, target: Target, query: str, qna_path: Optional[str] = None,
+                           timeout: Optional[int] = None) -> AsyncIterator[Tuple[str, str]]:
+        """Yield (stream, text) chunks of a query's output as they arrive.
+        
+        target is a profile (connected and released around the query) or a connected transport.
+        """
+        async with self._semaphore:
+            ssh_manager, owned = await self._resolve(target, timeout)
+            try:
+                async with aclosing(self._stream(ssh_manager, query, qna_path, timeout)) as chunks:
+                    async for item in chunks:
+                        yield item
+            finally:
+                if owned:
+                    await self._release(ssh_manager)
+    
+    async def run_query(self, target: Target, query: str, qna_path: Optional[str] = None,
+                        timeout: Optional[int] = None) -> HostResult:
+        """Run a query and return its parsed result; connection and command errors are raised"""
+        async with self._semaphore:
+            return await self._run(target, query, qna_path, timeout)
+    
+    async def gather_fleet(self, profiles: Iterable[ConnectionProfile], query: str,
+                           qna_path: Optional[str] = None,
+                           timeout: Optional[int] = None) -> List[HostResult]:
+        """Run a query on every profile concurrently, returning results in profile order.
+        
+        Per-host failures and timeouts are reported in the HostResult; cancelling the
+        gather cancels every host and closes their channels.
+        """
+        tasks = [asyncio.ensure_future(self._run_host(profile, query, qna_path, timeout))
+                 for profile in profiles]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    async def _run_host(self, profile: ConnectionProfile, query: str, qna_path: Optional[str],
+                        timeout: Optional[int]) -> HostResult:
+        """run_query for one fleet host, turning failures into an error result"""
+        host_timeout = timeout or self.timeout
+        async with self._semaphore:
+            # The timeout starts once the host's turn comes, not while it waits for a slot
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._run(profile, query, qna_path, host_timeout),
+                                                host_timeout)
+            except asyncio.TimeoutError:
+                result = HostResult(
+                    profile_name=profile.name, host=profile.host, query=query,
+                    error=f"Command execution failed: host did not finish within {host_timeout}s",
+                    duration=time.perf_counter() - start
+                )
+            except Exception as e:
+                result = HostResult(profile_name=profile.name, host=profile.host, query=query,
+                                    error=str(e), duration=time.perf_counter() - start)
+        if self.tracker is not None:
+            self.tracker.record("total", result.duration, host=result.host, query=query)
+        return result
+    
+    async def _run(self, target: Target, query: str, qna_path: Optional[str],
+                   timeout: Optional[int]) -> HostResult:
+        """Connect if needed, run the query and collect its output"""
+        start = time.perf_counter()
+        ssh_manager, owned = await self._resolve(target, timeout)
+        try:
+            output, error = [], []
+            stream = None
+            async with aclosing(self._stream(ssh_manager, query, qna_path, timeout,
+                                             keep_stream=True)) as chunks:
+                async for item in chunks:
+                    if isinstance(item, CommandStream):
+                        stream = item
+                        continue
+                    stream_name, text = item
+                    (output if stream_name == CommandStream.STDOUT else error).append(text)
+            
+            profile = ssh_manager.profile
+            output = "".join(output)
+            answer_set = QnAOutputParser.parse_block(output)
+            answer_set.query = query
+            return HostResult(
+                profile_name=profile.name, host=profile.host, query=query,
+                output=output, error="".join(error), exit_code=stream.exit_code,
+                success=stream.exit_code == 0, duration=time.perf_counter() - start,
+                answer_set=answer_set
+            )
+        finally:
+            if owned:
+                await self._release(ssh_manager)
+    
+    async def _stream(self, ssh_manager: Transport, query: str, qna_path: Optional[str],
+                      timeout: Optional[int], keep_stream: bool = False):
+        """Start the query's command and relay its chunks from an executor thread"""
+        profile = ssh_manager.profile
+        qna_path = qna_path or profile.qna_path or self.default_qna_paths.get(profile.os, "")
+        # Abandoning the stream cancels the token, which also kills the remote QnA
+        cancel_token = CancelToken()
+        command = self.command_builder.tag_command(
+            self.command_builder.build_command(query, qna_path, profile.os), cancel_token.tag, profile.os)
+        kill_command = self.command_builder.build_kill_command(cancel_token.tag, qna_path, profile.os)
+        stream = await self._submit(ssh_manager.stream_command, command,
+                                    timeout or self.timeout, None, query, cancel_token, kill_command)
+        reader = None
+        finished = False
+        try:
+            if keep_stream:
+                yield stream
+            
+            loop = asyncio.get_running_loop()
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            
+            def put(item):
+                """Hand an item to the consumer, waiting while the queue is full until it is cancelled"""
+                try:
+                    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+                except RuntimeError:
+                    # Event loop already closed; nobody is listening any more
+                    return
+                while not cancel_token.cancelled and not loop.is_closed():
+                    try:
+                        future.result(timeout=0.1)
+                        return
+                    except concurrent.futures.TimeoutError:
+                        continue
+                    except concurrent.futures.CancelledError:
+                        return
+                future.cancel()
+            
+            def pump():
+                try:
+                    for item in stream:
+                        put(item)
+                    put(self._END)
+                except BaseException as e:
+                    put(e)
+            
+            reader = self._submit(pump)
+            while True:
+                item = await queue.get()
+                if item is self._END:
+                    finished = True
+                    break
+                if isinstance(item, BaseException):
+                    finished = True
+                    raise item
+                yield item
+            await reader
+        finally:
+            if not finished:
+                # Cancelled or abandoned: close the channel and kill the remote QnA while the
+                # connection is still open; the caller releases it as soon as this returns
+                cancel_token.cancel()
+                stream.close()
+                if reader is None:
+                    # Abandoned before anything read the stream, which would have run the kill
+                    reader = self._submit(ssh_manager.kill_remote, kill_command)
+                await self._settle(reader)
+    
+    async def _settle(self, reader: asyncio.Future):
+        """Wait (up to KILL_TIMEOUT) for a cancelled query's reader to stop its remote QnA"""
+        await asyncio.wait([reader], timeout=self.KILL_TIMEOUT)
+        if reader.done() and not reader.cancelled():
+            # Its QueryCancelled (or connection error) is expected; mark it retrieved
+            reader.exception()
+    
+    async def _resolve(self, target: Target, timeout: Optional[int] = None) -> Tuple[Transport, bool]:
+        """Connected transport for target, and whether this call owns (must release) it"""
+        if isinstance(target, Transport):
+            return target, False
+        return await self.connect(target, timeout=timeout or self.timeout), True
+    
+    async def _release(self, ssh_manager: Transport):
+        """Release a connection even while the calling task is being cancelled"""
+        try:
+            future = self._submit(ssh_manager.disconnect)
+        except RuntimeError:
+            # Executor already shut down (an abandoned stream finalized after close())
+            ssh_manager.disconnect()
+            return
+        await asyncio.shield(future)
+    
+    def _submit(self, func, *args) -> asyncio.Future:
+        """Run a blocking call on the bounded executor"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(func, *args))
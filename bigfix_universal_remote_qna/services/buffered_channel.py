@@ -0,0 +1,129 @@
+import socket
+import threading
+from typing import Optional
+
+
+class BufferedChannel:
+    """Channel fed from Python code, with the paramiko Channel methods CommandStream and QnASession use.
+    
+    Producers call feed_stdout/feed_stderr/finish; fileno() is readable whenever there is
+    data or the channel finished, so the channel works with select() like a paramiko Channel.
+    """
+    
+    def __init__(self):
+        self.closed = False
+        self._stdout = bytearray()
+        self._stderr = bytearray()
+        self._exit_status: Optional[int] = None
+        self._timeout: Optional[float] = None
+        self._condition = threading.Condition()
+        # A socket pair rather than os.pipe so select() also works on Windows
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._signalled = False
+    
+    def feed_stdout(self, data: bytes):
+        self._feed(self._stdout, data)
+    
+    def feed_stderr(self, data: bytes):
+        self._feed(self._stderr, data)
+    
+    def finish(self, exit_status: int):
+        """Mark the command finished; readers drain what is buffered and then see EOF"""
+        with self._condition:
+            self._exit_status = exit_status
+            self._update_signal()
+            self._condition.notify_all()
+    
+    def _feed(self, buffer: bytearray, data: bytes):
+        if not data:
+            return
+        with self._condition:
+            if self.closed:
+                return
+            buffer.extend(data)
+            self._update_signal()
+            self._condition.notify_all()
+    
+    def fileno(self) -> int:
+        return self._wake_read.fileno()
+    
+    def settimeout(self, timeout: Optional[float]):
+        self._timeout = timeout
+    
+    def recv_ready(self) -> bool:
+        return bool(self._stdout)
+    
+    def recv_stderr_ready(self) -> bool:
+        return bool(self._stderr)
+    
+    def recv(self, nbytes: int) -> bytes:
+        """Up to nbytes of stdout; b'' at EOF; socket.timeout if nothing arrives in time"""
+        return self._read(self._stdout, nbytes)
+    
+    def recv_stderr(self, nbytes: int) -> bytes:
+        return self._read(self._stderr, nbytes)
+    
+    def exit_status_ready(self) -> bool:
+        return self._exit_status is not None
+    
+    def recv_exit_status(self) -> int:
+        with self._condition:
+            self._condition.wait_for(lambda: self._exit_status is not None or self.closed)
+            return self._exit_status if self._exit_status is not None else -1
+    
+    def sendall(self, data: bytes):
+        if self.closed:
+            raise OSError("Channel is closed")
+        self._write_input(data)
+    
+    def shutdown_write(self):
+        self._close_input()
+    
+    def close(self):
+        with self._condition:
+            if self.closed:
+                return
+            # Leave the wake sockets readable (and open) so a reader blocked in select() returns
+            if not self._signalled:
+                self._wake_write.send(b"*")
+                self._signalled = True
+            self.closed = True
+            self._condition.notify_all()
+        self._terminate()
+    
+    def __del__(self):
+        for sock in (getattr(self, "_wake_read", None), getattr(self, "_wake_write", None)):
+            if sock is not None:
+                sock.close()
+    
+    def _write_input(self, data: bytes):
+        """Deliver stdin data; subclasses that accept input override this"""
+        raise OSError("Channel does not accept input")
+    
+    def _close_input(self):
+        pass
+    
+    def _terminate(self):
+        """Stop whatever produces output once the channel is closed"""
+    
+    def _read(self, buffer: bytearray, nbytes: int) -> bytes:
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: buffer or self._exit_status is not None or self.closed, self._timeout):
+                raise socket.timeout("timed out")
+            data = bytes(buffer[:nbytes])
+            del buffer[:nbytes]
+            self._update_signal()
+            return data
+    
+    def _update_signal(self):
+        """Keep the select() socket readable exactly while there is something to read"""
+        if self.closed:
+            return
+        wanted = bool(self._stdout or self._stderr or self._exit_status is not None)
+        if wanted and not self._signalled:
+            self._wake_write.send(b"*")
+            self._signalled = True
+        elif not wanted and self._signalled:
+            self._wake_read.recv(1)
+            self._signalled = False
@@ -0,0 +1,62 @@
+import threading
+import uuid
+from typing import Callable, List
+
+
+class QueryCancelled(RuntimeError):
+    """Raised in the thread running a query whose CancelToken was cancelled"""
+
+
+class CancelToken:
+    """Cancellation signal shared by everything one user action runs.
+    
+    cancel() calls the registered callbacks (which close channels) right away, in the
+    cancelling thread; the threads running the queries then clean up and raise QueryCancelled.
+    tag is a unique word that commands started for this token carry, so their remote
+    processes can be found and killed.
+    """
+    
+    def __init__(self):
+        self.tag = f"qna-run-{uuid.uuid4().hex[:16]}"
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+    
+    def cancel(self):
+        """Cancel once; later calls do nothing"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+    
+    def add_callback(self, callback: Callable[[], None]):
+        """Call callback on cancel, or at once if already cancelled"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+    
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+    
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise QueryCancelled("Query cancelled")
+    
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning early (True) when cancelled"""
+        return self._event.wait(timeout)
@@ -0,0 +1,142 @@
+import codecs
+import select
+import time
+from typing import Callable, Iterator, Optional, Tuple
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+
+
+class CommandStream:
+    """Incrementally decoded stdout/stderr of a running remote command.
+    
+    Cancelling cancel_token closes the channel at once; the reading thread then calls
+    on_cancel (to stop the remote process) and raises QueryCancelled.
+    """
+    
+    STDOUT = "stdout"
+    STDERR = "stderr"
+    
+    def __init__(self, channel, timeout: int = 60,
+                 on_chunk: Optional[Callable[[str, str], None]] = None,
+                 chunk_size: int = 32768,
+                 on_finish: Optional[Callable[[float, float], None]] = None,
+                 cancel_token: Optional[CancelToken] = None,
+                 on_cancel: Optional[Callable[[], None]] = None):
+        self.channel = channel
+        self.timeout = timeout
+        self.on_chunk = on_chunk
+        self.chunk_size = chunk_size
+        self._decoders = {
+            self.STDOUT: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            self.STDERR: codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        self.on_finish = on_finish
+        self.cancel_token = cancel_token
+        self.on_cancel = on_cancel
+        self._exit_code: Optional[int] = None
+    
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """Yield (stream, text) chunks as they arrive, reading both pipes so neither stalls"""
+        started = last_data = time.monotonic()
+        first_data = None
+        if self.cancel_token is not None:
+            self.cancel_token.add_callback(self.close)
+        
+        try:
+            while True:
+                self._check_cancelled()
+                received = False
+                
+                if self.channel.recv_ready():
+                    data = self.channel.recv(self.chunk_size)
+                    if data:
+                        received = True
+                        yield from self._emit(self.STDOUT, data)
+                
+                if self.channel.recv_stderr_ready():
+                    data = self.channel.recv_stderr(self.chunk_size)
+                    if data:
+                        received = True
+                        yield from self._emit(self.STDERR, data)
+                
+                if received:
+                    last_data = time.monotonic()
+                    if first_data is None:
+                        first_data = last_data
+                    continue
+                
+                if self.channel.exit_status_ready() and not self.channel.recv_ready() \
+                        and not self.channel.recv_stderr_ready():
+                    break
+                
+                if self.channel.closed and not self.channel.recv_ready():
+                    break
+                
+                if time.monotonic() - last_data > self.timeout:
+                    raise RuntimeError(
+                        f"Command execution failed: no output for {self.timeout}s"
+                    )
+                
+                # Wake as soon as either pipe has data instead of busy-polling
+                select.select([self.channel], [], [], 0.05)
+            
+            # A channel closed by cancel() looks finished; make sure it is not taken as a result
+            self._check_cancelled()
+            for stream, decoder in self._decoders.items():
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    yield from self._deliver(stream, tail)
+            
+            self._exit_code = self.channel.recv_exit_status()
+            
+            if self.on_finish:
+                # (time to first byte, time spent receiving output) in seconds
+                finished = time.monotonic()
+                first_data = first_data or finished
+                self.on_finish(first_data - started, finished - first_data)
+        finally:
+            if self.cancel_token is not None:
+                self.cancel_token.remove_callback(self.close)
+            self.channel.close()
+    
+    def lines(self) -> Iterator[Tuple[str, str]]:
+        """Yield (stream, line) pairs, buffering partial lines per stream"""
+        partial = {self.STDOUT: "", self.STDERR: ""}
+        
+        for stream, text in self:
+            text = partial[stream] + text
+            *complete, partial[stream] = text.split("\n")
+            for line in complete:
+                yield stream, line.rstrip("\r")
+        
+        for stream, text in partial.items():
+            if text:
+                yield stream, text.rstrip("\r")
+    
+    @property
+    def exit_code(self) -> int:
+        """Exit status of the command; only available once the stream is exhausted"""
+        if self._exit_code is None:
+            self._exit_code = self.channel.recv_exit_status()
+        return self._exit_code
+    
+    def close(self):
+        """Stop reading and close the channel"""
+        self.channel.close()
+    
+    def _check_cancelled(self):
+        if self.cancel_token is None or not self.cancel_token.cancelled:
+            return
+        self.channel.close()
+        if self.on_cancel:
+            self.on_cancel()
+        self.cancel_token.raise_if_cancelled()
+    
+    def _emit(self, stream: str, data: bytes) -> Iterator[Tuple[str, str]]:
+        text = self._decoders[stream].decode(data)
+        if text:
+            yield from self._deliver(stream, text)
+    
+    def _deliver(self, stream: str, text: str) -> Iterator[Tuple[str, str]]:
+        if self.on_chunk:
+            self.on_chunk(stream, text)
+        yield stream, text
@@ -1,4 +1,5 @@
 from pyutils_lib.services.config_manager import ConfigManager   # pyright: ignore[reportMissingImports]
+from bigfix_universal_remote_qna.models.os_type import OSType, DEFAULT_QNA_PATHS
 
 class ConfigInitializer:
     """Initialize all configuration settings using ConfigManager"""
@@ -13,38 +14,136 @@ class ConfigInitializer:
             "last_used_connection_index", False, 0, int, 
             "Index of the last used connection profile"
         )
+        config_manager.define_setting(
+            "profile_store_backend", False, "json", str,
+            "Where saved profiles live: 'json' (~/.bigfix_profiles.json) or 'sqlite' (~/.bigfix_profiles.db)"
+        )
         
         # UI Settings
         config_manager.define_setting(
             "window_geometry", False, "1000x700", str, 
             "Main window geometry (widthxheight)"
         )
+        config_manager.define_setting(
+            "ui_frame_budget_ms", False, 16, int,
+            "Milliseconds per frame spent applying queued result/status updates"
+        )
         config_manager.define_setting(
             "save_passwords", False, True, bool, 
             "Whether to save passwords in encrypted form"
         )
+        config_manager.define_setting(
+            "master_key_record", False, "", str,
+            "Salt and verifier of the profile store master key (empty when not set up)"
+        )
         
         # QnA Paths for different OS
         config_manager.define_setting(
             "qna_path_windows", False, 
-            r'C:\Program Files (x86)\BigFix Enterprise\BES Client\QnA.exe', str,
+            DEFAULT_QNA_PATHS[OSType.WINDOWS.value], str,
             "QnA executable path for Windows systems"
         )
         config_manager.define_setting(
-            "qna_path_linux", False, "/opt/BESClient/bin/qna", str,
+            "qna_path_linux", False, DEFAULT_QNA_PATHS[OSType.LINUX.value], str,
             "QnA executable path for Linux systems"
         )
         config_manager.define_setting(
             "qna_path_mac", False, 
-            "/Library/BESAgent/BESAgent.app/Contents/MacOS/QnA", str,
+            DEFAULT_QNA_PATHS[OSType.MAC.value], str,
             "QnA executable path for macOS systems"
         )
         
-        # Recent queries (stored as JSON string)
+        # Host detection (OS and QnA path) right after connecting
+        config_manager.define_setting(
+            "host_probe_on_connect", False, True, bool,
+            "Whether to detect the host's OS and QnA path when connecting"
+        )
+        config_manager.define_setting(
+            "host_probe_ttl", False, 604800, int,
+            "Seconds a host's detected OS and QnA path are reused before probing again"
+        )
+        config_manager.define_setting(
+            "host_probe_negative_ttl", False, 3600, int,
+            "Seconds before a host whose OS could not be detected is probed again"
+        )
+        
+        # SSH connection pool settings
+        config_manager.define_setting(
+            "ssh_pool_max_connections", False, 20, int,
+            "Maximum number of SSH connections kept open at once"
+        )
+        config_manager.define_setting(
+            "ssh_pool_idle_timeout", False, 300, int,
+            "Seconds an unused pooled SSH connection stays open"
+        )
+        config_manager.define_setting(
+            "ssh_keepalive_interval", False, 30, int,
+            "Seconds between SSH keepalive packets on pooled connections"
+        )
+        
+        # Keep one QnA process running per connection instead of one per query
+        config_manager.define_setting(
+            "qna_session_mode", False, False, bool,
+            "Whether queries reuse a persistent QnA session"
+        )
+        
+        # Query result cache settings
+        config_manager.define_setting(
+            "query_cache_max_entries", False, 500, int,
+            "Maximum number of cached query results (least recently used are evicted)"
+        )
+        config_manager.define_setting(
+            "query_cache_ttl", False, 300, int,
+            "Seconds a cached query result stays valid, for every query (0 disables the cache)"
+        )
+        config_manager.define_setting(
+            "query_cache_persist", False, False, bool,
+            "Whether cached query results are kept across restarts (written unencrypted to ~/.bigfix_query_cache.json)"
+        )
+        
+        # Fleet execution settings
+        config_manager.define_setting(
+            "fleet_max_workers", False, 10, int,
+            "Maximum number of hosts queried concurrently in a fleet run"
+        )
+        config_manager.define_setting(
+            "fleet_host_timeout", False, 60, int,
+            "Per-host timeout in seconds for fleet runs (connect + query)"
+        )
+        
+        # Polling settings
+        config_manager.define_setting(
+            "poll_interval", False, 10, int,
+            "Seconds between polls of a recurring query"
+        )
+        config_manager.define_setting(
+            "poll_jitter_percent", False, 10, int,
+            "Random spread of the poll interval, in percent of it"
+        )
+        config_manager.define_setting(
+            "poll_max_backoff", False, 300, int,
+            "Longest wait in seconds between polls of a failing host"
+        )
+        
+        # Local relevance syntax check before queries are sent
+        config_manager.define_setting(
+            "relevance_precheck", False, True, bool,
+            "Check relevance syntax locally and confirm before sending a query that fails"
+        )
+        
+        # Recent queries (stored as JSON string); imported once into the query history
         config_manager.define_setting(
             "recent_queries", False, "[]", str,
             "JSON array of recent queries (max 10)"
         )
+        config_manager.define_setting(
+            "query_history_file", False, "~/.bigfix_query_history.db", str,
+            "SQLite file that keeps the query history (empty to keep it in memory for the session only)"
+        )
+        config_manager.define_setting(
+            "query_history_half_life_days", False, 7, int,
+            "Days after which a past run counts half as much when ranking query history"
+        )
         
         
         # Load the configuration after defining all settings
@@ -0,0 +1,229 @@
+import random
+import re
+import shlex
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.os_type import OSType, DEFAULT_QNA_PATHS
+from bigfix_universal_remote_qna.services.buffered_channel import BufferedChannel
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.transport import Transport
+
+
+class FakeQnA:
+    """In-process stand-in for the QnA executable: canned answers plus literal evaluation.
+    
+    With answer_count set, other queries get that many generated answers instead of an
+    error; eval_time_ms is then also spent evaluating them, and error_rate of them fail.
+    Literals (the sentinels batches and sessions rely on) are always answered at once.
+    """
+    
+    def __init__(self, answers: Optional[Dict[str, Union[str, List[str]]]] = None,
+                 eval_time_ms: float = 0.1, answer_count: Optional[int] = None,
+                 error_rate: float = 0.0, seed: Optional[int] = None):
+        self.answers = {query.strip(): [value] if isinstance(value, str) else list(value)
+                        for query, value in (answers or {}).items()}
+        self.eval_time_ms = eval_time_ms
+        self.answer_count = answer_count
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+    
+    def evaluate(self, query: str) -> str:
+        """QnA's output for one input line, as it prints it when reading from a pipe"""
+        query = query.strip()
+        if not query:
+            return ""
+        
+        answers = self.answers.get(query)
+        if answers is None:
+            answers = self._literal(query)
+        if answers is None and self.answer_count is not None:
+            return self._simulate(query)
+        if answers is None:
+            return f'Q: E: The operator "{query}" is not defined.\n'
+        
+        lines = [f"A: {answer}" for answer in answers] + [f"T: {self.eval_time_ms:g} ms"]
+        return "Q: " + "\n".join(lines) + "\n"
+    
+    def run(self, text: str) -> str:
+        """QnA's output for a whole input script"""
+        return "".join(self.evaluate(line) for line in text.splitlines())
+    
+    def _simulate(self, query: str) -> str:
+        """Generated output for a query without a canned answer"""
+        if self.eval_time_ms > 0:
+            time.sleep(self.eval_time_ms / 1000.0)
+        if self._random.random() < self.error_rate:
+            return 'Q: E: Singular expression refers to nonexistent object.\n'
+        lines = [f"A: {query} {i}" for i in range(self.answer_count)] + [f"T: {self.eval_time_ms:g} ms"]
+        return "Q: " + "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _literal(query: str) -> Optional[List[str]]:
+        """Answers of a string, integer or boolean literal (which is what sentinel queries are)"""
+        if len(query) >= 2 and query[0] == query[-1] == '"':
+            return [query[1:-1]]
+        if re.fullmatch(r"-?\d+", query) or query in ("true", "false"):
+            return [query]
+        return None
+
+
+class FakeChannel(BufferedChannel):
+    """Channel answered in-process: a finished command's output, or an interactive FakeQnA"""
+    
+    def __init__(self, qna: FakeQnA, output: Optional[str] = None, exit_status: int = 0,
+                 latency: float = 0.0):
+        super().__init__()
+        self.qna = qna
+        self._partial = ""
+        self._interactive = output is None
+        if output is None:
+            # Interactive QnA process: answers follow each line written to stdin
+            return
+        
+        def respond():
+            self.feed_stdout(output.encode())
+            self.finish(exit_status)
+        
+        if latency > 0:
+            timer = threading.Timer(latency, respond)
+            timer.daemon = True
+            timer.start()
+        else:
+            respond()
+    
+    def _write_input(self, data: bytes):
+        text = self._partial + data.decode(errors="replace")
+        *lines, self._partial = text.split("\n")
+        self.feed_stdout("".join(self.qna.evaluate(line) for line in lines).encode())
+    
+    def _close_input(self):
+        # A finished command's output arrives on its own schedule; only QnA itself ends on EOF
+        if not self._interactive or self.exit_status_ready():
+            return
+        if self._partial:
+            self.feed_stdout(self.qna.evaluate(self._partial).encode())
+            self._partial = ""
+        self.finish(0)
+
+
+class FakeTransport(Transport):
+    """In-process transport for tests: understands the commands QnACommandBuilder and HostProber build.
+    
+    remote_os is the OS the fake host really runs; by default it is whatever the profile says.
+    """
+    
+    closing_stops_process = True
+    
+    def __init__(self, answers: Optional[Dict[str, Union[str, List[str]]]] = None,
+                 latency: float = 0.0, unreachable: Iterable[str] = (),
+                 existing_paths: Optional[Iterable[str]] = None,
+                 tracker: Optional[LatencyTracker] = None, qna: Optional[FakeQnA] = None,
+                 remote_os: Optional[str] = None):
+        super().__init__(tracker=tracker)
+        self.qna = qna or FakeQnA(answers)
+        self.remote_os = remote_os
+        self.latency = latency
+        self.unreachable = set(unreachable)
+        self.existing_paths = set(DEFAULT_QNA_PATHS.values() if existing_paths is None else existing_paths)
+        self.files: Dict[str, str] = {}
+        self.commands: List[str] = []
+    
+    def _connect(self, profile: ConnectionProfile, timeout: int) -> bool:
+        if profile.host in self.unreachable:
+            self.connected = False
+            raise ConnectionError(f"Failed to connect: {profile.host} is unreachable")
+        if profile.qna_path:
+            self.existing_paths.add(profile.qna_path)
+        self.profile = profile
+        self.connected = True
+        return True
+    
+    def disconnect(self):
+        self.profile = None
+        self.connected = False
+    
+    def upload_text(self, content: str, remote_path: str):
+        if not self.connected:
+            raise RuntimeError("Not connected to remote machine")
+        self.files[remote_path] = content
+    
+    def _open_channel(self, command: str, timeout: Optional[int] = None, query: str = ""):
+        if not self.connected:
+            raise RuntimeError("Not connected to remote machine")
+        self.commands.append(command)
+        
+        remote_os = self.remote_os or self.profile.os
+        if command.startswith("ver && ("):
+            return self._probe_channel(command, remote_os)
+        if remote_os == OSType.WINDOWS.value:
+            return self._windows_channel(command)
+        return self._unix_channel(command)
+    
+    def _probe_channel(self, command: str, remote_os: str) -> FakeChannel:
+        """Answer HostProber's command as cmd.exe or sh would on this host"""
+        if remote_os == OSType.WINDOWS.value:
+            lines = ["", "Microsoft Windows [Version 10.0.20348.2340]"]
+            for path in re.findall(r'dir /b "([^"]*)"', command):
+                expanded = path.replace("%ProgramFiles(x86)%", r"C:\Program Files (x86)")
+                expanded = expanded.replace("%ProgramFiles%", r"C:\Program Files")
+                if expanded in self.existing_paths:
+                    lines.append(f'"QNA={path}"')
+        else:
+            lines = ["Darwin" if remote_os == OSType.MAC.value else "Linux"]
+            unix_half = command[command.index("|| (uname -s && (") + len("|| (uname -s && ("):]
+            for part in unix_half.split("; "):
+                tokens = shlex.split(part)
+                if tokens[:2] == ["test", "-x"] and tokens[2] in self.existing_paths:
+                    lines.append(tokens[-1])
+        return FakeChannel(self.qna, output="\n".join(lines) + "\n", latency=self.latency)
+    
+    def _unix_channel(self, command: str) -> FakeChannel:
+        """Interpret sh commands: echo/printf piped into QnA, QnA over a file, test -f, or QnA alone"""
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+        lexer.whitespace_split = True
+        tokens = list(lexer)
+        if tokens[:1] == [":"] and ";" in tokens:
+            # QnACommandBuilder.tag_command's marker and exit
+            tokens = tokens[tokens.index(";") + 1:]
+            if tokens[-3:] == [";", "exit", "$?"]:
+                tokens = tokens[:-3]
+        
+        if tokens[:2] == ["test", "-f"]:
+            return self._exists_channel(tokens[2])
+        if "|" in tokens:
+            left = tokens[:tokens.index("|")]
+            lines = [" ".join(left[1:])] if left[0] == "echo" else left[2:]
+            return self._qna_channel("\n".join(lines) + "\n")
+        if len(tokens) > 1 and tokens[1] != ";":
+            return self._qna_channel(self.files.pop(tokens[1], None), missing=tokens[1])
+        return FakeChannel(self.qna)
+    
+    def _windows_channel(self, command: str) -> FakeChannel:
+        """Interpret the cmd.exe forms of the same commands"""
+        # QnACommandBuilder.tag_command's marker
+        command = re.sub(r"^set QNA_RUN_TAG=\S*&& ", "", command)
+        match = re.fullmatch(r'if exist "(.*)" echo EXISTS', command)
+        if match:
+            return self._exists_channel(match.group(1))
+        match = re.fullmatch(r'\((.*)\) \| ".*"', command)
+        if match:
+            lines = [re.sub(r"\^(.)", r"\1", part) for part in match.group(1)[len("echo "):].split("& echo ")]
+            return self._qna_channel("\n".join(lines) + "\n")
+        match = re.fullmatch(r'echo (.*) \| ".*"', command)
+        if match:
+            return self._qna_channel(match.group(1).replace('\\"', '"') + "\n")
+        match = re.fullmatch(r'"(.*?)" "(.*?)" & del .*', command)
+        if match:
+            return self._qna_channel(self.files.pop(match.group(2), None), missing=match.group(2))
+        return FakeChannel(self.qna)
+    
+    def _qna_channel(self, script: Optional[str], missing: str = "") -> FakeChannel:
+        if script is None:
+            return FakeChannel(self.qna, output=f"Unable to open file {missing}\n", exit_status=1)
+        return FakeChannel(self.qna, output=self.qna.run(script), latency=self.latency)
+    
+    def _exists_channel(self, path: str) -> FakeChannel:
+        exists = path in self.existing_paths or path in self.files
+        return FakeChannel(self.qna, output="EXISTS\n" if exists else "", exit_status=0 if exists else 1)
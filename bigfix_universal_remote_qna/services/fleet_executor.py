@@ -0,0 +1,228 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_probe import HostProbe
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+from bigfix_universal_remote_qna.services.host_prober import HostProber
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.qna_batch_executor import QnABatchExecutor
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+from bigfix_universal_remote_qna.services.query_result_cache import QueryResultCache
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+
+
+class FleetExecutor:
+    """Runs relevance queries across many connection profiles concurrently.
+    
+    With a prober, each host's OS and QnA path come from its probe (cached, or made once
+    right after connecting) rather than from the profile's OS setting. host_timeout bounds
+    each host's whole run: when it is used up, the host's remote QnA is stopped and its
+    unfinished queries report the timeout, however steadily output was still arriving.
+    """
+    
+    def __init__(self, max_workers: int = 10, host_timeout: int = 60,
+                 default_qna_paths: Optional[Dict[str, str]] = None,
+                 pool: Optional[SSHConnectionPool] = None,
+                 cache: Optional[QueryResultCache] = None, bypass_cache: bool = False,
+                 tracker: Optional[LatencyTracker] = None, prober: Optional[HostProber] = None):
+        self.max_workers = max(1, max_workers)
+        self.host_timeout = host_timeout
+        self.default_qna_paths = default_qna_paths or {}
+        self.pool = pool
+        self.cache = cache
+        self.bypass_cache = bypass_cache
+        self.tracker = tracker
+        self.prober = prober
+        self.command_builder = QnACommandBuilder()
+    
+    def execute(self, profiles: Iterable[ConnectionProfile], query: str,
+                cancel_token: Optional[CancelToken] = None) -> Iterator[HostResult]:
+        """Execute query on every profile, yielding each host's result as it finishes"""
+        return self.execute_many(profiles, [query], cancel_token=cancel_token)
+    
+    def execute_many(self, profiles: Iterable[ConnectionProfile], queries: List[str],
+                     use_batch: bool = False,
+                     cancel_token: Optional[CancelToken] = None) -> Iterator[HostResult]:
+        """Execute every query on every profile over one connection per host.
+        
+        Results are yielded host by host as each host finishes, in query order within a host.
+        With use_batch, a host's queries are sent to a single QnA invocation. Cancelling
+        cancel_token stops the remote QnA on hosts being queried (their results carry the
+        error) and skips hosts not yet started; abandoning the sweep cancels it too.
+        """
+        profiles = list(profiles)
+        if not profiles or not queries:
+            return
+        
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(profiles)),
+            thread_name_prefix="fleet"
+        )
+        try:
+            futures = [executor.submit(self._execute_on_host, profile, queries, use_batch, cancel_token)
+                       for profile in profiles]
+            for future in as_completed(futures):
+                yield from future.result()
+        except BaseException:
+            if cancel_token is not None:
+                cancel_token.cancel()
+            raise
+        finally:
+            # Stop queued hosts if the caller abandons the sweep early; cancelled hosts are
+            # waited for, so they kill their remote QnA before the caller closes connections
+            executor.shutdown(wait=cancel_token is not None and cancel_token.cancelled,
+                              cancel_futures=True)
+    
+    def _execute_on_host(self, profile: ConnectionProfile, queries: List[str], use_batch: bool,
+                         cancel_token: Optional[CancelToken] = None) -> List[HostResult]:
+        """Connect, run the queries and disconnect for a single host"""
+        if cancel_token is not None and cancel_token.cancelled:
+            return []
+        start = time.perf_counter()
+        probe = self.prober.cached(profile) if self.prober is not None else None
+        # Without a probe the QnA path, and with it the cache key, is only known after connecting
+        must_probe = self.prober is not None and probe is None
+        os_type, qna_path = self._target(profile, probe)
+        cache_host = f"{profile.host}:{profile.port}"
+        
+        results: Dict[int, HostResult] = {}
+        pending = list(range(len(queries)))
+        if not must_probe:
+            pending = self._from_cache(profile, queries, cache_host, qna_path, results)
+        
+        if pending:
+            # Fired by the caller's token or by the host's deadline; either stops the remote QnA
+            host_token = CancelToken()
+            deadline = threading.Timer(self.host_timeout, host_token.cancel)
+            deadline.daemon = True
+            if cancel_token is not None:
+                cancel_token.add_callback(host_token.cancel)
+            deadline.start()
+            ssh_manager = TransportFactory.create(profile, pool=self.pool, tracker=self.tracker)
+            try:
+                ssh_manager.connect(profile, timeout=self.host_timeout)
+                if must_probe:
+                    os_type, qna_path = self._target(profile, self.prober.probe(ssh_manager))
+                    pending = self._from_cache(profile, queries, cache_host, qna_path, results)
+                
+                if use_batch and len(pending) > 1:
+                    batch_start = time.perf_counter()
+                    batch_results = QnABatchExecutor(ssh_manager).execute(
+                        [queries[index] for index in pending], qna_path, os_type,
+                        timeout=self.host_timeout, cancel_token=host_token
+                    )
+                    duration = time.perf_counter() - batch_start
+                    for index, command_result in zip(pending, batch_results):
+                        results[index] = self._to_host_result(
+                            profile, queries[index], command_result, duration)
+                        self._store(cache_host, qna_path, queries[index], command_result)
+                else:
+                    for index in pending:
+                        query = queries[index]
+                        query_start = time.perf_counter()
+                        command = self.command_builder.tag_command(
+                            self.command_builder.build_command(query, qna_path, os_type), host_token.tag, os_type)
+                        kill_command = self.command_builder.build_kill_command(host_token.tag, qna_path, os_type)
+                        
+                        command_result = ssh_manager.execute_command(
+                            command, timeout=self.host_timeout, query=query,
+                            cancel_token=host_token, kill_command=kill_command)
+                        
+                        results[index] = self._to_host_result(
+                            profile, query, command_result, time.perf_counter() - query_start)
+                        self._store(cache_host, qna_path, query, command_result)
+                        start = time.perf_counter()
+                
+            except Exception as e:
+                error = str(e)
+                if host_token.cancelled and not (cancel_token is not None and cancel_token.cancelled):
+                    error = f"Timed out after {self.host_timeout}s"
+                for index in pending:
+                    if index not in results:
+                        results[index] = HostResult(
+                            profile_name=profile.name, host=profile.host, query=queries[index],
+                            error=error, duration=time.perf_counter() - start
+                        )
+            finally:
+                deadline.cancel()
+                if cancel_token is not None:
+                    cancel_token.remove_callback(host_token.cancel)
+                ssh_manager.disconnect()
+            
+            for index in pending:
+                self._record_timings(results[index])
+            if self.prober is not None and any(
+                    HostProber.qna_missing(results[index].exit_code, results[index].error) for index in pending):
+                # The probed path (or OS) is stale; probe again on the next run
+                self.prober.invalidate(profile)
+        
+        return [results[index] for index in range(len(queries))]
+    
+    def _target(self, profile: ConnectionProfile, probe: Optional[HostProbe]):
+        """OS and QnA path to run with: the profile's own path wins, then the probed one"""
+        os_type = (probe.os if probe else "") or profile.os
+        qna_path = profile.qna_path or (probe.qna_path if probe else "") or self.default_qna_paths.get(os_type, "")
+        return os_type, qna_path
+    
+    def _from_cache(self, profile: ConnectionProfile, queries: List[str], cache_host: str,
+                    qna_path: str, results: Dict[int, HostResult]) -> List[int]:
+        """Fill results with cached answers, returning the indices of the queries still to run"""
+        pending = []
+        for index, query in enumerate(queries):
+            cached = self._cached_result(profile, query, cache_host, qna_path)
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+        return pending
+    
+    def _cached_result(self, profile: ConnectionProfile, query: str, cache_host: str,
+                       qna_path: str) -> Optional[HostResult]:
+        """HostResult built from the cache, or None on a miss"""
+        if self.cache is None or self.bypass_cache:
+            return None
+        cached = self.cache.get(cache_host, qna_path, query)
+        if cached is None:
+            return None
+        return self._to_host_result(profile, query, cached, 0.0)
+    
+    def _store(self, cache_host: str, qna_path: str, query: str, command_result: Dict[str, Any]):
+        """Cache a freshly executed result"""
+        if self.cache is not None:
+            self.cache.put(cache_host, qna_path, query, command_result)
+    
+    def _to_host_result(self, profile: ConnectionProfile, query: str,
+                        command_result: Dict[str, Any], duration: float) -> HostResult:
+        """HostResult for one query's execute_command-style result"""
+        return HostResult(
+            profile_name=profile.name,
+            host=profile.host,
+            query=query,
+            output=command_result['output'],
+            error=command_result['error'],
+            exit_code=command_result['exit_code'],
+            success=command_result['success'],
+            duration=duration,
+            answer_set=command_result.get('answer_set') or self._parse(query, command_result['output'])
+        )
+    
+    @staticmethod
+    def _parse(query: str, output: str):
+        """Structured answers for a host's output"""
+        answer_set = QnAOutputParser.parse_block(output)
+        answer_set.query = query
+        return answer_set
+    
+    def _record_timings(self, result: HostResult):
+        """Record QnA's own evaluation time and the host's total time"""
+        if self.tracker is None:
+            return
+        if result.answer_set is not None and result.answer_set.eval_time_ms is not None:
+            self.tracker.record("evaluation", result.answer_set.eval_time_ms / 1000.0,
+                                host=result.host, query=result.query)
+        self.tracker.record("total", result.duration, host=result.host, query=result.query)
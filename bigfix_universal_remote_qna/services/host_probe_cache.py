@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_probe import HostProbe
+
+
+class HostProbeCache:
+    """Detected OS and QnA path per host, reused for ttl seconds and optionally kept in a JSON file.
+    
+    Probes that could not tell the OS are kept for negative_ttl seconds, so such hosts are
+    not probed on every run but are tried again soon.
+    """
+    
+    def __init__(self, cache_file: Optional[str] = None, ttl: int = 7 * 86400,
+                 negative_ttl: int = 3600):
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, HostProbe] = {}
+        self._lock = threading.Lock()
+        
+        if cache_file:
+            self.load()
+    
+    @staticmethod
+    def key_for(profile: ConnectionProfile) -> str:
+        return f"{profile.transport}:{profile.host}:{profile.port}"
+    
+    def get(self, profile: ConnectionProfile) -> Optional[HostProbe]:
+        """The host's probe if it is younger than ttl"""
+        with self._lock:
+            probe = self._entries.get(self.key_for(profile))
+        if probe is None or self._expired(probe, time.time()):
+            return None
+        return probe
+    
+    def put(self, profile: ConnectionProfile, probe: HostProbe):
+        with self._lock:
+            self._entries[self.key_for(profile)] = probe
+        self.save()
+    
+    def invalidate(self, profile: Optional[ConnectionProfile] = None):
+        """Forget one host's probe, or every probe when profile is None"""
+        with self._lock:
+            if profile is None:
+                self._entries.clear()
+            elif self._entries.pop(self.key_for(profile), None) is None:
+                return
+        self.save()
+    
+    def load(self):
+        """Load unexpired probes from the cache file"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"✗ Could not load host probe cache: {e}")
+            return
+        
+        now = time.time()
+        with self._lock:
+            for key, values in data.items():
+                try:
+                    probe = HostProbe(**values)
+                except TypeError:
+                    continue
+                if not self._expired(probe, now):
+                    self._entries[key] = probe
+    
+    def _expired(self, probe: HostProbe, now: float) -> bool:
+        return now - probe.probed_at > (self.ttl if probe.os else self.negative_ttl)
+    
+    def save(self):
+        """Write the probes to the cache file"""
+        if not self.cache_file:
+            return
+        
+        with self._lock:
+            data = {key: asdict(probe) for key, probe in self._entries.items()}
+        
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"✗ Could not save host probe cache: {e}")
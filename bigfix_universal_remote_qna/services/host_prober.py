@@ -0,0 +1,128 @@
+import re
+import shlex
+import time
+from typing import Dict, List, Optional, Tuple
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_probe import HostProbe
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.host_probe_cache import HostProbeCache
+from bigfix_universal_remote_qna.services.transport import Transport
+
+
+class HostProber:
+    """Detects a host's OS and finds its QnA binary with a single remote command.
+    
+    The command is valid for both cmd.exe and sh, and each runs only its own half:
+    
+        ver && (<dir /b each Windows path>) || (uname -s && (<test -x each Unix path>; true))
+    
+    'ver' fails on Unix, so sh goes on to uname and the Unix paths; on Windows it succeeds and
+    the Windows group always ends successfully, so the Unix half never runs.
+    """
+    
+    # Install locations tried after the configured paths
+    COMMON_PATHS = {
+        OSType.WINDOWS.value: [
+            r"C:\Program Files\BigFix Enterprise\BES Client\QnA.exe",
+            r"%ProgramFiles(x86)%\BigFix Enterprise\BES Client\QnA.exe",
+            r"%ProgramFiles%\BigFix Enterprise\BES Client\QnA.exe",
+        ],
+        OSType.LINUX.value: ["/opt/BESClient/bin/QnA", "/usr/local/BESClient/bin/qna"],
+        OSType.MAC.value: ["/Library/BESAgent/BESAgent.app/Contents/MacOS/qna"],
+    }
+    
+    # Exit codes and messages of a shell that could not run the QnA binary
+    _MISSING_EXIT_CODES = (126, 127, 9009)
+    _MISSING_MESSAGES = ("is not recognized as an internal or external command",
+                         "No such file or directory", "The system cannot find the path specified")
+    
+    def __init__(self, configured_paths: Dict[str, str], cache: Optional[HostProbeCache] = None,
+                 timeout: int = 30):
+        self.cache = cache
+        self.timeout = timeout
+        self.paths = {os_type.value: [path for path in dict.fromkeys(
+            [configured_paths.get(os_type.value, "")] + self.COMMON_PATHS[os_type.value]) if path]
+            for os_type in OSType}
+    
+    def cached(self, profile: ConnectionProfile) -> Optional[HostProbe]:
+        """The host's cached probe, if any"""
+        return self.cache.get(profile) if self.cache is not None else None
+    
+    def probe(self, transport: Transport, force: bool = False) -> HostProbe:
+        """OS and QnA path of the connected host, from the cache unless force is set.
+        
+        A probe that could not tell the OS is cached too, for the cache's shorter negative_ttl.
+        """
+        profile = transport.profile
+        if not force:
+            cached = self.cached(profile)
+            if cached is not None:
+                return cached
+        
+        windows_paths, unix_paths = self.candidates(profile)
+        result = transport.execute_command(self.build_command(windows_paths, unix_paths), timeout=self.timeout)
+        probe = self.parse(result['output'], profile.qna_path)
+        if self.cache is not None:
+            self.cache.put(profile, probe)
+        return probe
+    
+    def invalidate(self, profile: ConnectionProfile):
+        if self.cache is not None:
+            self.cache.invalidate(profile)
+    
+    def candidates(self, profile: ConnectionProfile) -> Tuple[List[str], List[str]]:
+        """Windows and Unix paths to try, the profile's own QnA path first"""
+        windows_paths = list(self.paths[OSType.WINDOWS.value])
+        unix_paths = self.paths[OSType.LINUX.value] + self.paths[OSType.MAC.value]
+        if profile.qna_path:
+            own = windows_paths if self.is_windows_path(profile.qna_path) else unix_paths
+            own.insert(0, profile.qna_path)
+        return list(dict.fromkeys(windows_paths)), list(dict.fromkeys(unix_paths))
+    
+    @staticmethod
+    def is_windows_path(path: str) -> bool:
+        return bool(re.match(r"^([A-Za-z]:|%[^%]+%)?\\", path)) or path.startswith("\\\\")
+    
+    @staticmethod
+    def build_command(windows_paths: List[str], unix_paths: List[str]) -> str:
+        """The single probe command for the given candidate paths"""
+        # Quoted so that '(x86)' does not close cmd's group; %VARIABLES% are expanded by cmd
+        windows = " & ".join(f'dir /b "{path}" >nul 2>&1 && echo "QNA={path}"' for path in windows_paths)
+        unix = "; ".join(f"test -x {shlex.quote(path)} && echo {shlex.quote('QNA=' + path)}"
+                         for path in unix_paths)
+        return f"ver && ({windows} & ver >nul) || (uname -s && ({unix}; true))"
+    
+    def parse(self, output: str, own_path: str = "") -> HostProbe:
+        """HostProbe from the probe command's output; os is empty if it could not be told.
+        
+        Of the paths found, own_path or one of the detected OS's candidates is preferred.
+        """
+        probe = HostProbe(probed_at=time.time())
+        found = []
+        for line in output.splitlines():
+            line = line.strip().strip('"')
+            if not line:
+                continue
+            if line.startswith("QNA="):
+                found.append(line[len("QNA="):])
+            elif probe.os:
+                continue
+            elif "Windows" in line:
+                probe.os = OSType.WINDOWS.value
+                match = re.search(r"\[Version ([^\]]+)\]", line)
+                probe.os_version = match.group(1) if match else line
+            elif re.fullmatch(r"[A-Za-z][\w.-]*", line):
+                # uname -s: Darwin is macOS; other Unixes run QnA the way Linux does
+                probe.os = OSType.MAC.value if line == "Darwin" else OSType.LINUX.value
+                probe.os_version = line
+        
+        preferred = [own_path] + self.paths.get(probe.os, [])
+        probe.qna_path = next((path for path in found if path in preferred), found[0] if found else "")
+        return probe
+    
+    @classmethod
+    def qna_missing(cls, exit_code: Optional[int], error: str) -> bool:
+        """Whether a QnA command's result shows that the shell could not run the QnA binary"""
+        if exit_code in cls._MISSING_EXIT_CODES:
+            return True
+        return any(message in (error or "") for message in cls._MISSING_MESSAGES)
@@ -0,0 +1,112 @@
+import csv
+import json
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class LatencyTracker:
+    """Records per-host and per-query phase timings and reports rolling percentiles"""
+    
+    PHASES = ("connect", "channel_open", "first_byte", "evaluation", "transfer", "render", "total")
+    
+    SCOPE_ALL = "all"
+    SCOPE_HOST = "host"
+    SCOPE_QUERY = "query"
+    
+    def __init__(self, window: int = 1000, max_keys: int = 10000):
+        self.window = window
+        # Hosts and queries recorded least recently are forgotten beyond this many keys
+        self.max_keys = max_keys
+        self._samples: "OrderedDict[Tuple[str, str, str], Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def record(self, phase: str, seconds: float, host: str = "", query: str = ""):
+        """Record one timing sample for a phase"""
+        query = " ".join(query.split())
+        keys = [(self.SCOPE_ALL, "", phase)]
+        if host:
+            keys.append((self.SCOPE_HOST, host, phase))
+        if query:
+            keys.append((self.SCOPE_QUERY, query, phase))
+        
+        with self._lock:
+            for key in keys:
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                else:
+                    self._samples.move_to_end(key)
+                samples.append(seconds)
+            
+            while len(self._samples) > self.max_keys:
+                oldest = next(key for key in self._samples if key[0] != self.SCOPE_ALL)
+                del self._samples[oldest]
+    
+    @contextmanager
+    def measure(self, phase: str, host: str = "", query: str = ""):
+        """Context manager that records how long its block took"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, host, query)
+    
+    def percentiles(self, phase: str, scope: str = SCOPE_ALL, key: str = "") -> Optional[Dict[str, float]]:
+        """p50/p95/p99 (seconds) over the rolling window for one phase"""
+        with self._lock:
+            samples = self._samples.get((scope, key, phase))
+            values = sorted(samples) if samples else None
+        if not values:
+            return None
+        return self._summarize(values)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """One row per (scope, key, phase), slowest p95 first"""
+        with self._lock:
+            snapshot = [(key, sorted(samples)) for key, samples in self._samples.items() if samples]
+        
+        rows = []
+        for (scope, key, phase), values in snapshot:
+            row = {'scope': scope, 'key': key, 'phase': phase}
+            row.update(self._summarize(values))
+            rows.append(row)
+        rows.sort(key=lambda row: row['p95'], reverse=True)
+        return rows
+    
+    def reset(self):
+        """Forget all samples"""
+        with self._lock:
+            self._samples.clear()
+    
+    def export_csv(self, path: str):
+        """Write the summary to a CSV file"""
+        fields = ['scope', 'key', 'phase', 'count', 'p50', 'p95', 'p99', 'max']
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(self.summary())
+    
+    def export_json(self, path: str):
+        """Write the summary to a JSON file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+    
+    @staticmethod
+    def _summarize(values: List[float]) -> Dict[str, float]:
+        """Nearest-rank percentiles of sorted values"""
+        count = len(values)
+        
+        def rank(p: float) -> float:
+            return values[min(count - 1, max(0, math.ceil(p * count) - 1))]
+        
+        return {
+            'count': count,
+            'p50': rank(0.50),
+            'p95': rank(0.95),
+            'p99': rank(0.99),
+            'max': values[-1],
+        }
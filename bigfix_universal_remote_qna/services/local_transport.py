@@ -0,0 +1,105 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.buffered_channel import BufferedChannel
+from bigfix_universal_remote_qna.services.transport import Transport
+
+
+class LocalProcessChannel(BufferedChannel):
+    """Channel over a local shell command's pipes"""
+    
+    def __init__(self, command: str):
+        super().__init__()
+        self.process = subprocess.Popen(
+            command, shell=True,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            # Own process group, so closing the channel also stops QnA and not just the shell
+            start_new_session=os.name != "nt"
+        )
+        self._readers = [
+            threading.Thread(target=self._pump, args=(self.process.stdout, self.feed_stdout), daemon=True),
+            threading.Thread(target=self._pump, args=(self.process.stderr, self.feed_stderr), daemon=True),
+        ]
+        for reader in self._readers:
+            reader.start()
+        threading.Thread(target=self._wait, daemon=True).start()
+    
+    def _pump(self, pipe, feed):
+        """Copy one of the process's output pipes into the channel buffers"""
+        try:
+            for data in iter(lambda: pipe.read1(32768), b""):
+                feed(data)
+        except (OSError, ValueError):
+            pass
+    
+    def _wait(self):
+        """Report the exit status once the process ended and its output was read"""
+        exit_status = self.process.wait()
+        for reader in self._readers:
+            reader.join()
+        self.finish(exit_status)
+    
+    def _write_input(self, data: bytes):
+        self.process.stdin.write(data)
+        self.process.stdin.flush()
+    
+    def _close_input(self):
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+    
+    def _terminate(self):
+        if self.process.poll() is None:
+            try:
+                if os.name == "nt":
+                    subprocess.run(["taskkill", "/T", "/F", "/PID", str(self.process.pid)],
+                                   capture_output=True)
+                else:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self._close_input()
+
+
+class LocalTransport(Transport):
+    """Runs QnA commands as local processes, for use on the endpoint itself or next to a QnA binary"""
+    
+    # LocalProcessChannel kills the whole process group when closed
+    closing_stops_process = True
+    
+    def _connect(self, profile: ConnectionProfile, timeout: int) -> bool:
+        """Nothing to open; commands start directly"""
+        self.profile = profile
+        self.connected = True
+        return True
+    
+    def disconnect(self):
+        """Forget the profile"""
+        self.profile = None
+        self.connected = False
+    
+    def _open_channel(self, command: str, timeout: Optional[int] = None, query: str = ""):
+        """Start the command in a local shell"""
+        if not self.connected:
+            raise RuntimeError("Not connected to remote machine")
+        
+        try:
+            start = time.perf_counter()
+            channel = LocalProcessChannel(command)
+            self._record("channel_open", time.perf_counter() - start, query)
+            return channel
+        except Exception as e:
+            raise RuntimeError(f"Command execution failed: {str(e)}")
+    
+    def upload_text(self, content: str, remote_path: str):
+        """Write text to a local file"""
+        try:
+            with open(remote_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        except Exception as e:
+            raise RuntimeError(f"File upload failed: {str(e)}")
@@ -0,0 +1,216 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+from bigfix_universal_remote_qna.services.result_spill_store import ResultSpillStore
+
+
+class PagedResultsViewer(ttk.Frame):
+    """Results view that keeps only the visible lines in Tk and pages the rest from a spill file"""
+    
+    MAX_LINE_CHARS = 4000
+    
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.store = ResultSpillStore()
+        self.top_line = 0
+        self.visible_rows = 15
+        self.follow_tail = True
+        self._render_pending = False
+        self._highlight_line = None
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(1, weight=1)
+        
+        self._setup_toolbar()
+        
+        self.text = tk.Text(self, height=15, width=80, wrap=tk.NONE)
+        self.text.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.text.tag_configure("match", background="yellow")
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        
+        x_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.text.xview)
+        x_scrollbar.grid(row=2, column=0, sticky=(tk.W, tk.E))
+        self.text.configure(xscrollcommand=x_scrollbar.set)
+        
+        # The widget only ever holds one page, so all scrolling is done by us
+        self.text.bind('<Configure>', self._on_resize)
+        self.text.bind('<MouseWheel>', self._on_mousewheel)
+        self.text.bind('<Button-4>', lambda event: self.scroll_lines(-3))
+        self.text.bind('<Button-5>', lambda event: self.scroll_lines(3))
+        for key, delta in (('<Prior>', -1), ('<Next>', 1)):
+            self.text.bind(key, lambda event, d=delta: self._scroll_pages(d))
+        self.text.bind('<Control-Home>', lambda event: self.goto_line(1))
+        self.text.bind('<Control-End>', lambda event: self._goto_end())
+        self.text.bind('<Key>', self._ignore_edit)
+    
+    def _setup_toolbar(self):
+        """Setup jump-to-line, search and clear controls"""
+        toolbar = ttk.Frame(self)
+        toolbar.grid(row=0, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(0, 5))
+        
+        self.goto_var = tk.StringVar()
+        ttk.Label(toolbar, text="Line:").pack(side=tk.LEFT)
+        goto_entry = ttk.Entry(toolbar, textvariable=self.goto_var, width=10)
+        goto_entry.pack(side=tk.LEFT, padx=(5, 5))
+        goto_entry.bind('<Return>', lambda event: self._goto_from_entry())
+        ttk.Button(toolbar, text="Go", command=self._goto_from_entry).pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.search_var = tk.StringVar()
+        ttk.Label(toolbar, text="Find:").pack(side=tk.LEFT)
+        search_entry = ttk.Entry(toolbar, textvariable=self.search_var, width=30)
+        search_entry.pack(side=tk.LEFT, padx=(5, 5))
+        search_entry.bind('<Return>', lambda event: self.find_next())
+        ttk.Button(toolbar, text="Find Next", command=self.find_next).pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(toolbar, text="Clear Results", command=self.clear).pack(side=tk.RIGHT)
+        
+        self.position_var = tk.StringVar(value="0 lines")
+        ttk.Label(toolbar, textvariable=self.position_var, foreground="gray").pack(
+            side=tk.RIGHT, padx=(0, 10))
+    
+    # Text-widget compatible surface used by UIUpdateQueue
+    
+    def insert(self, index, text: str):
+        """Append text (results are append-only, so index is ignored)"""
+        self.store.append(text)
+        self._schedule_render()
+    
+    def see(self, index):
+        """Scroll to the end when following output"""
+        if index in (tk.END, "end"):
+            self.follow_tail = True
+            self._schedule_render()
+    
+    def delete(self, first, last=None):
+        """Clear all results"""
+        self.clear()
+    
+    # Navigation
+    
+    def clear(self):
+        """Discard all results"""
+        self.store.clear()
+        self.top_line = 0
+        self.follow_tail = True
+        self._highlight_line = None
+        self._render()
+    
+    def goto_line(self, line_number: int):
+        """Show the given 1-based line at the top of the view"""
+        self.follow_tail = False
+        self.top_line = self._clamp_top(line_number - 1)
+        self._render()
+    
+    def scroll_lines(self, delta: int):
+        """Scroll the view by delta lines"""
+        self.follow_tail = False
+        self.top_line = self._clamp_top(self.top_line + delta)
+        if self.top_line == self._clamp_top(self.store.line_count):
+            self.follow_tail = True
+        self._render()
+    
+    def find_next(self):
+        """Jump to the next line containing the search text"""
+        needle = self.search_var.get()
+        if not needle:
+            return
+        
+        start = (self._highlight_line + 1) if self._highlight_line is not None else self.top_line
+        line = self.store.search(needle, start)
+        if line is None:
+            messagebox.showinfo("Find", f"'{needle}' not found")
+            return
+        
+        self._highlight_line = line
+        self.follow_tail = False
+        self.top_line = self._clamp_top(line - self.visible_rows // 2)
+        self._render()
+    
+    def destroy(self):
+        self.store.close()
+        super().destroy()
+    
+    # Rendering
+    
+    def _schedule_render(self):
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+    
+    def _render(self):
+        """Replace the widget contents with the visible page of lines"""
+        self._render_pending = False
+        total = self.store.line_count
+        if self.follow_tail:
+            self.top_line = self._clamp_top(total)
+        
+        lines = self.store.get_lines(self.top_line, self.visible_rows)
+        page = "\n".join(line if len(line) <= self.MAX_LINE_CHARS
+                         else line[:self.MAX_LINE_CHARS] + " …" for line in lines)
+        
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", page)
+        
+        if self._highlight_line is not None and \
+                self.top_line <= self._highlight_line < self.top_line + len(lines):
+            row = self._highlight_line - self.top_line + 1
+            needle = self.search_var.get()
+            column = lines[row - 1].find(needle)
+            if column >= 0:
+                self.text.tag_add("match", f"{row}.{column}", f"{row}.{column + len(needle)}")
+        
+        if total:
+            first = self.top_line / total
+            last = min(1.0, (self.top_line + len(lines)) / total)
+            self.scrollbar.set(first, last)
+            self.position_var.set(
+                f"Lines {self.top_line + 1}-{self.top_line + len(lines)} of {total}")
+        else:
+            self.scrollbar.set(0.0, 1.0)
+            self.position_var.set("0 lines")
+    
+    def _clamp_top(self, line: int) -> int:
+        return max(0, min(line, self.store.line_count - self.visible_rows))
+    
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == tk.MOVETO:
+            self.follow_tail = False
+            self.top_line = self._clamp_top(int(float(value) * self.store.line_count))
+            self._render()
+        elif action == tk.SCROLL:
+            step = self.visible_rows if unit == tk.PAGES else 1
+            self.scroll_lines(int(value) * step)
+    
+    def _on_mousewheel(self, event):
+        self.scroll_lines(-3 if event.delta > 0 else 3)
+        return "break"
+    
+    def _scroll_pages(self, pages: int):
+        self.scroll_lines(pages * self.visible_rows)
+        return "break"
+    
+    def _goto_end(self):
+        self.follow_tail = True
+        self._render()
+        return "break"
+    
+    def _goto_from_entry(self):
+        try:
+            self.goto_line(int(self.goto_var.get()))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a line number")
+    
+    def _on_resize(self, event):
+        line_height = max(1, self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace"))
+        rows = max(1, event.height // int(line_height))
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._schedule_render()
+    
+    @staticmethod
+    def _ignore_edit(event):
+        # Read-only view, but keep copy and navigation keys working
+        if event.state & 0x4 or event.keysym in ("Left", "Right", "Up", "Down", "Home", "End"):
+            return None
+        return "break"
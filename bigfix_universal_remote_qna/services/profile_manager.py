@@ -1,15 +1,20 @@
+import csv
 import json
 import os
+import re
+import tempfile
+import threading
 from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
-from typing import List, Optional
-from dataclasses import asdict
-from tkinter import messagebox
+from bigfix_universal_remote_qna.services.sqlite_profile_store import SQLiteProfileStore
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from dataclasses import asdict, fields
 
 
 class ProfileManager:
-    """ProfileManager that saves to a specific JSON file"""
+    """ProfileManager that saves to a specific JSON file, or to SQLite when db_file is given"""
     
-    def __init__(self, config_manager, security_manager, profiles_file: str = None):
+    def __init__(self, config_manager, security_manager, profiles_file: str = None,
+                 db_file: str = None):
         self.config_manager = config_manager
         self.security_manager = security_manager
         
@@ -22,11 +27,29 @@ class ProfileManager:
         
         self.profiles_file = profiles_file
         
+        # In-memory copy of the file, reloaded only when its mtime or size changes
+        self._profiles: List[ConnectionProfile] = []
+        self._index: Dict[str, int] = {}
+        self._serialized: List[Optional[str]] = []
+        self._file_stamp = None
+        self._lock = threading.RLock()
+        
         # Ensure directory exists
         profiles_dir = os.path.dirname(self.profiles_file)
         if profiles_dir:
             os.makedirs(profiles_dir, exist_ok=True)
         
+        self.store = None
+        if db_file:
+            self.store = SQLiteProfileStore(db_file)
+            # First use of the database: bring over the existing JSON profiles
+            if self.store.count() == 0 and os.path.exists(self.profiles_file):
+                imported = self.store.save_profiles(self._load_json(self.profiles_file))
+                if imported:
+                    print(f"✓ Imported {imported} profiles from {self.profiles_file}")
+            print(f"✓ Profiles will be saved to: {db_file}")
+            return
+        
         # Create empty profiles file if it doesn't exist
         self._ensure_profiles_file_exists()
         
@@ -42,76 +65,291 @@ class ProfileManager:
             except Exception as e:
                 print(f"✗ Could not create profiles file: {e}")
     
-    def get_all_profiles(self) -> List[ConnectionProfile]:
-        """Get all connection profiles from file"""
+    def _refresh(self):
+        """Reload the in-memory index if the file changed on disk since it was read"""
         try:
-            with open(self.profiles_file, 'r') as f:
-                profiles_data = json.load(f)
-                return [ConnectionProfile(**profile) for profile in profiles_data]
+            stat = os.stat(self.profiles_file)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp == self._file_stamp:
+            return
+        
+        try:
+            profiles, entries = self._read_entries(self.profiles_file)
         except (json.JSONDecodeError, TypeError, FileNotFoundError) as e:
             print(f"Error loading profiles: {e}")
             # If file is corrupted, recreate it
             self._ensure_profiles_file_exists()
-            return []
-    
-    def save_profile(self, profile: ConnectionProfile) -> bool:
-        """Save or update a connection profile to file"""
-        profiles = self.get_all_profiles()
-        
-        # Check for existing profile
-        existing_index = -1
-        for i, existing_profile in enumerate(profiles):
-            if existing_profile.name == profile.name:
-                existing_index = i
-                break
-        
-        if existing_index >= 0:
-            if not messagebox.askyesno("Update Profile", 
-                                     f"Profile '{profile.name}' already exists. Update it?"):
-                return False
-            profiles[existing_index] = profile
-        else:
-            profiles.append(profile)
+            profiles, entries, stamp = [], [], None
+        
+        self._profiles = profiles
+        self._serialized = entries
+        self._reindex()
+        self._file_stamp = stamp
+    
+    @staticmethod
+    def _load_json(path: str) -> List[ConnectionProfile]:
+        """Profiles from a JSON list of profile objects"""
+        with open(path, 'r') as f:
+            return [ConnectionProfile(**profile) for profile in json.load(f)]
+    
+    @staticmethod
+    def _read_entries(path: str) -> Tuple[List[ConnectionProfile], List[Optional[str]]]:
+        """Profiles from a JSON list, with each entry's text as _write would write it.
+        
+        Entry texts are taken from a file in _write's layout so unchanged profiles are not
+        serialized again; for any other layout they are None and serialized on the next write.
+        """
+        with open(path, 'r') as f:
+            text = f.read()
+        profiles = [ConnectionProfile(**profile) for profile in json.loads(text)]
+        
+        # Strings cannot hold raw newlines, so this only occurs between top-level entries
+        body = text.strip()
+        if body.startswith("[\n  {") and body.endswith("\n  }\n]"):
+            pieces = body[2:-2].split("\n  },\n  {")
+            if len(pieces) == len(profiles):
+                last = len(pieces) - 1
+                return profiles, [("  {" if i else "") + piece + ("\n  }" if i < last else "")
+                                  for i, piece in enumerate(pieces)]
+        return profiles, [None] * len(profiles)
+    
+    def _reindex(self):
+        """Rebuild the name -> position index"""
+        self._index = {profile.name: i for i, profile in enumerate(self._profiles)}
+    
+    def _write(self) -> None:
+        """Atomically rewrite the file, re-serializing only entries that changed"""
+        for i, profile in enumerate(self._profiles):
+            if self._serialized[i] is None:
+                entry = json.dumps(asdict(profile), indent=2)
+                self._serialized[i] = "  " + entry.replace("\n", "\n  ")
+        content = "[\n" + ",\n".join(self._serialized) + "\n]" if self._profiles else "[]"
         
-        # Save to file
+        profiles_dir = os.path.dirname(os.path.abspath(self.profiles_file))
+        fd, temp_path = tempfile.mkstemp(dir=profiles_dir, prefix=".profiles-", suffix=".tmp")
         try:
-            profiles_data = [asdict(profile) for profile in profiles]
-            with open(self.profiles_file, 'w') as f:
-                json.dump(profiles_data, f, indent=2)
-            
-            print(f"✓ Profile '{profile.name}' saved to {self.profiles_file}")
-            return True
-            
-        except Exception as e:
-            print(f"✗ Error saving profile: {e}")
-            return False
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            os.replace(temp_path, self.profiles_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        stat = os.stat(self.profiles_file)
+        self._file_stamp = (stat.st_mtime_ns, stat.st_size)
     
-    def delete_profile(self, profile_name: str) -> bool:
-        """Delete a connection profile from file"""
-        profiles = self.get_all_profiles()
-        original_count = len(profiles)
-        profiles = [p for p in profiles if p.name != profile_name]
+    def get_all_profiles(self) -> List[ConnectionProfile]:
+        """Get all connection profiles"""
+        if self.store is not None:
+            return self.store.get_all_profiles()
+        with self._lock:
+            self._refresh()
+            return list(self._profiles)
+    
+    def get_profile_names(self) -> List[str]:
+        """Names of all profiles in file order"""
+        if self.store is not None:
+            return self.store.get_profile_names()
+        with self._lock:
+            self._refresh()
+            return [profile.name for profile in self._profiles]
+    
+    def get_profile_index(self, profile_name: str) -> int:
+        """Position of a profile in file order, or -1"""
+        if self.store is not None:
+            return self.store.get_profile_index(profile_name)
+        with self._lock:
+            self._refresh()
+            return self._index.get(profile_name, -1)
+    
+    def get_profile_at(self, index: int) -> Optional[ConnectionProfile]:
+        """Profile at a position in file order, or None"""
+        if self.store is not None:
+            return self.store.get_profile_at(index)
+        with self._lock:
+            self._refresh()
+            if 0 <= index < len(self._profiles):
+                return self._profiles[index]
+            return None
+    
+    def save_profile(self, profile: ConnectionProfile,
+                     confirm_overwrite: Optional[Callable[[str], bool]] = None) -> bool:
+        """Save or update a connection profile to file.
+        
+        confirm_overwrite is asked before replacing an existing profile of the same name.
+        """
+        if self.store is not None:
+            return self.store.save_profile(profile, confirm_overwrite)
+        with self._lock:
+            self._refresh()
+            existing_index = self._index.get(profile.name, -1)
         
-        if len(profiles) == original_count:
-            print(f"✗ Profile '{profile_name}' not found")
+        # Asked outside the lock, the callback may run a modal dialog
+        if existing_index >= 0 and confirm_overwrite is not None and not confirm_overwrite(profile.name):
             return False
         
-        try:
-            profiles_data = [asdict(profile) for profile in profiles]
-            with open(self.profiles_file, 'w') as f:
-                json.dump(profiles_data, f, indent=2)
+        with self._lock:
+            self._refresh()
+            existing_index = self._index.get(profile.name, -1)
+            if existing_index >= 0:
+                previous = (existing_index, self._profiles[existing_index], self._serialized[existing_index])
+                self._profiles[existing_index] = profile
+                self._serialized[existing_index] = None
+            else:
+                previous = None
+                self._index[profile.name] = len(self._profiles)
+                self._profiles.append(profile)
+                self._serialized.append(None)
             
-            print(f"✓ Profile '{profile_name}' deleted from {self.profiles_file}")
-            return True
+            # Save to file
+            try:
+                self._write()
+                print(f"✓ Profile '{profile.name}' saved to {self.profiles_file}")
+                return True
+                
+            except Exception as e:
+                if previous is not None:
+                    index, old_profile, old_entry = previous
+                    self._profiles[index] = old_profile
+                    self._serialized[index] = old_entry
+                else:
+                    self._profiles.pop()
+                    self._serialized.pop()
+                    del self._index[profile.name]
+                print(f"✗ Error saving profile: {e}")
+                return False
+    
+    def delete_profile(self, profile_name: str) -> bool:
+        """Delete a connection profile from file"""
+        if self.store is not None:
+            return self.store.delete_profile(profile_name)
+        with self._lock:
+            self._refresh()
+            index = self._index.get(profile_name, -1)
+            if index < 0:
+                print(f"✗ Profile '{profile_name}' not found")
+                return False
             
-        except Exception as e:
-            print(f"✗ Error deleting profile: {e}")
-            return False
+            profile = self._profiles.pop(index)
+            entry = self._serialized.pop(index)
+            try:
+                self._write()
+                self._reindex()
+                print(f"✓ Profile '{profile_name}' deleted from {self.profiles_file}")
+                return True
+                
+            except Exception as e:
+                self._profiles.insert(index, profile)
+                self._serialized.insert(index, entry)
+                print(f"✗ Error deleting profile: {e}")
+                return False
     
     def get_profile_by_name(self, profile_name: str) -> Optional[ConnectionProfile]:
-        """Get a specific profile by name from file"""
-        profiles = self.get_all_profiles()
-        for profile in profiles:
-            if profile.name == profile_name:
-                return profile
-        return None
\ No newline at end of file
+        """Get a specific profile by name"""
+        if self.store is not None:
+            return self.store.get_profile_by_name(profile_name)
+        with self._lock:
+            self._refresh()
+            index = self._index.get(profile_name)
+            return self._profiles[index] if index is not None else None
+    
+    def get_profiles_by_names(self, profile_names: List[str]) -> List[ConnectionProfile]:
+        """Get a group of profiles by name, preserving the requested order"""
+        if self.store is not None:
+            return self.store.get_profiles_by_names(profile_names)
+        with self._lock:
+            self._refresh()
+            return [self._profiles[self._index[name]] for name in profile_names if name in self._index]
+    
+    def save_profiles(self, profiles: Iterable[ConnectionProfile]) -> int:
+        """Insert or update many profiles with a single write, returning how many were saved"""
+        if self.store is not None:
+            return self.store.save_profiles(profiles)
+        with self._lock:
+            self._refresh()
+            count = 0
+            for profile in profiles:
+                index = self._index.get(profile.name)
+                if index is None:
+                    self._index[profile.name] = len(self._profiles)
+                    self._profiles.append(profile)
+                    self._serialized.append(None)
+                else:
+                    self._profiles[index] = profile
+                    self._serialized[index] = None
+                count += 1
+            try:
+                self._write()
+            except Exception:
+                # Drop the unsaved in-memory changes
+                self._file_stamp = None
+                raise
+            return count
+    
+    def select(self, os: Optional[str] = None, tags: Iterable[str] = (), group: Optional[str] = None,
+               site: Optional[str] = None, seen_since: Optional[float] = None,
+               name_like: Optional[str] = None) -> List[ConnectionProfile]:
+        """Profiles matching every given criterion (see SQLiteProfileStore.select)"""
+        if self.store is not None:
+            return self.store.select(os=os, tags=tags, group=group, site=site,
+                                     seen_since=seen_since, name_like=name_like)
+        
+        # The JSON backend has no indexes; filter the in-memory list instead
+        tags = set(tags)
+        pattern = None
+        if name_like:
+            pattern = re.compile("".join(".*" if c == "%" else "." if c == "_" else re.escape(c)
+                                         for c in name_like) + r"\Z", re.IGNORECASE | re.DOTALL)
+        return [profile for profile in self.get_all_profiles()
+                if (not os or (profile.detected_os or profile.os) == os)
+                and tags.issubset(profile.tags)
+                and (not group or profile.group == group)
+                and (not site or profile.site == site)
+                and (seen_since is None or profile.last_seen >= seen_since)
+                and (pattern is None or pattern.match(profile.name) or pattern.match(profile.host))]
+    
+    def import_profiles(self, path: str) -> int:
+        """Import profiles from a .json or .csv file, replacing profiles of the same name"""
+        if path.lower().endswith(".csv"):
+            with open(path, 'r', newline='') as f:
+                profiles = [self._from_csv_row(row) for row in csv.DictReader(f)]
+        else:
+            profiles = self._load_json(path)
+        return self.save_profiles(profiles)
+    
+    def export_profiles(self, path: str, profiles: Optional[Iterable[ConnectionProfile]] = None) -> int:
+        """Export profiles (all by default) to a .json or .csv file, returning how many were written"""
+        if profiles is None:
+            profiles = self.get_all_profiles()
+        count = 0
+        with open(path, 'w', newline='') as f:
+            if path.lower().endswith(".csv"):
+                writer = csv.DictWriter(f, fieldnames=[field.name for field in fields(ConnectionProfile)])
+                writer.writeheader()
+                for profile in profiles:
+                    row = asdict(profile)
+                    row['tags'] = ";".join(profile.tags)
+                    writer.writerow(row)
+                    count += 1
+            else:
+                f.write("[")
+                for profile in profiles:
+                    f.write(",\n  " if count else "\n  ")
+                    json.dump(asdict(profile), f)
+                    count += 1
+                f.write("\n]\n" if count else "]\n")
+        return count
+    
+    @staticmethod
+    def _from_csv_row(row: Dict[str, str]) -> ConnectionProfile:
+        """Profile from a CSV row; tags are separated by semicolons"""
+        values = {key: value for key, value in row.items() if key and value not in (None, "")}
+        if 'port' in values:
+            values['port'] = int(values['port'])
+        if 'last_seen' in values:
+            values['last_seen'] = float(values['last_seen'])
+        values['tags'] = [tag.strip() for tag in values.get('tags', "").split(";") if tag.strip()]
+        return ConnectionProfile(**values)
@@ -0,0 +1,80 @@
+import uuid
+from typing import Any, Dict, List, Optional
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+
+
+class QnABatchExecutor:
+    """Evaluates many relevance expressions in a single QnA invocation"""
+    
+    MODE_STDIN = "stdin"
+    MODE_FILE = "file"
+    
+    def __init__(self, ssh_manager):
+        self.ssh_manager = ssh_manager
+        self.command_builder = QnACommandBuilder()
+    
+    def execute(self, queries: List[str], qna_path: str, os_type: str,
+                mode: str = None, timeout: int = 300,
+                cancel_token: Optional[CancelToken] = None) -> List[Dict[str, Any]]:
+        """Run all queries in one remote command and return one result per query, in order.
+        
+        Cancelling cancel_token stops the remote QnA and raises QueryCancelled.
+        """
+        queries = [query for query in queries if query.strip()]
+        if not queries:
+            return []
+        
+        if mode is None:
+            # cmd.exe quoting is too fragile for arbitrary relevance; upload a file instead
+            mode = self.MODE_FILE if os_type == OSType.WINDOWS.value else self.MODE_STDIN
+        
+        batch_id = uuid.uuid4().hex
+        markers = [f"__qna_batch_{batch_id}_{i}__" for i in range(len(queries))]
+        
+        if mode == self.MODE_FILE:
+            query_file = f".qna_batch_{batch_id}.qna"
+            script = self.command_builder.build_batch_script(queries, markers, os_type)
+            self.ssh_manager.upload_text(script, query_file)
+            command = self.command_builder.build_file_command(query_file, qna_path, os_type)
+        else:
+            command = self.command_builder.build_batch_command(queries, markers, qna_path, os_type)
+        
+        tag = cancel_token.tag if cancel_token is not None else ""
+        result = self.ssh_manager.execute_command(
+            self.command_builder.tag_command(command, tag, os_type), timeout=timeout,
+            cancel_token=cancel_token,
+            kill_command=self.command_builder.build_kill_command(tag, qna_path, os_type) if tag else "")
+        return self.demultiplex(queries, markers, result)
+    
+    @staticmethod
+    def demultiplex(queries: List[str], markers: List[str],
+                    result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split combined QnA output into one result per query using the sentinel answers.
+        
+        Every query shares the run's stderr and exit code; queries QnA never reached fail.
+        """
+        results = []
+        remaining = result['output']
+        
+        for query, marker in zip(queries, markers):
+            block, found, rest = remaining.partition(f"A: {marker}")
+            query_result = QnAOutputParser.to_result(
+                QnAOutputParser.parse_block(block), result['error'], result['exit_code'])
+            if not found:
+                # QnA stopped before reaching this query's sentinel
+                if not result['error'].strip():
+                    query_result['error'] = f"QnA exited with code {result['exit_code']}"
+                query_result['exit_code'] = result['exit_code'] or 1
+                query_result['success'] = False
+                remaining = ""
+            else:
+                remaining = rest.split("\n", 1)[1] if "\n" in rest else ""
+            
+            query_result['query'] = query
+            query_result['answer_set'].query = query
+            results.append(query_result)
+        
+        return results
@@ -1,3 +1,4 @@
+from typing import List
 from bigfix_universal_remote_qna.models.os_type import OSType
 
 
@@ -13,3 +14,89 @@ class QnACommandBuilder:
         else:
             escaped_query = query.replace('"', '\\"').replace('`', '\\`').replace('$', '\\$')
             return f'echo "{escaped_query}" | "{qna_path}"'
+    
+    @staticmethod
+    def tag_command(command: str, tag: str, os_type: str) -> str:
+        """Mark a command with a CancelToken's tag so build_kill_command can find its shell.
+        
+        The tag is part of the shell's command line: a no-op ':' word in sh (the trailing
+        'exit $?' stops bash and zsh from exec'ing the last command, which would drop the
+        shell and its tag) or a QNA_RUN_TAG variable set by cmd.exe.
+        """
+        if not tag:
+            return command
+        if os_type == OSType.WINDOWS.value:
+            return f"set QNA_RUN_TAG={tag}&& {command}"
+        return f": {tag}; {command}; exit $?"
+    
+    @staticmethod
+    def build_kill_command(tag: str, qna_path: str, os_type: str) -> str:
+        """Build a command that kills the QnA started by a command tagged with tag_command.
+        
+        On Unix the tagged shell's children (QnA and whatever feeds it) and the shell itself
+        are killed; on Windows the tagged cmd.exe is found by its command line and killed with
+        its process tree. '[q]' keeps the pattern from matching the shell running this very command.
+        """
+        pattern = f"[{tag[0]}]{tag[1:]}"
+        if os_type == OSType.WINDOWS.value:
+            return (f'powershell -NoProfile -NonInteractive -Command "Get-CimInstance Win32_Process '
+                    f"| Where-Object {{ $_.CommandLine -match 'QNA_RUN_TAG={pattern}' }} "
+                    f'| ForEach-Object {{ taskkill /F /T /PID $_.ProcessId }}"')
+        
+        return (f"for pid in $(pgrep -f '{pattern}'); do pkill -KILL -P \"$pid\"; kill -KILL \"$pid\"; "
+                f"done 2>/dev/null; true")
+    
+    @staticmethod
+    def sentinel_query(marker: str) -> str:
+        """Relevance string literal whose answer marks the end of the previous query's output"""
+        return f'"{marker}"'
+    
+    @staticmethod
+    def build_batch_script(queries: List[str], markers: List[str], os_type: str) -> str:
+        """Build QnA input with each query followed by its sentinel query"""
+        newline = "\r\n" if os_type == OSType.WINDOWS.value else "\n"
+        lines = QnACommandBuilder._batch_lines(queries, markers)
+        return newline.join(lines) + newline
+    
+    @staticmethod
+    def build_batch_command(queries: List[str], markers: List[str], qna_path: str,
+                            os_type: str) -> str:
+        """Build one command that pipes every query (and its sentinel) into a single QnA run"""
+        lines = QnACommandBuilder._batch_lines(queries, markers)
+        
+        if os_type == OSType.WINDOWS.value:
+            echoes = "& ".join(f"echo {QnACommandBuilder._escape_cmd(line)}" for line in lines)
+            return f'({echoes}) | "{qna_path}"'
+        else:
+            quoted = " ".join("'" + line.replace("'", "'\\''") + "'" for line in lines)
+            return f"printf '%s\\n' {quoted} | \"{qna_path}\""
+    
+    @staticmethod
+    def build_file_command(query_file: str, qna_path: str, os_type: str) -> str:
+        """Build a command that runs QnA over an uploaded query file and then removes it"""
+        if os_type == OSType.WINDOWS.value:
+            return f'"{qna_path}" "{query_file}" & del /q "{query_file}"'
+        else:
+            return f'"{qna_path}" "{query_file}"; status=$?; rm -f "{query_file}"; exit $status'
+    
+    @staticmethod
+    def _batch_lines(queries: List[str], markers: List[str]) -> List[str]:
+        """One QnA input line per query, each followed by its sentinel"""
+        lines = []
+        for query, marker in zip(queries, markers):
+            lines.append(" ".join(query.splitlines()))
+            lines.append(QnACommandBuilder.sentinel_query(marker))
+        return lines
+    
+    @staticmethod
+    def _escape_cmd(text: str) -> str:
+        """Escape cmd.exe metacharacters outside double-quoted relevance strings"""
+        escaped = []
+        in_quotes = False
+        for char in text:
+            if char == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes and char in '^&|<>()':
+                escaped.append('^')
+            escaped.append(char)
+        return "".join(escaped)
@@ -0,0 +1,160 @@
+from typing import Any, Callable, Dict, List, Optional
+from bigfix_universal_remote_qna.models.qna_answer_set import QnAAnswerSet
+
+
+class QnAOutputParser:
+    """Incrementally parses QnA output into one QnAAnswerSet per evaluated query"""
+    
+    ANSWER_MARKERS = ("A:", "E:", "T:", "I:")
+    
+    _TIME_UNITS = {"us": 0.001, "µs": 0.001, "ms": 1.0, "s": 1000.0}
+    
+    def __init__(self, on_answer: Optional[Callable[[QnAAnswerSet, str], None]] = None,
+                 keep_answers: bool = True):
+        self.on_answer = on_answer
+        # Callers that only need counts (or consume answers via on_answer) can skip storing them
+        self.keep_answers = keep_answers
+        self._partial = ""
+        self._current: Optional[QnAAnswerSet] = None
+        self._completed: List[QnAAnswerSet] = []
+    
+    def feed(self, chunk: str) -> List[QnAAnswerSet]:
+        """Parse a chunk of output, returning the answer sets completed by it"""
+        if not chunk:
+            return []
+        
+        end = chunk.find("\n")
+        if end == -1:
+            self._partial += chunk
+            return []
+        
+        # Only the carried-over partial line is joined; the chunk itself is sliced in place
+        self._parse_line(self._partial + chunk[:end])
+        start = end + 1
+        end = chunk.find("\n", start)
+        while end != -1:
+            self._parse_line(chunk[start:end])
+            start = end + 1
+            end = chunk.find("\n", start)
+        self._partial = chunk[start:]
+        
+        return self._take_completed()
+    
+    def close(self) -> List[QnAAnswerSet]:
+        """Flush buffered output at end of stream, returning the remaining answer sets"""
+        if self._partial:
+            self._parse_line(self._partial)
+            self._partial = ""
+        self._finish_current()
+        return self._take_completed()
+    
+    @classmethod
+    def parse(cls, output: str) -> List[QnAAnswerSet]:
+        """Parse complete QnA output"""
+        parser = cls()
+        return parser.feed(output) + parser.close()
+    
+    @classmethod
+    def parse_block(cls, block: str) -> QnAAnswerSet:
+        """Parse output known to belong to a single query into one answer set"""
+        return cls.merge(cls.parse(block))
+    
+    @staticmethod
+    def merge(answer_sets: List[QnAAnswerSet]) -> QnAAnswerSet:
+        """Combine answer sets that belong to the same query"""
+        merged = QnAAnswerSet()
+        for answer_set in answer_sets:
+            merged.query = merged.query or answer_set.query
+            merged.answers.extend(answer_set.answers)
+            merged.answer_count += answer_set.answer_count
+            merged.errors.extend(answer_set.errors)
+            merged.answer_type = answer_set.answer_type or merged.answer_type
+            if answer_set.eval_time_ms is not None:
+                merged.eval_time_ms = answer_set.eval_time_ms
+        return merged
+    
+    @staticmethod
+    def to_result(answer_set: QnAAnswerSet, stderr: str = "", exit_code: int = 0) -> Dict[str, Any]:
+        """Convert an answer set to the output/error/exit_code dict used by execute_command.
+        
+        As there, QnA's own "E:" lines stay in the output, error is the process's stderr and
+        success means the process exited with code 0.
+        """
+        lines = [f"A: {answer}" for answer in answer_set.answers]
+        lines.extend(f"E: {error}" for error in answer_set.errors)
+        if answer_set.answer_type:
+            lines.append(f"I: {answer_set.answer_type}")
+        if answer_set.eval_time_ms is not None:
+            lines.append(f"T: {answer_set.eval_time_ms:g} ms")
+        
+        return {
+            'output': "\n".join(lines) + "\n" if lines else "",
+            'error': stderr,
+            'exit_code': exit_code,
+            'success': exit_code == 0,
+            'answer_set': answer_set
+        }
+    
+    @classmethod
+    def parse_time(cls, value: str) -> Optional[float]:
+        """Parse a 'T:' value such as '1.234 ms' into milliseconds"""
+        parts = value.split()
+        if not parts:
+            return None
+        try:
+            amount = float(parts[0])
+        except ValueError:
+            return None
+        unit = parts[1] if len(parts) > 1 else "ms"
+        return amount * cls._TIME_UNITS.get(unit, 1.0)
+    
+    def _parse_line(self, line: str):
+        if line.endswith("\r"):
+            line = line[:-1]
+        
+        if line.startswith("Q:"):
+            # Each "Q:" prompt starts a new query; QnA may print answers on the same line
+            self._finish_current()
+            rest = line[2:].lstrip()
+            if rest.startswith(self.ANSWER_MARKERS):
+                self._current = QnAAnswerSet()
+                line = rest
+            else:
+                self._current = QnAAnswerSet(query=rest)
+                return
+        
+        if not line:
+            return
+        
+        marker = line[:2]
+        value = line[3:] if line[2:3] == " " else line[2:]
+        current = self._current
+        if current is None:
+            current = self._current = QnAAnswerSet()
+        
+        if marker == "A:":
+            current.answer_count += 1
+            if self.keep_answers:
+                current.answers.append(value)
+            if self.on_answer:
+                self.on_answer(current, value)
+        elif marker == "E:":
+            current.errors.append(value)
+        elif marker == "I:":
+            current.answer_type = value
+        elif marker == "T:":
+            current.eval_time_ms = self.parse_time(value)
+        elif current.answers and self.keep_answers:
+            # Answers containing line breaks continue on unmarked lines
+            current.answers[-1] += "\n" + line
+    
+    def _finish_current(self):
+        current = self._current
+        if current is not None and (current.query or current.answer_count or current.errors
+                                    or current.answer_type or current.eval_time_ms is not None):
+            self._completed.append(current)
+        self._current = None
+    
+    def _take_completed(self) -> List[QnAAnswerSet]:
+        completed, self._completed = self._completed, []
+        return completed
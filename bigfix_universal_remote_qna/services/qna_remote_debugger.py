@@ -1,53 +1,130 @@
 import os
 from bigfix_universal_remote_qna.services.config_initializer import ConfigInitializer
 from bigfix_universal_remote_qna.services.security_manager import SecurityManager
-from bigfix_universal_remote_qna.services.ssh_manager import SSHManager
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
 from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
 from bigfix_universal_remote_qna.services.profile_manager import ProfileManager
 from bigfix_universal_remote_qna.services.recent_queries_manager import RecentQueriesManager
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken, QueryCancelled
+from bigfix_universal_remote_qna.services.host_prober import HostProber
+from bigfix_universal_remote_qna.services.host_probe_cache import HostProbeCache
+from bigfix_universal_remote_qna.services.query_poller import QueryPoller
+from bigfix_universal_remote_qna.services.answer_grouper import AnswerGrouper
+from bigfix_universal_remote_qna.services.result_row_log import ResultRowLog
+from bigfix_universal_remote_qna.services.qna_session import QnASession
+from bigfix_universal_remote_qna.services.qna_batch_executor import QnABatchExecutor
+from bigfix_universal_remote_qna.services.ui_update_queue import UIUpdateQueue
+from bigfix_universal_remote_qna.services.paged_results_viewer import PagedResultsViewer
+from bigfix_universal_remote_qna.services.query_result_cache import QueryResultCache
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+from bigfix_universal_remote_qna.services.relevance_checker import RelevanceChecker
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.startup_profiler import StartupProfiler
+from bigfix_universal_remote_qna.models.answer_delta import AnswerDelta
 from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_probe import HostProbe
+from bigfix_universal_remote_qna.models.host_result import HostResult
 from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.models.transport_type import TransportType
 
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog, scrolledtext
 import threading
+import time
+from typing import Optional
+from dataclasses import replace
 import tkinter.simpledialog as simpledialog
 import tkinter.filedialog as filedialog
 import tkinter.scrolledtext as scrolledtext
 
 
 class QnARemoteDebugger:
-    def __init__(self, root):
+    # The in-process fake transport answers without a real host; it is for tests and benchmarks only
+    TRANSPORTS = [TransportType.SSH.value, TransportType.LOCAL.value]
+    
+    def __init__(self, root, profiler: StartupProfiler = None):
         self.root = root
         self.root.title("BigFix Universal Remote QnA")
+        profiler = profiler or StartupProfiler()
         
         # Initialize configuration
-        self.config_manager = ConfigInitializer.initialize_config()
-        
-        # Initialize managers
-        self.security_manager = SecurityManager()
-        self.ssh_manager = SSHManager()
-        self.command_builder = QnACommandBuilder()
-                
-        self.profile_manager = ProfileManager(
-            self.config_manager, 
-            self.security_manager,
-            profiles_file=os.path.expanduser("~/.bigfix_profiles.json")
-        )
-        
-        self.queries_manager = RecentQueriesManager(self.config_manager)
-        
-        # Initialize UI variables
-        self._init_ui_variables()
-        
-        # Apply initial configuration
-        self._apply_initial_config()
+        with profiler.phase("load config"):
+            self.config_manager = ConfigInitializer.initialize_config()
+        
+        # Initialize managers (none of these touch the network, disk or crypto yet)
+        with profiler.phase("init managers"):
+            self.security_manager = SecurityManager()
+            self.ssh_pool = SSHConnectionPool(
+                max_connections=self.config_manager.get_setting("ssh_pool_max_connections"),
+                idle_timeout=self.config_manager.get_setting("ssh_pool_idle_timeout"),
+                keepalive_interval=self.config_manager.get_setting("ssh_keepalive_interval")
+            )
+            self.latency_tracker = LatencyTracker()
+            self.ssh_manager = TransportFactory.create(pool=self.ssh_pool, tracker=self.latency_tracker)
+            self.command_builder = QnACommandBuilder()
+            self.qna_session = None
+            self.pollers = []
+            # One token per running query, batch or fleet run; "Stop" cancels them all
+            self.cancel_tokens = set()
+            
+            self.profile_manager = ProfileManager(
+                self.config_manager, 
+                self.security_manager,
+                profiles_file=os.path.expanduser("~/.bigfix_profiles.json"),
+                db_file=(os.path.expanduser("~/.bigfix_profiles.db")
+                         if self.config_manager.get_setting("profile_store_backend") == "sqlite" else None)
+            )
+            
+            self.queries_manager = RecentQueriesManager(
+                self.config_manager,
+                db_file=os.path.expanduser(self.config_manager.get_setting("query_history_file")) or None,
+                max_queries=15
+            )
+            
+            self.result_cache = QueryResultCache(
+                max_entries=self.config_manager.get_setting("query_cache_max_entries"),
+                default_ttl=self.config_manager.get_setting("query_cache_ttl"),
+                cache_file=(os.path.expanduser("~/.bigfix_query_cache.json")
+                            if self.config_manager.get_setting("query_cache_persist") else None)
+            )
+            
+            # Detected OS and QnA path per host, so reconnecting skips the probe
+            self.host_prober = HostProber(
+                {os_type.value: self.config_manager.get_setting(f"qna_path_{os_type.value}")
+                 for os_type in OSType},
+                HostProbeCache(os.path.expanduser("~/.bigfix_host_probes.json"),
+                               ttl=self.config_manager.get_setting("host_probe_ttl"),
+                               negative_ttl=self.config_manager.get_setting("host_probe_negative_ttl"))
+            )
+            
+            # Encrypted password of the loaded profile; decrypted only when connecting
+            self._saved_password = None
+            
+            # Every result shown, as rows for "Export Results..."; kept on disk, not in memory
+            self.result_rows = ResultRowLog()
         
-        # Setup UI
-        self.setup_ui()
+        with profiler.phase("build ui"):
+            # Initialize UI variables
+            self._init_ui_variables()
+            
+            # Apply initial configuration
+            self._apply_initial_config()
+            
+            # Worker threads hand UI updates to the main loop through this queue
+            self.ui_queue = UIUpdateQueue(
+                self.root,
+                frame_budget_ms=self.config_manager.get_setting("ui_frame_budget_ms"),
+                tracker=self.latency_tracker
+            )
+            
+            # Setup UI
+            self.setup_ui()
+            self.ui_queue.start()
         
-        # Load and apply saved settings
-        self._load_saved_settings()
+        # Load and apply saved settings once the window is up
+        self.root.after_idle(self._load_saved_settings)
     
     def _init_ui_variables(self):
         """Initialize all UI variables"""
@@ -59,8 +136,13 @@ class QnARemoteDebugger:
         self.save_passwords_var = tk.BooleanVar()
         self.os_var = tk.StringVar(value=OSType.WINDOWS.value)
         self.qna_path_var = tk.StringVar()
+        self.transport_var = tk.StringVar(value=TransportType.SSH.value)
         self.status_var = tk.StringVar(value="Disconnected")
         self.recent_query_var = tk.StringVar()
+        self.session_mode_var = tk.BooleanVar()
+        self.bypass_cache_var = tk.BooleanVar()
+        self.cache_stats_var = tk.StringVar(value="Cache: 0 hits / 0 misses")
+        self.syntax_var = tk.StringVar()
     
     def _apply_initial_config(self):
         """Apply initial configuration from ConfigManager"""
@@ -72,6 +154,9 @@ class QnARemoteDebugger:
         save_passwords = self.config_manager.get_setting("save_passwords")
         self.save_passwords_var.set(save_passwords)
         
+        # Set session mode preference
+        self.session_mode_var.set(self.config_manager.get_setting("qna_session_mode"))
+        
         # Set initial QnA path based on default OS
         qna_path = self.config_manager.get_setting("qna_path_windows")
         self.qna_path_var.set(qna_path)
@@ -120,6 +205,9 @@ class QnARemoteDebugger:
                        variable=self.save_passwords_var, 
                        command=self._save_password_preference).grid(
             row=3, column=1, sticky=tk.W, pady=(5, 0))
+        self.master_key_btn = ttk.Button(conn_frame, text="Unlock Master Key",
+                                         command=self.unlock_master_key)
+        self.master_key_btn.grid(row=3, column=2, columnspan=2, sticky=tk.W, pady=(5, 0))
         
         # OS and QnA path
         self._add_form_field(conn_frame, 4, "Target OS:", self.os_var, 
@@ -127,6 +215,9 @@ class QnARemoteDebugger:
         os_combo = conn_frame.grid_slaves(row=4, column=1)[0]
         os_combo.bind('<<ComboboxSelected>>', self.on_os_change)
         
+        self._add_form_field(conn_frame, 4, "Transport:", self.transport_var, column=2,
+                           combo=True, values=self.TRANSPORTS)
+        
         self._add_form_field(conn_frame, 5, "QnA Path:", self.qna_path_var, columnspan=2)
         
         # Connection buttons
@@ -162,6 +253,8 @@ class QnARemoteDebugger:
         
         ttk.Button(btn_frame, text="Test QnA Path", command=self.test_qna_path).pack(
             side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Detect Host", command=self.detect_host).pack(
+            side=tk.LEFT, padx=(0, 5))
 
         self.status_label = ttk.Label(btn_frame, textvariable=self.status_var, foreground="red")
         self.status_label.pack(side=tk.RIGHT)
@@ -266,8 +359,13 @@ class QnARemoteDebugger:
         
         self.query_text = scrolledtext.ScrolledText(query_frame, height=8, width=80)
         self.query_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.query_text.tag_configure("syntax_error", underline=True, foreground="red")
+        self.query_text.bind('<KeyRelease>', self._check_query_syntax)
         
         self._setup_query_buttons(query_frame)
+        
+        self.syntax_label = ttk.Label(query_frame, textvariable=self.syntax_var, foreground="gray")
+        self.syntax_label.grid(row=2, column=0, sticky=tk.W, pady=(5, 0))
     
     def _setup_query_buttons(self, parent):
         """Setup query control buttons"""
@@ -276,19 +374,35 @@ class QnARemoteDebugger:
         
         buttons = [
             ("Execute Query", self.execute_query),
+            ("Execute Lines as Batch", self.execute_batch_query),
+            ("Execute on Profiles", self.execute_fleet_query),
+            ("Stop", self.stop_queries),
+            ("Poll Query", self.poll_query),
+            ("Stop Polls", self.stop_polls),
             ("Clear Query", self.clear_query),
             ("Load Query", self.load_query),
-            ("Save Query", self.save_query)
+            ("Save Query", self.save_query),
+            ("Export Results...", self.export_results),
+            ("Timing Stats", self.show_timing_stats)
         ]
         
         for text, command in buttons:
             ttk.Button(btn_frame, text=text, command=command).pack(side=tk.LEFT, padx=(0, 5))
         
-        # Recent queries
-        ttk.Label(btn_frame, text="Recent:").pack(side=tk.LEFT, padx=(10, 5))
+        # Query history; typing searches it
+        ttk.Label(btn_frame, text="History:").pack(side=tk.LEFT, padx=(10, 5))
         self.recent_combo = ttk.Combobox(btn_frame, textvariable=self.recent_query_var, width=30)
         self.recent_combo.pack(side=tk.LEFT, padx=(0, 5))
         self.recent_combo.bind('<<ComboboxSelected>>', self.load_recent_query)
+        self.recent_combo.bind('<KeyRelease>', self._suggest_queries)
+        self.recent_combo.bind('<Return>', self._load_best_suggestion)
+        
+        ttk.Checkbutton(btn_frame, text="Session mode", variable=self.session_mode_var,
+                        command=self._save_session_mode_preference).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Checkbutton(btn_frame, text="Bypass cache",
+                        variable=self.bypass_cache_var).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Label(btn_frame, textvariable=self.cache_stats_var,
+                  foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
     
     def _setup_results_frame(self, parent):
         """Setup results display frame"""
@@ -297,7 +411,8 @@ class QnARemoteDebugger:
         results_frame.columnconfigure(0, weight=1)
         results_frame.rowconfigure(0, weight=1)
         
-        self.results_text = scrolledtext.ScrolledText(results_frame, height=15, width=80)
+        # Only the visible page lives in Tk; full output is spilled to disk
+        self.results_text = PagedResultsViewer(results_frame)
         self.results_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
     def _setup_status_bar(self, parent):
@@ -337,23 +452,37 @@ class QnARemoteDebugger:
         
         # Load last used connection
         last_connection_index = self.config_manager.get_setting("last_used_connection_index")
-        profiles = self.profile_manager.get_all_profiles()
+        profile = self.profile_manager.get_profile_at(last_connection_index)
         
-        if profiles and 0 <= last_connection_index < len(profiles):
-            profile = profiles[last_connection_index]
+        if profile:
             self._load_profile_data(profile)
     
     def _update_profiles_dropdown(self):
         """Update profiles dropdown"""
-        profiles = self.profile_manager.get_all_profiles()
-        profile_names = [profile.name for profile in profiles]
-        self.profile_combo['values'] = profile_names
+        self.profile_combo['values'] = self.profile_manager.get_profile_names()
     
     def _update_recent_queries_dropdown(self):
         """Update recent queries dropdown"""
         recent_queries = self.queries_manager.get_recent_queries()
         self.recent_combo['values'] = recent_queries
     
+    def _suggest_queries(self, event=None):
+        """Offer the best ranked history matches for the text typed into the history box"""
+        if event is not None and event.keysym in ("Up", "Down", "Left", "Right", "Return", "Escape", "Tab"):
+            return
+        text = self.recent_query_var.get()
+        if text.strip():
+            self.recent_combo['values'] = self.queries_manager.search(text)
+        else:
+            self._update_recent_queries_dropdown()
+    
+    def _load_best_suggestion(self, event=None):
+        """Load the typed query, or the best match for it if it is not a stored query"""
+        suggestions = self.recent_combo['values']
+        if suggestions and self.recent_query_var.get() not in suggestions:
+            self.recent_query_var.set(suggestions[0])
+        self.load_recent_query()
+    
     def _save_password_preference(self):
         """Save password preference setting"""
         try:
@@ -364,6 +493,18 @@ class QnARemoteDebugger:
         except:
             pass
     
+    def _save_session_mode_preference(self):
+        """Save session mode setting, stopping any running session when turned off"""
+        if not self.session_mode_var.get():
+            self._close_qna_session()
+        try:
+            self.config_manager.define_setting(
+                "qna_session_mode", False, self.session_mode_var.get(), bool,
+                "Whether queries reuse a persistent QnA session"
+            )
+        except:
+            pass
+    
     def _get_qna_path_for_os(self, os_type: str) -> str:
         """Get QnA path for specified OS"""
         setting_key = f"qna_path_{os_type}"
@@ -380,7 +521,7 @@ class QnARemoteDebugger:
         host = self.host_var.get().strip()
         username = self.username_var.get().strip()
         
-        if not host or not username:
+        if not host or (not username and self.transport_var.get() == TransportType.SSH.value):
             messagebox.showerror("Error", "Host and username are required")
             return
         
@@ -399,19 +540,76 @@ class QnARemoteDebugger:
             port=int(self.port_var.get()),
             username=username,
             os=self.os_var.get(),
-            qna_path=self.qna_path_var.get()
+            qna_path=self.qna_path_var.get(),
+            transport=self.transport_var.get()
         )
         
-        # Handle password encryption
-        if self.save_passwords_var.get() and self.password_var.get():
-            key = self.security_manager.generate_key(f"{username}@{host}")
-            profile.password = self.security_manager.encrypt_password(
-                self.password_var.get(), key
-            )
+        password = self.password_var.get() if self.save_passwords_var.get() else ""
+        if self.save_passwords_var.get() and not password:
+            # Keep the stored password of the loaded profile without decrypting it
+            profile.password = self._saved_password_for(username, host) or ""
         
-        if self.profile_manager.save_profile(profile):
+        def encrypt_thread():
+            # Key derivation is slow, so it never runs on the main loop
+            if password:
+                profile.password = self.security_manager.encrypt_profile_password(
+                    password, f"{username}@{host}")
+            self.ui_queue.post(self._store_profile, profile)
+        
+        threading.Thread(target=encrypt_thread, daemon=True).start()
+    
+    def _store_profile(self, profile: ConnectionProfile):
+        """Save an encrypted profile on the main loop, confirming overwrites"""
+        confirm_overwrite = lambda name: messagebox.askyesno(
+            "Update Profile", f"Profile '{name}' already exists. Update it?")
+        if self.profile_manager.save_profile(profile, confirm_overwrite=confirm_overwrite):
             self._update_profiles_dropdown()
-            messagebox.showinfo("Success", f"Profile '{profile_name}' saved successfully")
+            messagebox.showinfo("Success", f"Profile '{profile.name}' saved successfully")
+    
+    def unlock_master_key(self):
+        """Unlock (or set up) the master key that encrypts saved passwords"""
+        if self.security_manager.unlocked:
+            messagebox.showinfo("Master Key", "Master key is already unlocked")
+            return
+        
+        record = self.config_manager.get_setting("master_key_record")
+        prompt = "Master key passphrase:" if record else "Choose a master key passphrase:"
+        passphrase = simpledialog.askstring("Master Key", prompt, show="*")
+        if not passphrase:
+            return
+        if not record and passphrase != simpledialog.askstring(
+                "Master Key", "Repeat the passphrase:", show="*"):
+            messagebox.showerror("Error", "Passphrases do not match")
+            return
+        
+        def unlock_thread():
+            if record:
+                unlocked = self.security_manager.unlock(passphrase, record)
+            else:
+                new_record = self.security_manager.create_master_key(passphrase)
+                self.ui_queue.post(self._save_master_key_record, new_record)
+                unlocked = True
+            self.ui_queue.post(self._on_master_key_unlocked, unlocked)
+        
+        threading.Thread(target=unlock_thread, daemon=True).start()
+    
+    def _save_master_key_record(self, record: str):
+        """Persist the master key salt and verifier"""
+        try:
+            self.config_manager.define_setting(
+                "master_key_record", False, record, str,
+                "Salt and verifier of the profile store master key (empty when not set up)"
+            )
+        except:
+            pass
+    
+    def _on_master_key_unlocked(self, unlocked: bool):
+        """Reflect the master key state after an unlock attempt"""
+        if unlocked:
+            self.master_key_btn.configure(text="Master Key Unlocked", state=tk.DISABLED)
+            self._log_message("Master key unlocked; saved passwords now use it")
+        else:
+            messagebox.showerror("Master Key", "Incorrect passphrase")
     
     def delete_profile(self):
         """Delete selected profile"""
@@ -421,6 +619,9 @@ class QnARemoteDebugger:
             return
         
         if messagebox.askyesno("Confirm Delete", f"Delete profile '{profile_name}'?"):
+            profile = self.profile_manager.get_profile_by_name(profile_name)
+            if profile:
+                self.security_manager.invalidate_key(f"{profile.username}@{profile.host}")
             self.profile_manager.delete_profile(profile_name)
             self._update_profiles_dropdown()
             self._clear_connection_fields()
@@ -434,17 +635,14 @@ class QnARemoteDebugger:
         if profile:
             self._load_profile_data(profile)
             # Save as last used connection
-            profiles = self.profile_manager.get_all_profiles()
-            for i, p in enumerate(profiles):
-                if p.name == profile_name:
-                    try:
-                        self.config_manager.define_setting(
-                            "last_used_connection_index", False, i, int,
-                            "Index of the last used connection profile"
-                        )
-                    except:
-                        pass
-                    break
+            try:
+                self.config_manager.define_setting(
+                    "last_used_connection_index", False,
+                    self.profile_manager.get_profile_index(profile_name), int,
+                    "Index of the last used connection profile"
+                )
+            except:
+                pass
     
     def _load_profile_data(self, profile: ConnectionProfile):
         """Load profile data into UI"""
@@ -453,68 +651,160 @@ class QnARemoteDebugger:
         self.username_var.set(profile.username)
         self.os_var.set(profile.os)
         self.qna_path_var.set(profile.qna_path)
+        self.transport_var.set(profile.transport or TransportType.SSH.value)
         self.profile_var.set(profile.name)
         
-        # Decrypt password if available
-        if profile.password:
-            key = self.security_manager.generate_key(f"{profile.username}@{profile.host}")
-            decrypted_password = self.security_manager.decrypt_password(profile.password, key)
-            self.password_var.set(decrypted_password)
-        else:
-            self.password_var.set('')
+        # Key derivation is slow, so the stored password is decrypted only when connecting
+        self.password_var.set('')
+        self._saved_password = ((profile.username, profile.host, profile.password)
+                                if profile.password else None)
+        
+        # Derive a per-profile key in the background so connecting does not wait for it
+        if profile.password and not profile.password.startswith(SecurityManager.MASTER_KEY_PREFIX):
+            threading.Thread(target=self.security_manager.generate_key,
+                             args=(f"{profile.username}@{profile.host}",), daemon=True).start()
+    
+    def _saved_password_for(self, username: str, host: str) -> Optional[str]:
+        """Encrypted password of the loaded profile if it matches username and host"""
+        if self._saved_password and self._saved_password[:2] == (username, host):
+            return self._saved_password[2]
+        return None
     
     def _clear_connection_fields(self):
         """Clear all connection fields"""
         for var in [self.profile_var, self.host_var, self.username_var, self.password_var]:
             var.set('')
+        self._saved_password = None
         self.port_var.set('22')
         self.os_var.set(OSType.WINDOWS.value)
+        self.transport_var.set(TransportType.SSH.value)
         qna_path = self._get_qna_path_for_os(OSType.WINDOWS.value)
         self.qna_path_var.set(qna_path)
     
     def connect_ssh(self):
         """Establish SSH connection"""
+        # Tk variables are read here, on the main loop, never from the worker
+        try:
+            profile = ConnectionProfile(
+                name="temp",
+                host=self.host_var.get().strip(),
+                port=int(self.port_var.get()),
+                username=self.username_var.get().strip(),
+                password=self.password_var.get(),
+                os=self.os_var.get(),
+                qna_path=self.qna_path_var.get(),
+                transport=self.transport_var.get()
+            )
+        except ValueError:
+            messagebox.showerror("Error", "Port must be a number")
+            return
+        
+        if profile.transport not in self.TRANSPORTS:
+            messagebox.showerror("Error", f"The '{profile.transport}' transport cannot be used here")
+            return
+        
+        encrypted_password = None
+        if not profile.password:
+            encrypted_password = self._saved_password_for(profile.username, profile.host)
+        
+        if profile.transport != TransportType.SSH.value:
+            # The local transport needs no credentials
+            profile.host = profile.host or "localhost"
+        elif not profile.host or not profile.username or not (profile.password or encrypted_password):
+            messagebox.showerror("Error", "Please fill in all connection fields")
+            return
+        
+        saved_name = self.profile_var.get()
+        probe_on_connect = self.config_manager.get_setting("host_probe_on_connect")
+        
         def connect_thread():
             try:
-                profile = ConnectionProfile(
-                    name="temp",
-                    host=self.host_var.get().strip(),
-                    port=int(self.port_var.get()),
-                    username=self.username_var.get().strip(),
-                    password=self.password_var.get()
-                )
+                self._update_status("Connecting...")
+                self._close_qna_session()
                 
-                if not profile.host or not profile.username or not profile.password:
-                    messagebox.showerror("Error", "Please fill in all connection fields")
-                    return
+                current = self.ssh_manager.profile.transport if self.ssh_manager.profile else None
+                if current != profile.transport:
+                    self.ssh_manager.disconnect()
+                    self.ssh_manager = TransportFactory.create(
+                        profile, pool=self.ssh_pool, tracker=self.latency_tracker)
                 
-                self._update_status("Connecting...")
+                if encrypted_password:
+                    profile.password = self.security_manager.decrypt_profile_password(
+                        encrypted_password, f"{profile.username}@{profile.host}")
                 
                 if self.ssh_manager.connect(profile):
                     self._update_status("Connected", "green")
-                    self._toggle_connection_buttons(True)
+                    self.ui_queue.post(self._toggle_connection_buttons, True)
                     self._log_message(f"Successfully connected to {profile.host}")
+                    if probe_on_connect:
+                        self._probe_host(saved_name)
                 
             except Exception as e:
                 self._update_status("Connection Failed", "red")
-                messagebox.showerror("Connection Error", str(e))
+                self.ui_queue.post(messagebox.showerror, "Connection Error", str(e))
                 self._log_message(f"Connection failed: {str(e)}")
         
         threading.Thread(target=connect_thread, daemon=True).start()
     
+    def detect_host(self):
+        """Probe the connected host again for its OS and QnA path, ignoring the cache"""
+        if not self.ssh_manager.connected:
+            messagebox.showerror("Error", "Please connect to a remote machine first")
+            return
+        
+        saved_name = self.profile_var.get()
+        threading.Thread(target=self._probe_host, args=(saved_name, True), daemon=True).start()
+    
+    def _probe_host(self, saved_name: str, force: bool = False):
+        """Detect the connected host's OS and QnA path and fill them in (worker thread)"""
+        profile = self.ssh_manager.profile
+        cached = not force and self.host_prober.cached(profile) is not None
+        try:
+            probe = self.host_prober.probe(self.ssh_manager, force=force)
+        except Exception as e:
+            self._log_message(f"✗ Host detection failed: {str(e)}")
+            return
+        
+        if not probe.os:
+            self._log_message("✗ Could not detect the host's OS; keeping the selected one")
+            return
+        
+        found = f"QnA at {probe.qna_path}" if probe.qna_path else "QnA not found in any known location"
+        self._log_message(f"✓ Detected {probe.os} ({probe.os_version}), {found}"
+                          f"{' (cached)' if cached else ''}")
+        self.ui_queue.post(self._apply_probe, probe, saved_name, profile.host)
+    
+    def _apply_probe(self, probe: HostProbe, saved_name: str, host: str):
+        """Show a probe's OS and QnA path and remember the OS in the saved profile"""
+        self.os_var.set(probe.os)
+        if probe.qna_path:
+            self.qna_path_var.set(probe.qna_path)
+        
+        saved = self.profile_manager.get_profile_by_name(saved_name) if saved_name else None
+        if saved is not None and saved.host == host:
+            try:
+                self.profile_manager.save_profiles(
+                    [replace(saved, detected_os=probe.os, last_seen=time.time())])
+            except Exception as e:
+                self._log_message(f"✗ Could not update profile '{saved_name}': {str(e)}")
+    
     def disconnect_ssh(self):
         """Disconnect SSH connection"""
+        self._close_qna_session()
         self.ssh_manager.disconnect()
         self._update_status("Disconnected", "red")
         self._toggle_connection_buttons(False)
         self._log_message("Disconnected from remote host")
     
     def _update_status(self, status: str, color: str = "black"):
-        """Update connection status"""
+        """Update connection status (safe from any thread)"""
+        self.ui_queue.post(self._apply_status, status, color)
+    
+    def _apply_status(self, status: str, color: str):
+        """Show connection status on the main loop"""
         self.status_var.set(status)
         if hasattr(self, 'status_label'):
             self.status_label.configure(foreground= color)
-        self.root.update()
     
     def _toggle_connection_buttons(self, connected: bool):
         """Toggle connection button states"""
@@ -527,20 +817,22 @@ class QnARemoteDebugger:
             messagebox.showerror("Error", "Please connect to a remote machine first")
             return
         
+        qna_path = self.qna_path_var.get().strip()
+        os_type = self.os_var.get()
+        
         def test_thread():
             try:
-                qna_path = self.qna_path_var.get().strip()
-                os_type = self.os_var.get()
-                
                 if self.ssh_manager.test_file_exists(qna_path, os_type):
-                    messagebox.showinfo("Success", f"QnA found at: {qna_path}")
+                    self.ui_queue.post(messagebox.showinfo, "Success", f"QnA found at: {qna_path}")
                     self._log_message(f"QnA path verified: {qna_path}")
                 else:
-                    messagebox.showerror("Error", f"QnA not found at: {qna_path}")
+                    # A cached probe that pointed here is out of date
+                    self.host_prober.invalidate(self.ssh_manager.profile)
+                    self.ui_queue.post(messagebox.showerror, "Error", f"QnA not found at: {qna_path}")
                     self._log_message(f"QnA path not found: {qna_path}")
                     
             except Exception as e:
-                messagebox.showerror("Error", f"Failed to test QnA path: {str(e)}")
+                self.ui_queue.post(messagebox.showerror, "Error", f"Failed to test QnA path: {str(e)}")
                 self._log_message(f"Error testing QnA path: {str(e)}")
         
         threading.Thread(target=test_thread, daemon=True).start()
@@ -555,43 +847,560 @@ class QnARemoteDebugger:
         if not query:
             messagebox.showerror("Error", "Please enter a relevance query")
             return
+        if not self._confirm_syntax([query]):
+            return
         
         # Add to recent queries
         self.queries_manager.add_query(query)
         self._update_recent_queries_dropdown()
         
+        qna_path = self.qna_path_var.get().strip()
+        os_type = self.os_var.get()
+        session_mode = self.session_mode_var.get()
+        bypass_cache = self.bypass_cache_var.get()
+        cache_host = self._cache_host()
+        host = self.ssh_manager.profile.host
+        cancel_token = self._new_cancel_token()
+        
         def execute_thread():
+            start = time.perf_counter()
             try:
                 self._log_message("Executing query...")
                 self._log_message("=" * 50)
                 
-                qna_path = self.qna_path_var.get().strip()
-                os_type = self.os_var.get()
+                cached = None if bypass_cache else self.result_cache.get(cache_host, qna_path, query)
+                if cached is not None:
+                    self._show_result(query, cached, f" (cached {cached['cache_age']:.0f}s ago)")
+                    self._record_result(query, cached)
+                elif session_mode:
+                    result = self._get_qna_session(qna_path, os_type).query(
+                        query, timeout=60, cancel_token=cancel_token)
+                    self._show_result(query, result)
+                    self._record_result(query, result, time.perf_counter() - start)
+                    self.result_cache.put(cache_host, qna_path, query, result)
+                else:
+                    result = self._stream_query(query, qna_path, os_type, start, cancel_token)
+                    if result is not None:
+                        self.result_cache.put(cache_host, qna_path, query, result)
                 
-                command = self.command_builder.build_command(query, qna_path, os_type)
-                result = self.ssh_manager.execute_command(command, timeout=60)
+                self._log_message("=" * 50)
                 
-                # Display results
-                output = f"Query: {query}\n\n"
-                output += f"Exit Code: {result['exit_code']}\n\n"
+                if cached is None:
+                    self.latency_tracker.record("total", time.perf_counter() - start,
+                                                host=host, query=query)
+                
+            except QueryCancelled:
+                self._log_message("\n✗ Query stopped")
+            except Exception as e:
+                self._log_message(f"Error executing query: {str(e)}")
+            finally:
+                self.cancel_tokens.discard(cancel_token)
+                self.ui_queue.post(self._update_cache_stats)
+        
+        threading.Thread(target=execute_thread, daemon=True).start()
+    
+    def _show_result(self, query: str, result: dict, note: str = ""):
+        """Display a complete query result"""
+        output = f"Query: {query}{note}\n\n"
+        output += f"Exit Code: {result['exit_code']}\n\n"
+        
+        if result['output']:
+            output += f"Output:\n{result['output']}\n"
+        
+        if result['error']:
+            output += f"Error:\n{result['error']}\n"
+        
+        self._log_message(output)
+    
+    def _stream_query(self, query: str, qna_path: str, os_type: str, start: float,
+                      cancel_token: Optional[CancelToken] = None):
+        """Run a query and show its output in the results area as it arrives.
+        
+        Returns the collected result for caching, or None if it was too large to keep.
+        """
+        command = self.command_builder.build_command(query, qna_path, os_type)
+        kill_command = ""
+        if cancel_token is not None:
+            command = self.command_builder.tag_command(command, cancel_token.tag, os_type)
+            kill_command = self.command_builder.build_kill_command(cancel_token.tag, qna_path, os_type)
+        stream = self.ssh_manager.stream_command(command, timeout=60, query=query,
+                                                 cancel_token=cancel_token, kill_command=kill_command)
+        
+        output = []
+        error = []
+        collected = 0
+        limit = self.result_cache.max_result_chars
+        # Answers go to the export rows as they arrive; the text shown is kept only up to the cache limit
+        profile = self.ssh_manager.profile
+        stream_id = self.result_rows.begin(profile.name, profile.host, query)
+        parser = QnAOutputParser(
+            on_answer=lambda answer_set, answer: self.result_rows.append_answer(stream_id, answer),
+            keep_answers=False)
+        
+        self._log_message(f"Query: {query}\n")
+        self._log_message("Output:")
+        try:
+            for stream_name, text in stream:
+                self._append_text(text)
+                if stream_name == stream.STDOUT:
+                    parser.feed(text)
+                if collected <= limit:
+                    collected += len(text)
+                    (output if stream_name == stream.STDOUT else error).append(text)
+        except Exception as e:
+            self.result_rows.finish(stream_id, HostResult(
+                profile_name=profile.name, host=profile.host, query=query, error=str(e),
+                duration=time.perf_counter() - start))
+            raise
+        
+        answer_set = QnAOutputParser.merge(parser.close())
+        if answer_set.eval_time_ms is not None:
+            self.latency_tracker.record("evaluation", answer_set.eval_time_ms / 1000.0,
+                                        host=self.ssh_manager.profile.host, query=query)
+        
+        exit_code = stream.exit_code
+        self._log_message(f"\nExit Code: {exit_code}")
+        self._log_message(self._summarize_answers(answer_set))
+        self._record_result(query, {
+            'error': "".join(error),
+            'exit_code': exit_code,
+            'success': exit_code == 0,
+            'answer_set': answer_set
+        }, time.perf_counter() - start, stream_id)
+        
+        if collected > limit:
+            return None
+        return {
+            'output': "".join(output),
+            'error': "".join(error),
+            'exit_code': exit_code,
+            'success': exit_code == 0
+        }
+    
+    def _check_query_syntax(self, event=None):
+        """Check the query box locally and mark the first problem (runs on every keystroke)"""
+        self.query_text.tag_remove("syntax_error", "1.0", tk.END)
+        query = self.query_text.get("1.0", "end-1c")
+        if not query.strip() or not self.config_manager.get_setting("relevance_precheck"):
+            self.syntax_var.set("")
+            return
+        
+        issue = RelevanceChecker.check(query)
+        if issue is None:
+            self.syntax_var.set("✓ Relevance syntax OK")
+            self.syntax_label.configure(foreground="gray")
+            return
+        
+        start = f"1.0 + {issue.position} chars"
+        self.query_text.tag_add("syntax_error", start, f"{start} + {max(issue.length, 1)} chars")
+        line, column = self.query_text.index(start).split(".")
+        self.syntax_var.set(f"✗ Line {line}, column {int(column) + 1}: {issue.message}")
+        self.syntax_label.configure(foreground="red")
+    
+    def _confirm_syntax(self, queries) -> bool:
+        """Whether to send queries: True if they pass the local check or the user sends them anyway"""
+        if not self.config_manager.get_setting("relevance_precheck"):
+            return True
+        for query in queries:
+            issue = RelevanceChecker.check(query)
+            if issue is None:
+                continue
+            self._check_query_syntax()
+            shown = query if len(query) <= 80 else query[:77] + "..."
+            return messagebox.askyesno(
+                "Relevance Check",
+                f"{shown}\n\nColumn {issue.position + 1}: {issue.message}\n\n"
+                "QnA will most likely reject this query. Send it anyway?",
+                icon=messagebox.WARNING
+            )
+        return True
+    
+    def _record_result(self, query: str, result: dict, duration: Optional[float] = None,
+                       stream_id: Optional[int] = None):
+        """Add a result of the connected host to the rows for "Export Results..." and the history.
+        
+        stream_id finishes a result whose answers were already recorded as they streamed in.
+        """
+        answer_set = result.get('answer_set') or QnAOutputParser.parse_block(result.get('output', ""))
+        error = result['error']
+        profile = self.ssh_manager.profile
+        host_result = HostResult(
+            profile_name=profile.name if profile else "",
+            host=profile.host if profile else "",
+            query=query,
+            error=error,
+            exit_code=result['exit_code'],
+            success=result['exit_code'] == 0,
+            duration=duration or 0.0,
+            answer_set=answer_set
+        )
+        if stream_id is None:
+            self.result_rows.append(host_result)
+        else:
+            self.result_rows.finish(stream_id, host_result)
+        self.queries_manager.record_result(query, profile.host if profile else "", duration)
+        if profile and HostProber.qna_missing(result['exit_code'], error):
+            self.host_prober.invalidate(profile)
+            self._log_message("✗ QnA could not be run; use Detect Host to find it again")
+    
+    @staticmethod
+    def _summarize_answers(answer_set) -> str:
+        """One-line summary of a parsed answer set"""
+        summary = f"Answers: {answer_set.answer_count}"
+        if answer_set.answer_type:
+            summary += f" ({answer_set.answer_type})"
+        if answer_set.eval_time_ms is not None:
+            summary += f", evaluated in {answer_set.eval_time_ms:g} ms"
+        if answer_set.errors:
+            summary += f", {len(answer_set.errors)} error(s)"
+        return summary
+    
+    def _cache_host(self) -> str:
+        """Cache key for the currently connected host"""
+        profile = self.ssh_manager.profile
+        return f"{profile.host}:{profile.port}" if profile else ""
+    
+    def _update_cache_stats(self):
+        """Show query cache hit/miss counts"""
+        stats = self.result_cache.stats()
+        self.cache_stats_var.set(
+            f"Cache: {stats['hits']} hits / {stats['misses']} misses ({stats['entries']} entries)"
+        )
+    
+    def execute_batch_query(self):
+        """Execute each line of the query box as a separate expression in one QnA run"""
+        if not self.ssh_manager.connected:
+            messagebox.showerror("Error", "Please connect to a remote machine first")
+            return
+        
+        queries = [line.strip() for line in self.query_text.get("1.0", tk.END).splitlines()
+                   if line.strip()]
+        if not queries:
+            messagebox.showerror("Error", "Please enter one relevance query per line")
+            return
+        if not self._confirm_syntax(queries):
+            return
+        
+        self.queries_manager.add_queries(queries)
+        self._update_recent_queries_dropdown()
+        
+        qna_path = self.qna_path_var.get().strip()
+        os_type = self.os_var.get()
+        cancel_token = self._new_cancel_token()
+        
+        def batch_thread():
+            try:
+                self._log_message(f"Executing batch of {len(queries)} queries...")
+                self._log_message("=" * 50)
                 
-                if result['output']:
-                    output += f"Output:\n{result['output']}\n"
+                batch_executor = QnABatchExecutor(self.ssh_manager)
+                results = batch_executor.execute(queries, qna_path, os_type, cancel_token=cancel_token)
                 
-                if result['error']:
-                    output += f"Error:\n{result['error']}\n"
+                for result in results:
+                    output = f"Query: {result['query']}\n"
+                    output += f"Exit Code: {result['exit_code']}\n"
+                    
+                    if result['output']:
+                        output += f"Output:\n{result['output']}"
+                    
+                    if result['error']:
+                        output += f"Error:\n{result['error']}\n"
+                    
+                    self._log_message(output)
+                    self._record_result(result['query'], result)
                 
-                self._log_message(output)
                 self._log_message("=" * 50)
                 
+            except QueryCancelled:
+                self._log_message("✗ Batch stopped")
             except Exception as e:
-                self._log_message(f"Error executing query: {str(e)}")
+                self._log_message(f"Error executing batch: {str(e)}")
+            finally:
+                self.cancel_tokens.discard(cancel_token)
         
-        threading.Thread(target=execute_thread, daemon=True).start()
+        threading.Thread(target=batch_thread, daemon=True).start()
+    
+    def _get_qna_session(self, qna_path: str, os_type: str) -> QnASession:
+        """Get the running QnA session, starting a new one if the path or OS changed"""
+        session = self.qna_session
+        if session is None or not session.matches(qna_path, os_type):
+            self._close_qna_session()
+            session = QnASession(self.ssh_manager, qna_path, os_type)
+            self.qna_session = session
+        return session
+    
+    def _close_qna_session(self):
+        """Stop the persistent QnA session if one is running"""
+        if self.qna_session is not None:
+            self.qna_session.close()
+            self.qna_session = None
+    
+    def execute_fleet_query(self):
+        """Execute relevance query on a group of saved profiles concurrently"""
+        query = self.query_text.get("1.0", tk.END).strip()
+        if not query:
+            messagebox.showerror("Error", "Please enter a relevance query")
+            return
+        if not self._confirm_syntax([query]):
+            return
+        
+        all_names = self.profile_manager.get_profile_names()
+        if not all_names:
+            messagebox.showerror("Error", "No saved profiles to run against")
+            return
+        
+        names_text = simpledialog.askstring(
+            "Execute on Profiles",
+            "Comma-separated profile names (leave as-is for all profiles):",
+            initialvalue=", ".join(all_names)
+        )
+        if not names_text:
+            return
+        
+        profile_names = [name.strip() for name in names_text.split(",") if name.strip()]
+        profiles = self.profile_manager.get_profiles_by_names(profile_names)
+        if not profiles:
+            messagebox.showerror("Error", "None of the given profiles exist")
+            return
+        unsupported = [profile.name for profile in profiles
+                       if (profile.transport or TransportType.SSH.value) not in self.TRANSPORTS]
+        if unsupported:
+            messagebox.showerror("Error", f"These profiles use a transport that cannot be used here: "
+                                          f"{', '.join(unsupported)}")
+            return
+        
+        self.queries_manager.add_query(query)
+        self._update_recent_queries_dropdown()
+        
+        executor = FleetExecutor(
+            max_workers=self.config_manager.get_setting("fleet_max_workers"),
+            host_timeout=self.config_manager.get_setting("fleet_host_timeout"),
+            default_qna_paths={os_type.value: self._get_qna_path_for_os(os_type.value)
+                               for os_type in OSType},
+            pool=self.ssh_pool,
+            cache=self.result_cache,
+            bypass_cache=self.bypass_cache_var.get(),
+            tracker=self.latency_tracker,
+            prober=self.host_prober if self.config_manager.get_setting("host_probe_on_connect") else None
+        )
+        
+        cancel_token = self._new_cancel_token()
+        
+        def fleet_thread():
+            # Passwords are decrypted here, off the main loop
+            try:
+                decrypted = [self._decrypt_profile(profile) for profile in profiles]
+            except Exception as e:
+                self.cancel_tokens.discard(cancel_token)
+                self._log_message(f"Failed to decrypt profile passwords: {str(e)}")
+                return
+            
+            self._log_message(f"Executing query on {len(profiles)} hosts...")
+            self._log_message("=" * 50)
+            
+            # Hosts with identical answers are grouped; each host's output is not kept
+            grouper = AnswerGrouper()
+            last_progress = time.monotonic()
+            try:
+                for result in executor.execute(decrypted, query, cancel_token=cancel_token):
+                    self.result_rows.append(result)
+                    # Cached results took no time and would lower the average
+                    self.queries_manager.record_result(query, result.host, result.duration or None)
+                    group = grouper.add(result)
+                    if time.monotonic() - last_progress >= 1.0:
+                        last_progress = time.monotonic()
+                        self._log_message(
+                            f"... {grouper.host_count}/{len(profiles)} hosts, {len(grouper)} answer groups; "
+                            f"latest: {len(group.hosts)} hosts: {grouper.describe(group, 60)}")
+            finally:
+                self.cancel_tokens.discard(cancel_token)
+            
+            if cancel_token.cancelled:
+                self._log_message(f"✗ Stopped after {grouper.host_count} of {len(profiles)} hosts")
+            self._log_message(grouper.summary(max_hosts=20))
+            self._log_message("=" * 50)
+        
+        threading.Thread(target=fleet_thread, daemon=True).start()
+    
+    def _new_cancel_token(self) -> CancelToken:
+        """Token for a run that "Stop" can cancel; the run discards it when done"""
+        cancel_token = CancelToken()
+        self.cancel_tokens.add(cancel_token)
+        return cancel_token
+    
+    def stop_queries(self):
+        """Cancel every running query, batch and fleet run, killing their remote QnA processes"""
+        cancel_tokens = list(self.cancel_tokens)
+        if not cancel_tokens:
+            self._log_message("No running queries to stop")
+            return
+        
+        self._log_message(f"Stopping {len(cancel_tokens)} running queries...")
+        for cancel_token in cancel_tokens:
+            cancel_token.cancel()
+    
+    def poll_query(self):
+        """Re-run the query on the connected host on a schedule, logging only changes"""
+        if not self.ssh_manager.connected:
+            messagebox.showerror("Error", "Please connect to a remote machine first")
+            return
+        
+        query = self.query_text.get("1.0", tk.END).strip()
+        if not query:
+            messagebox.showerror("Error", "Please enter a relevance query")
+            return
+        if not self._confirm_syntax([query]):
+            return
+        
+        interval = simpledialog.askinteger(
+            "Poll Query", "Seconds between polls:",
+            initialvalue=self.config_manager.get_setting("poll_interval"), minvalue=1
+        )
+        if not interval:
+            return
+        
+        self.queries_manager.add_query(query)
+        self._update_recent_queries_dropdown()
+        
+        profile = replace(self.ssh_manager.profile,
+                          qna_path=self.qna_path_var.get().strip(), os=self.os_var.get())
+        # Every poll must reach the host, so results never come from the cache
+        executor = FleetExecutor(
+            max_workers=1,
+            host_timeout=self.config_manager.get_setting("fleet_host_timeout"),
+            pool=self.ssh_pool,
+            tracker=self.latency_tracker
+        )
+        poller = QueryPoller(
+            [profile], [query], self._log_delta,
+            interval=interval,
+            jitter=self.config_manager.get_setting("poll_jitter_percent") / 100.0,
+            max_backoff=self.config_manager.get_setting("poll_max_backoff"),
+            executor=executor
+        )
+        self.pollers.append(poller)
+        poller.start()
+        self._log_message(f"Polling {profile.host} every {interval}s ({len(self.pollers)} active): {query}")
+    
+    def stop_polls(self):
+        """Stop every running poll"""
+        for poller in self.pollers:
+            poller.stop()
+        if self.pollers:
+            self._log_message(f"Stopped {len(self.pollers)} polls")
+        self.pollers = []
+    
+    def _log_delta(self, delta: AnswerDelta):
+        """Log what changed in a polled query's answers (called from the poller thread)"""
+        stamp = time.strftime("%H:%M:%S", time.localtime(delta.timestamp))
+        lines = [f"[{stamp}] {delta.host}: {delta.query}"]
+        lines.extend(f"  + {answer}" for answer in delta.added)
+        lines.extend(f"  - {answer}" for answer in delta.removed)
+        if delta.error:
+            lines.append(f"  ✗ {delta.error}")
+        elif not delta.added and not delta.removed:
+            lines.append("  (no answers)" if delta.first else "  ✓ answering again")
+        self._log_message("\n".join(lines))
+    
+    def _decrypt_profile(self, profile: ConnectionProfile) -> ConnectionProfile:
+        """Return a copy of a saved profile with its password decrypted"""
+        if not profile.password:
+            return profile
+        return replace(profile, password=self.security_manager.decrypt_profile_password(
+            profile.password, f"{profile.username}@{profile.host}"))
+    
+    def show_timing_stats(self):
+        """Show rolling p50/p95/p99 timings per phase, host and query"""
+        stats_window = tk.Toplevel(self.root)
+        stats_window.title("Timing Stats")
+        stats_window.geometry("900x400")
+        stats_window.transient(self.root)
+        
+        frame = ttk.Frame(stats_window, padding="10")
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.columnconfigure(0, weight=1)
+        frame.rowconfigure(0, weight=1)
+        
+        columns = ("scope", "key", "phase", "count", "p50", "p95", "p99")
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        for column in columns:
+            tree.heading(column, text=column.upper() if column.startswith("p") else column.title())
+            tree.column(column, width=300 if column == "key" else 80, anchor=tk.W)
+        tree.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        tree.configure(yscrollcommand=scrollbar.set)
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for row in self.latency_tracker.summary():
+                tree.insert("", tk.END, values=(
+                    row['scope'], row['key'], row['phase'], row['count'],
+                    f"{row['p50'] * 1000:.1f} ms", f"{row['p95'] * 1000:.1f} ms",
+                    f"{row['p99'] * 1000:.1f} ms"
+                ))
+        
+        def export():
+            filename = filedialog.asksaveasfilename(
+                parent=stats_window,
+                title="Export Timing Stats",
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv"), ("JSON files", "*.json")]
+            )
+            if not filename:
+                return
+            try:
+                if filename.lower().endswith(".json"):
+                    self.latency_tracker.export_json(filename)
+                else:
+                    self.latency_tracker.export_csv(filename)
+                messagebox.showinfo("Success", "Timing stats exported", parent=stats_window)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to export stats: {str(e)}", parent=stats_window)
+        
+        def reset():
+            self.latency_tracker.reset()
+            refresh()
+        
+        btn_frame = ttk.Frame(frame)
+        btn_frame.grid(row=1, column=0, columnspan=2, pady=(10, 0))
+        ttk.Button(btn_frame, text="Refresh", command=refresh).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Export...", command=export).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Reset", command=reset).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="Close", command=stats_window.destroy).pack(side=tk.LEFT)
+        
+        refresh()
+    
+    def export_results(self):
+        """Write every result shown this session to XLSX, CSV or JSONL, one row per answer"""
+        if not self.result_rows.rows:
+            messagebox.showwarning("Warning", "No results to export")
+            return
+        
+        filename = filedialog.asksaveasfilename(
+            title="Export Results",
+            defaultextension=".xlsx",
+            filetypes=[("Excel workbooks", "*.xlsx"), ("CSV files", "*.csv"),
+                       ("JSON Lines files", "*.jsonl")]
+        )
+        if not filename:
+            return
+        
+        def export_thread():
+            try:
+                rows = self.result_rows.export(filename)
+                self._log_message(f"✓ Exported {rows} result rows to {filename}")
+            except Exception as e:
+                self._log_message(f"✗ Failed to export results: {str(e)}")
+                self.ui_queue.post(messagebox.showerror, "Error", f"Failed to export results: {str(e)}")
+        
+        threading.Thread(target=export_thread, daemon=True).start()
     
     def clear_query(self):
         """Clear query text"""
         self.query_text.delete("1.0", tk.END)
+        self._check_query_syntax()
     
     def load_query(self):
         """Load query from file"""
@@ -605,6 +1414,7 @@ class QnARemoteDebugger:
                     content = f.read()
                     self.query_text.delete("1.0", tk.END)
                     self.query_text.insert("1.0", content)
+                    self._check_query_syntax()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load query: {str(e)}")
     
@@ -634,12 +1444,15 @@ class QnARemoteDebugger:
         if query:
             self.query_text.delete("1.0", tk.END)
             self.query_text.insert("1.0", query)
+            self._check_query_syntax()
     
     def _log_message(self, message: str):
         """Add message to results area"""
-        self.results_text.insert(tk.END, message + "\n")
-        self.results_text.see(tk.END)
-        self.root.update()
+        self._append_text(message + "\n")
+    
+    def _append_text(self, text: str):
+        """Append raw text to results area (safe from any thread)"""
+        self.ui_queue.append_text(self.results_text, text)
     
     def on_closing(self):
         """Handle application closing"""
@@ -653,7 +1466,18 @@ class QnARemoteDebugger:
             pass
         
         # Disconnect SSH if connected
+        for cancel_token in list(self.cancel_tokens):
+            cancel_token.cancel()
+        self.stop_polls()
+        self._close_qna_session()
         if self.ssh_manager.connected:
             self.ssh_manager.disconnect()
+        self.ssh_pool.close_all()
+        self.security_manager.wipe()
+        self.result_cache.save()
+        self.ui_queue.stop()
+        self.results_text.store.close()
+        self.result_rows.close()
+        self.queries_manager.close()
         
         self.root.destroy()
\ No newline at end of file
@@ -0,0 +1,115 @@
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+
+
+class QnASession:
+    """Keeps one QnA process running on the remote machine and feeds it queries one at a time"""
+    
+    def __init__(self, ssh_manager, qna_path: str, os_type: str):
+        self.ssh_manager = ssh_manager
+        self.qna_path = qna_path
+        self.os_type = os_type
+        self.channel = None
+        self._tag = ""
+        self._buffer = ""
+        self._lock = threading.Lock()
+        self._newline = "\r\n" if os_type == OSType.WINDOWS.value else "\n"
+    
+    @property
+    def alive(self) -> bool:
+        """Whether the QnA process is still running"""
+        return (self.channel is not None
+                and not self.channel.closed
+                and not self.channel.exit_status_ready())
+    
+    def matches(self, qna_path: str, os_type: str) -> bool:
+        """Whether this session was started for the given QnA path and OS"""
+        return self.qna_path == qna_path and self.os_type == os_type
+    
+    def start(self):
+        """Start the remote QnA process"""
+        self.close()
+        self._tag = CancelToken().tag
+        self.channel = self.ssh_manager.open_process(
+            QnACommandBuilder.tag_command(f'"{self.qna_path}"', self._tag, self.os_type))
+        self._buffer = ""
+    
+    def query(self, query: str, timeout: int = 60,
+              cancel_token: Optional[CancelToken] = None) -> Dict[str, Any]:
+        """Evaluate one relevance expression in the running QnA process.
+        
+        Cancelling cancel_token ends the session (killing the remote QnA) and raises QueryCancelled.
+        """
+        with self._lock:
+            if not self.alive:
+                self.start()
+            
+            # A string-literal query after the real one marks the end of its answers
+            marker = f"__qna_session_{uuid.uuid4().hex}__"
+            lines = " ".join(query.splitlines())
+            sentinel = QnACommandBuilder.sentinel_query(marker)
+            self.channel.sendall(f'{lines}{self._newline}{sentinel}{self._newline}'.encode())
+            
+            channel = self.channel
+            if cancel_token is not None:
+                cancel_token.add_callback(channel.close)
+            try:
+                block, error = self._read_until(f"A: {marker}", timeout, cancel_token)
+            finally:
+                if cancel_token is not None:
+                    cancel_token.remove_callback(channel.close)
+            return QnAOutputParser.to_result(QnAOutputParser.parse_block(block), error)
+    
+    def close(self):
+        """Stop the remote QnA process"""
+        if self.channel is not None:
+            try:
+                self.channel.shutdown_write()
+            except Exception:
+                pass
+            self.channel.close()
+            self.channel = None
+        self._buffer = ""
+    
+    def _read_until(self, marker: str, timeout: int, cancel_token: Optional[CancelToken] = None):
+        """Read stdout until the marker line, returning the text before it and any stderr"""
+        deadline = time.monotonic() + timeout
+        errors: List[str] = []
+        self.channel.settimeout(0.1)
+        
+        while marker not in self._buffer:
+            if cancel_token is not None and cancel_token.cancelled:
+                self.close()
+                self.ssh_manager.kill_remote(
+                    QnACommandBuilder.build_kill_command(self._tag, self.qna_path, self.os_type))
+                cancel_token.raise_if_cancelled()
+            
+            if time.monotonic() > deadline:
+                self.close()
+                raise RuntimeError(f"Command execution failed: QnA did not answer within {timeout}s")
+            
+            if self.channel.recv_stderr_ready():
+                errors.append(self.channel.recv_stderr(32768).decode(errors="replace"))
+            
+            try:
+                data = self.channel.recv(32768)
+            except Exception:
+                # socket.timeout: nothing yet, keep polling
+                continue
+            
+            if not data:
+                if cancel_token is not None and cancel_token.cancelled:
+                    continue
+                self.close()
+                raise RuntimeError("Command execution failed: QnA session ended unexpectedly")
+            self._buffer += data.decode(errors="replace")
+        
+        block, _, rest = self._buffer.partition(marker)
+        self._buffer = rest.split("\n", 1)[1] if "\n" in rest else ""
+        return block, "".join(errors)
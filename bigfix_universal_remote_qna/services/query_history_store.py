@@ -0,0 +1,206 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional
+from bigfix_universal_remote_qna.models.query_history_entry import QueryHistoryEntry
+
+
+# Words as FTS5's unicode61 tokenizer splits them: runs of letters and digits
+_WORD = re.compile(r"[^\W_]+")
+
+class QueryHistoryStore:
+    """Every executed query in SQLite with run statistics, full-text search and frecency ranking.
+    
+    Each run adds a weight of 2 ** (time / half_life) to a query's score, kept as a base-2
+    logarithm. Older runs count half as much per half-life, yet the ordering of stored scores
+    never changes with time, so ranking is a plain index scan.
+    
+    As-you-type words like "of" match most of the history, and ranking every match would be
+    slow. Searches with at least DENSE matches therefore filter the top WINDOW queries, kept in
+    memory until the next write; rarer words, and windows with too few matches, rank the
+    full-text matches instead.
+    """
+    
+    WINDOW = 2000
+    DENSE = 1000
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS queries (
+            id INTEGER PRIMARY KEY,
+            query TEXT NOT NULL UNIQUE,
+            run_count INTEGER NOT NULL DEFAULT 0,
+            last_run REAL NOT NULL DEFAULT 0,
+            total_duration REAL NOT NULL DEFAULT 0,
+            timed_runs INTEGER NOT NULL DEFAULT 0,
+            host_count INTEGER NOT NULL DEFAULT 0,
+            score REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_queries_score ON queries(score);
+        CREATE TABLE IF NOT EXISTS query_hosts (
+            query_id INTEGER NOT NULL REFERENCES queries(id) ON DELETE CASCADE,
+            host TEXT NOT NULL,
+            PRIMARY KEY (query_id, host)
+        ) WITHOUT ROWID;
+        CREATE VIRTUAL TABLE IF NOT EXISTS queries_fts USING fts5(
+            query, content='queries', content_rowid='id', prefix='1 2 3',
+            tokenize='unicode61 remove_diacritics 0'
+        );
+        CREATE TRIGGER IF NOT EXISTS queries_fts_insert AFTER INSERT ON queries BEGIN
+            INSERT INTO queries_fts (rowid, query) VALUES (new.id, new.query);
+        END;
+        CREATE TRIGGER IF NOT EXISTS queries_fts_delete AFTER DELETE ON queries BEGIN
+            INSERT INTO queries_fts (queries_fts, rowid, query) VALUES ('delete', old.id, old.query);
+        END;
+    """
+    
+    _ENTRY = ("SELECT q.query, q.run_count, q.last_run, "
+              "CASE WHEN q.timed_runs THEN q.total_duration / q.timed_runs END, q.host_count FROM queries q")
+    
+    def __init__(self, db_file: str = ":memory:", half_life_days: float = 7.0):
+        self.db_file = db_file
+        self.half_life = max(half_life_days, 0.01) * 86400.0
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(self._SCHEMA)
+        # Top WINDOW queries in rank order; reset whenever a run changes the ranking
+        self._window: Optional[List[str]] = None
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def count(self) -> int:
+        """Number of distinct queries stored"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0]
+    
+    def add_run(self, query: str, when: Optional[float] = None):
+        """Count one run of a query"""
+        self.add_runs([query], when)
+    
+    def add_runs(self, queries: Iterable[str], when: Optional[float] = None):
+        """Count one run of each query in one transaction"""
+        when = time.time() if when is None else when
+        weight = when / self.half_life
+        with self._lock, self._conn:
+            self._window = None
+            for query in queries:
+                if not query.strip():
+                    continue
+                row = self._conn.execute("SELECT score FROM queries WHERE query = ?", (query,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO queries (query, run_count, last_run, score) VALUES (?, 1, ?, ?)",
+                        (query, when, weight))
+                else:
+                    self._conn.execute(
+                        "UPDATE queries SET run_count = run_count + 1, last_run = MAX(last_run, ?), "
+                        "score = ? WHERE query = ?", (when, self._add_scores(row[0], weight), query))
+    
+    def add_result(self, query: str, host: str = "", duration: Optional[float] = None):
+        """Record a host that answered a counted run and how long it took"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT id FROM queries WHERE query = ?", (query,)).fetchone()
+            if row is None:
+                return
+            if host and self._conn.execute(
+                    "INSERT OR IGNORE INTO query_hosts (query_id, host) VALUES (?, ?)", (row[0], host)).rowcount:
+                self._conn.execute("UPDATE queries SET host_count = host_count + 1 WHERE id = ?", (row[0],))
+            if duration is not None:
+                self._conn.execute(
+                    "UPDATE queries SET total_duration = total_duration + ?, timed_runs = timed_runs + 1 "
+                    "WHERE id = ?", (duration, row[0]))
+    
+    def get(self, query: str) -> Optional[QueryHistoryEntry]:
+        with self._lock:
+            row = self._conn.execute(f"{self._ENTRY} WHERE q.query = ?", (query,)).fetchone()
+        return QueryHistoryEntry(*row) if row else None
+    
+    def hosts(self, query: str) -> List[str]:
+        """Hosts a query has been answered by"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT h.host FROM query_hosts h JOIN queries q ON q.id = h.query_id "
+                "WHERE q.query = ? ORDER BY h.host", (query,))]
+    
+    def top(self, limit: int = 10) -> List[QueryHistoryEntry]:
+        """Highest ranked queries"""
+        with self._lock:
+            rows = self._conn.execute(f"{self._ENTRY} ORDER BY q.score DESC LIMIT ?", (limit,)).fetchall()
+        return [QueryHistoryEntry(*row) for row in rows]
+    
+    def search(self, text: str, limit: int = 10) -> List[QueryHistoryEntry]:
+        """Highest ranked queries containing every word of text; the last word may be a prefix"""
+        match = self.match_expression(text)
+        if not match:
+            return self.top(limit)
+        
+        with self._lock:
+            dense = self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT rowid FROM queries_fts WHERE queries_fts MATCH ? LIMIT ?)",
+                (match, self.DENSE)).fetchone()[0] >= self.DENSE
+            if dense and self._window is None:
+                self._window = [row[0] for row in self._conn.execute(
+                    "SELECT query FROM queries ORDER BY score DESC LIMIT ?", (self.WINDOW,))]
+            window = self._window if dense else []
+        
+        matches = self._matcher(text)
+        found = []
+        for query in window:
+            if matches(query):
+                found.append(query)
+                if len(found) == limit:
+                    return self._entries(found)
+        
+        with self._lock:
+            rows = self._conn.execute(
+                f"{self._ENTRY} WHERE q.id IN (SELECT rowid FROM queries_fts WHERE queries_fts MATCH ?) "
+                "ORDER BY q.score DESC LIMIT ?", (match, limit)).fetchall()
+        return [QueryHistoryEntry(*row) for row in rows]
+    
+    def delete(self, query: str) -> bool:
+        """Forget a query; False if it was not stored"""
+        with self._lock, self._conn:
+            self._window = None
+            return self._conn.execute("DELETE FROM queries WHERE query = ?", (query,)).rowcount > 0
+    
+    def _entries(self, queries: List[str]) -> List[QueryHistoryEntry]:
+        """Entries for the given queries, in the same order"""
+        with self._lock:
+            rows = self._conn.execute(f"{self._ENTRY} WHERE q.query IN ({','.join('?' * len(queries))})",
+                                      queries).fetchall()
+        by_query = {row[0]: QueryHistoryEntry(*row) for row in rows}
+        return [by_query[query] for query in queries if query in by_query]
+    
+    @staticmethod
+    def match_expression(text: str) -> str:
+        """FTS5 MATCH expression for as-you-type text, or '' if it has no words"""
+        words = _WORD.findall(text)
+        if not words:
+            return ""
+        terms = [f'"{word}"' for word in words]
+        # A word still being typed matches as a prefix
+        if text[-1:].isalnum():
+            terms[-1] += "*"
+        return " ".join(terms)
+    
+    @staticmethod
+    def _matcher(text: str):
+        """Predicate equivalent to match_expression(text) for one query string"""
+        words = [re.escape(word) for word in _WORD.findall(text)]
+        prefix = words.pop() if text[-1:].isalnum() else None
+        patterns = [rf"(?=.*(?<![^\W_]){word}(?![^\W_]))" for word in words]
+        if prefix is not None:
+            patterns.append(rf"(?=.*(?<![^\W_]){prefix})")
+        return re.compile("".join(patterns), re.IGNORECASE | re.DOTALL).match
+    
+    @staticmethod
+    def _add_scores(a: float, b: float) -> float:
+        """log2(2 ** a + 2 ** b) without overflowing"""
+        high, low = max(a, b), min(a, b)
+        return high + math.log2(1.0 + 2.0 ** (low - high))
@@ -0,0 +1,170 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from bigfix_universal_remote_qna.models.answer_delta import AnswerDelta
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+
+
+class QueryPoller:
+    """Re-runs queries on a schedule and reports only how each host's answers changed.
+    
+    The last answers per (profile, query) are kept; on_delta receives the additions and
+    removals, or the error once a host starts failing. A delta with nothing added or removed
+    and no error means the host recovered with the answers it had. Each host is polled every
+    interval (plus or minus jitter) while it answers and backs off exponentially, up to
+    max_backoff, while it fails. Hosts are polled independently, up to the executor's
+    max_workers at a time, so a slow host does not hold back the others' schedule.
+    The executor should not serve results from a cache.
+    """
+    
+    MAX_BACKOFF_STEPS = 16
+    
+    def __init__(self, profiles: Iterable[ConnectionProfile], queries: List[str],
+                 on_delta: Callable[[AnswerDelta], None], interval: float = 10.0,
+                 jitter: float = 0.1, max_backoff: float = 300.0,
+                 executor: Optional[FleetExecutor] = None):
+        self.profiles: Dict[str, ConnectionProfile] = {profile.name: profile for profile in profiles}
+        self.queries = [query for query in queries if query.strip()]
+        self.on_delta = on_delta
+        self.interval = max(0.1, interval)
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self.max_backoff = max(self.interval, max_backoff)
+        self.executor = executor or FleetExecutor(max_workers=max(1, len(self.profiles)))
+        self.polls = 0
+        
+        self._state: Dict[Tuple[str, str], Tuple[FrozenSet[str], str]] = {}
+        self._failures: Dict[str, int] = {}
+        self._due: Dict[str, float] = {}
+        self._random = random.Random()
+        self._lock = threading.Lock()
+        self._emit_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self):
+        """Start polling in the background; the first poll of every host is immediate"""
+        if self.running:
+            return
+        self._stop.clear()
+        now = time.monotonic()
+        self._due = {name: now for name in self.profiles}
+        self._thread = threading.Thread(target=self._run, name="poller", daemon=True)
+        self._thread.start()
+    
+    def stop(self, wait: bool = False):
+        """Stop after the polls in progress; the last answers are kept for a restart"""
+        self._stop.set()
+        self._wake.set()
+        if wait and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+    
+    def poll_once(self, profiles: Optional[Iterable[ConnectionProfile]] = None) -> List[AnswerDelta]:
+        """Poll the given profiles (default: all) now and return their deltas"""
+        deltas = []
+        self._poll(list(self.profiles.values()) if profiles is None else list(profiles), deltas.append)
+        return deltas
+    
+    def _run(self):
+        """Start each host's poll when it is due; polls of other hosts run meanwhile"""
+        workers = ThreadPoolExecutor(max_workers=max(1, min(len(self.profiles), self.executor.max_workers)),
+                                     thread_name_prefix="poll")
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                now = time.monotonic()
+                with self._lock:
+                    due = [name for name, at in self._due.items() if at <= now]
+                    for name in due:
+                        # In progress: scheduled again once its poll finishes
+                        self._due[name] = math.inf
+                    next_due = min(self._due.values(), default=math.inf)
+                
+                for name in due:
+                    workers.submit(self._poll_host, self.profiles[name])
+                self._wake.wait(min(max(0.0, next_due - now), self.interval))
+        finally:
+            workers.shutdown(wait=True, cancel_futures=True)
+    
+    def _poll_host(self, profile: ConnectionProfile):
+        """One scheduled poll of a host"""
+        if self._stop.is_set():
+            return
+        try:
+            self._poll([profile], self.on_delta)
+        except Exception as e:
+            print(f"✗ Poll of {profile.name} failed: {str(e)}")
+            self._schedule(profile.name, True, time.monotonic())
+    
+    def _poll(self, profiles: List[ConnectionProfile], emit: Callable[[AnswerDelta], None]):
+        """Query profiles, emit what changed and schedule each host's next poll"""
+        failed_hosts = set()
+        for result in self.executor.execute_many(profiles, self.queries):
+            if self._failed(result):
+                failed_hosts.add(result.profile_name)
+            with self._emit_lock:
+                delta = self._compare(result)
+                if delta is not None:
+                    emit(delta)
+        
+        now = time.monotonic()
+        for profile in profiles:
+            self._schedule(profile.name, profile.name in failed_hosts, now)
+        with self._lock:
+            self.polls += 1
+    
+    def _compare(self, result: HostResult) -> Optional[AnswerDelta]:
+        """Delta against the last answers for the result's (profile, query), None if unchanged"""
+        key = (result.profile_name, result.query)
+        previous = self._state.get(key)
+        old_answers = previous[0] if previous is not None else frozenset()
+        
+        if self._failed(result):
+            # Nothing is known about the answers while the host fails
+            ordered: List[str] = []
+            answers = old_answers
+            error = result.error.strip() or f"Exit code {result.exit_code}"
+        else:
+            ordered = result.answer_set.answers
+            answers = frozenset(ordered)
+            error = "; ".join(result.answer_set.errors)
+        
+        if previous is not None and previous[0] == answers:
+            if previous[1] == error:
+                return None
+            # Keep the stored set rather than an equal copy
+            answers = previous[0]
+        self._state[key] = (answers, error)
+        
+        return AnswerDelta(
+            profile_name=result.profile_name,
+            host=result.host,
+            query=result.query,
+            added=[answer for answer in dict.fromkeys(ordered) if answer not in old_answers],
+            removed=sorted(old_answers - answers),
+            error=error,
+            first=previous is None,
+            timestamp=time.time()
+        )
+    
+    def _schedule(self, name: str, failed: bool, now: float):
+        """Next poll time: the interval while answering, doubling per consecutive failure"""
+        with self._lock:
+            failures = self._failures[name] = self._failures.get(name, 0) + 1 if failed else 0
+            delay = min(self.max_backoff, self.interval * 2 ** min(failures, self.MAX_BACKOFF_STEPS))
+            self._due[name] = now + delay * (1.0 + self._random.uniform(-self.jitter, self.jitter))
+        self._wake.set()
+    
+    @staticmethod
+    def _failed(result: HostResult) -> bool:
+        """Whether the host gave no answer at all (QnA's own E: errors are answers)"""
+        return not result.success and not (result.answer_set and result.answer_set.errors)
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+CacheKey = Tuple[str, str, str]
+
+
+class QueryResultCache:
+    """Size-bounded LRU cache of query results with optional persistence.
+    
+    Every query shares default_ttl (the query_cache_ttl setting); 0 disables caching.
+    """
+    
+    def __init__(self, max_entries: int = 500, default_ttl: int = 300,
+                 cache_file: Optional[str] = None, max_result_chars: int = 1024 * 1024):
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.cache_file = cache_file
+        self.max_result_chars = max_result_chars
+        
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        if cache_file:
+            self.load()
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Collapse whitespace outside string literals so formatting changes still hit"""
+        parts = query.strip().split('"')
+        # Even-numbered parts are outside quotes
+        for i in range(0, len(parts), 2):
+            parts[i] = " ".join(parts[i].split())
+        return '"'.join(parts)
+    
+    def key_for(self, host: str, qna_path: str, query: str) -> CacheKey:
+        """Cache key for a query on a host"""
+        return (host, qna_path, self.normalize_query(query))
+    
+    def get(self, host: str, qna_path: str, query: str) -> Optional[Dict[str, Any]]:
+        """Return a cached result (with its age in seconds) or None"""
+        key = self.key_for(host, qna_path, query)
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['expires_at'] <= now:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = dict(entry['result'])
+            result['cache_age'] = now - entry['stored_at']
+            return result
+    
+    def put(self, host: str, qna_path: str, query: str, result: Dict[str, Any]) -> bool:
+        """Cache a successful result; returns False if it was not cacheable"""
+        if self.default_ttl <= 0 or not result.get('success'):
+            return False
+        if len(result.get('output', '')) + len(result.get('error', '')) > self.max_result_chars:
+            return False
+        
+        key = self.key_for(host, qna_path, query)
+        with self._lock:
+            now = time.time()
+            self._entries[key] = {
+                'result': {name: result[name] for name in ('output', 'error', 'exit_code', 'success')
+                           if name in result},
+                'stored_at': now,
+                'expires_at': now + self.default_ttl,
+            }
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return True
+    
+    def invalidate(self, host: Optional[str] = None):
+        """Drop cached results for one host, or everything when host is None"""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == host]:
+                del self._entries[key]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for tuning TTLs"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+    
+    def load(self):
+        """Load unexpired entries from the cache file"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"✗ Could not load query cache: {e}")
+            return
+        
+        now = time.time()
+        with self._lock:
+            for item in data.get('entries', []):
+                if item['expires_at'] > now:
+                    self._entries[tuple(item['key'])] = {
+                        'result': item['result'],
+                        'stored_at': item['stored_at'],
+                        'expires_at': item['expires_at'],
+                    }
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def save(self):
+        """Write unexpired entries to the cache file, oldest first to keep LRU order"""
+        if not self.cache_file:
+            return
+        
+        now = time.time()
+        with self._lock:
+            data = {
+                'entries': [dict(entry, key=list(key)) for key, entry in self._entries.items()
+                            if entry['expires_at'] > now],
+            }
+        
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+        except OSError as e:
+            print(f"✗ Could not save query cache: {e}")
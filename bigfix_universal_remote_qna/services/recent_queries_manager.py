@@ -1,45 +1,54 @@
-from typing import List
+from typing import Iterable, List, Optional
 import json
+import time
+from bigfix_universal_remote_qna.services.query_history_store import QueryHistoryStore
 
 
 class RecentQueriesManager:
-    """Manages recent queries using ConfigManager"""
+    """Query history for the recent queries box, kept in a QueryHistoryStore"""
     
-    def __init__(self, config_manager, max_queries: int = 10):
+    def __init__(self, config_manager, db_file: Optional[str] = None, max_queries: int = 10):
         self.config_manager = config_manager
         self.max_queries = max_queries
+        self.store = QueryHistoryStore(
+            db_file or ":memory:",
+            half_life_days=config_manager.get_setting("query_history_half_life_days")
+        )
+        if self.store.count() == 0:
+            self._import_config_queries()
     
     def get_recent_queries(self) -> List[str]:
-        """Get list of recent queries"""
+        """Highest ranked queries"""
+        return [entry.query for entry in self.store.top(self.max_queries)]
+    
+    def search(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Highest ranked queries matching text typed so far"""
+        return [entry.query for entry in self.store.search(text, limit or self.max_queries)]
+    
+    def add_query(self, query: str):
+        """Count a run of a query"""
+        self.store.add_run(query)
+    
+    def add_queries(self, queries: Iterable[str]):
+        """Count a run of each query"""
+        self.store.add_runs(queries)
+    
+    def record_result(self, query: str, host: str = "", duration: Optional[float] = None):
+        """Record the host that answered a query and how long it took"""
+        self.store.add_result(query, host, duration)
+    
+    def close(self):
+        self.store.close()
+    
+    def _import_config_queries(self):
+        """Carry over the recent queries kept in the configuration before the history store"""
         try:
             queries_json = self.config_manager.get_setting("recent_queries")
-            return json.loads(queries_json) if queries_json else []
+            queries = json.loads(queries_json) if queries_json else []
         except (json.JSONDecodeError, TypeError):
-            return []
-    
-    def add_query(self, query: str):
-        """Add a query to recent queries"""
-        if not query.strip():
             return
-        
-        queries = self.get_recent_queries()
-        
-        # Remove if already exists
-        if query in queries:
-            queries.remove(query)
-        
-        # Add to beginning
-        queries.insert(0, query)
-        
-        # Keep only max_queries
-        queries = queries[:self.max_queries]
-        
-        # Save back to config
-        queries_json = json.dumps(queries)
-        try:
-            self.config_manager.define_setting(
-                "recent_queries", False, queries_json, str,
-                "JSON array of recent queries (max 10)"
-            )
-        except:
-            pass
\ No newline at end of file
+        # A second apart, newest latest, so they keep their order
+        now = time.time()
+        for age, query in enumerate(queries):
+            if isinstance(query, str):
+                self.store.add_run(query, now - age)
@@ -0,0 +1,278 @@
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from bigfix_universal_remote_qna.models.relevance_issue import RelevanceIssue
+
+
+_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>"[^"]*("|$))
+  | (?P<number>\d+(\.\d+)?)
+  | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<symbol><=|>=|!=|[()&,;=<>+\-*/|])
+""", re.VERBOSE)
+
+# Operators from other languages, with what relevance uses instead
+_FOREIGN_OPERATORS = {
+    "==": "=", "&&": "and", "||": "or", "<>": "!=", "=>": ">=", "=<": "<=", "!": "not", "'": '"',
+}
+
+_ARTICLES = frozenset(("a", "an", "the"))
+# 'there' only introduces 'there exists'
+_THERE_EXISTS = re.compile(r"\s+exists?\b", re.IGNORECASE)
+_PREFIX_WORDS = frozenset(("not", "exists", "exist", "if"))
+_BINARY_WORDS = frozenset(("and", "or", "mod", "contains", "equals", "of", "as"))
+_RESERVED = _PREFIX_WORDS | _BINARY_WORDS | frozenset(("whose", "then", "else", "is", "does"))
+
+# Unit kinds of the token stream the structural pass walks
+_OPERAND, _OPEN, _CLOSE, _BINARY, _PREFIX, _WHOSE, _THEN, _ELSE = range(8)
+
+_Unit = Tuple[int, str, int, int]  # kind, text, position, length
+
+
+class RelevanceChecker:
+    """Local syntax check of relevance expressions, so typos are caught before QnA runs.
+    
+    Catches unterminated strings, unbalanced parentheses, operators relevance does not have,
+    operators missing an operand, malformed of/whose/it/if chains and empty parentheses.
+    Property names are not known locally, so anything else is left to QnA.
+    """
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def check(query: str) -> Optional[RelevanceIssue]:
+        """The first problem found in query, or None if it looks well formed"""
+        units = []
+        issue = RelevanceChecker._tokenize(query, units)
+        if issue is None:
+            issue = RelevanceChecker._check_structure(units, len(query))
+        return issue
+    
+    @staticmethod
+    def _tokenize(query: str, units: List[_Unit]) -> Optional[RelevanceIssue]:
+        """Split query into units, or return the first lexical problem"""
+        position = 0
+        while position < len(query):
+            for operator, replacement in _FOREIGN_OPERATORS.items():
+                if query.startswith(operator, position) and not query.startswith("!=", position):
+                    return RelevanceIssue(position, len(operator),
+                                          f"'{operator}' is not a relevance operator (use '{replacement}')")
+            match = _TOKEN.match(query, position)
+            if match is None:
+                return RelevanceIssue(position, 1, f"Unexpected character '{query[position]}'")
+            
+            kind, text = match.lastgroup, match.group()
+            length = len(text)
+            if kind == "string":
+                if len(text) == 1 or not text.endswith('"'):
+                    return RelevanceIssue(position, length, "Unterminated string")
+                units.append((_OPERAND, text, position, length))
+            elif kind == "number":
+                units.append((_OPERAND, text, position, length))
+            elif kind == "symbol":
+                if text == "(":
+                    units.append((_OPEN, text, position, length))
+                elif text == ")":
+                    units.append((_CLOSE, text, position, length))
+                elif text == "-" and (not units or units[-1][0] not in (_OPERAND, _CLOSE)):
+                    units.append((_PREFIX, text, position, length))
+                else:
+                    units.append((_BINARY, text, position, length))
+            elif kind == "word":
+                RelevanceChecker._add_word(query, match, units)
+            position = match.end()
+        return None
+    
+    @staticmethod
+    def _add_word(query: str, match: re.Match, units: List[_Unit]):
+        """Add a word, joining multi-word comparisons such as 'is not greater than' into one unit"""
+        word = match.group().lower()
+        position = match.start()
+        if word in _ARTICLES or (word == "there" and _THERE_EXISTS.match(query, match.end())):
+            return
+        if word == "whose":
+            units.append((_WHOSE, word, position, len(word)))
+        elif word == "then":
+            units.append((_THEN, word, position, len(word)))
+        elif word == "else":
+            units.append((_ELSE, word, position, len(word)))
+        elif word in _PREFIX_WORDS:
+            units.append((_PREFIX, word, position, len(word)))
+        elif word in _BINARY_WORDS:
+            units.append((_BINARY, word, position, len(word)))
+        elif word in ("is", "does", "starts", "ends"):
+            units.append((_BINARY, word, position, len(word)))
+        else:
+            units.append((_OPERAND, word, position, len(word)))
+    
+    @staticmethod
+    def _check_structure(units: List[_Unit], end: int) -> Optional[RelevanceIssue]:
+        """Check operands, parentheses and keyword chains of the unit stream"""
+        units = RelevanceChecker._join_comparisons(units)
+        if isinstance(units, RelevanceIssue):
+            return units
+        if not units:
+            return RelevanceIssue(0, 0, "Empty expression")
+        
+        # Per open parenthesis: its unit, its kind ("whose", "applied" or ""), if/then state, number
+        # and, for a whose group, the number of the group it filters ("(it) whose (...) of ...")
+        groups = [[None, "", [], 0, None]]
+        # Each 'it' with the numbers of the groups around it, checked once their kinds are known
+        its = []
+        kinds = {}
+        filtered = {}
+        last_closed = None
+        opened = 0
+        expect_operand = True
+        previous = None
+        
+        for index, unit in enumerate(units):
+            kind, text, position, length = unit
+            following = units[index + 1] if index + 1 < len(units) else None
+            
+            if expect_operand and kind not in (_OPERAND, _OPEN, _PREFIX):
+                if previous is None or previous[0] == _OPEN:
+                    return RelevanceIssue(position, length, f"'{text}' has nothing before it")
+                return RelevanceIssue(position, length,
+                                      f"'{previous[1]}' needs an operand before '{text}'")
+            
+            if kind == _OPERAND:
+                if previous is not None and previous[0] == _CLOSE:
+                    return RelevanceIssue(position, length, f"Missing operator between ')' and '{text}'")
+                if text == "it":
+                    enclosing = [group[3] for group in groups]
+                    if following is not None and following[0] == _WHOSE:
+                        # 'it whose (...) of' filters the 'it' like a parenthesized group
+                        opened += 1
+                        enclosing.append(opened)
+                        last_closed = opened
+                    its.append((position, enclosing))
+                expect_operand = False
+            elif kind == _OPEN:
+                if previous is not None and previous[0] == _CLOSE:
+                    return RelevanceIssue(position, length, "Missing operator between ')' and '('")
+                if following is not None and following[0] == _CLOSE:
+                    return RelevanceIssue(position, following[2] + 1 - position, "Empty parentheses")
+                opened += 1
+                whose = previous is not None and previous[0] == _WHOSE
+                groups.append([unit, "whose" if whose else "", [], opened, filtered_group if whose else None])
+                expect_operand = True
+            elif kind == _CLOSE:
+                if len(groups) == 1:
+                    return RelevanceIssue(position, length, "')' without a matching '('")
+                issue = RelevanceChecker._unfinished_if(groups[-1])
+                if issue is not None:
+                    return issue
+                group = groups.pop()
+                kinds[group[3]] = group[1]
+                if following is not None and following[1] == "of":
+                    if not group[1]:
+                        kinds[group[3]] = group[1] = "applied"
+                    # '(...) whose (...) of' applies the filtered group as well
+                    if group[4] is not None and not kinds.get(group[4]):
+                        kinds[group[4]] = "applied"
+                filtered[group[3]] = group[4]
+                last_closed = group[3]
+                expect_operand = False
+            elif kind == _BINARY:
+                if text == "as":
+                    if following is None or following[0] != _OPERAND or not following[1][0].isalpha():
+                        return RelevanceIssue(position, length, "'as' needs a type name after it")
+                expect_operand = True
+            elif kind == _PREFIX:
+                if not expect_operand:
+                    hint = " (did you mean 'is not'?)" if text == "not" else ""
+                    return RelevanceIssue(position, length, f"'{text}' cannot follow an operand{hint}")
+                if text == "if":
+                    groups[-1][2].append(unit)
+                expect_operand = True
+            elif kind == _WHOSE:
+                if following is None or following[0] != _OPEN:
+                    return RelevanceIssue(position, length, "'whose' must be followed by '('")
+                filtered_group = None
+                if previous[0] == _CLOSE or previous[1] == "it":
+                    # Chained filters all filter the group in front of the first one
+                    filtered_group = filtered.get(last_closed) or last_closed
+                expect_operand = True
+            elif kind in (_THEN, _ELSE):
+                pending = groups[-1][2]
+                wanted = "if" if kind == _THEN else "then"
+                if not pending or pending[-1][1] != wanted:
+                    return RelevanceIssue(position, length, f"'{text}' without a matching '{wanted}'")
+                if kind == _THEN:
+                    pending[-1] = unit
+                else:
+                    pending.pop()
+                expect_operand = True
+            previous = unit
+        
+        if expect_operand:
+            kind, text, position, length = previous
+            return RelevanceIssue(position, length, f"'{text}' needs an operand after it")
+        if len(groups) > 1:
+            _, text, position, length = groups[-1][0]
+            return RelevanceIssue(position, length, "'(' is never closed")
+        issue = RelevanceChecker._unfinished_if(groups[0])
+        if issue is not None:
+            return issue
+        
+        for position, enclosing in its:
+            if not any(kinds.get(group) for group in enclosing):
+                return RelevanceIssue(position, 2, "'it' is only defined inside 'whose (...)' or '(...) of'")
+        return None
+    
+    @staticmethod
+    def _unfinished_if(group) -> Optional[RelevanceIssue]:
+        """Issue for an if/then in the group still missing its then or else"""
+        pending = group[2]
+        if not pending:
+            return None
+        _, text, position, length = pending[-1]
+        missing = "then" if text == "if" else "else"
+        return RelevanceIssue(position, length, f"'{text}' without a matching '{missing}'")
+    
+    @staticmethod
+    def _join_comparisons(units: List[_Unit]):
+        """Join 'is not equal to', 'does not contain', 'starts with' and the like into one unit"""
+        joined = []
+        index = 0
+        while index < len(units):
+            kind, text, position, length = units[index]
+            if text not in ("is", "does", "starts", "ends") or kind != _BINARY:
+                joined.append(units[index])
+                index += 1
+                continue
+            
+            words = [text]
+            index += 1
+            
+            def take(*expected: str) -> bool:
+                nonlocal index
+                if index + len(expected) > len(units):
+                    return False
+                if tuple(unit[1].lower() for unit in units[index:index + len(expected)]) != expected:
+                    return False
+                words.extend(expected)
+                index += len(expected)
+                return True
+            
+            if text == "is":
+                take("not")
+                if take("greater", "than") or take("less", "than"):
+                    take("or", "equal", "to")
+                else:
+                    take("equal", "to") or take("contained", "by")
+            elif text == "does":
+                if not take("not") or not (take("equal") or take("contain") or take("start", "with")
+                                           or take("end", "with")):
+                    return RelevanceIssue(position, units[index - 1][2] + units[index - 1][3] - position,
+                                          "Incomplete comparison: expected 'does not equal', 'does not "
+                                          "contain', 'does not start with' or 'does not end with'")
+            elif not take("with"):
+                # 'starts' and 'ends' are only operators before 'with'
+                joined.append((_OPERAND, text, position, length))
+                continue
+            
+            last = units[index - 1]
+            joined.append((_BINARY, " ".join(words), position, last[2] + last[3] - position))
+        return joined
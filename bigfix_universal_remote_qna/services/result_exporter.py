@@ -0,0 +1,105 @@
+import csv
+import json
+import os
+from typing import Any, Iterable, Optional, Sequence
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.services.xlsx_stream_writer import XlsxStreamWriter
+
+
+class ResultExporter:
+    """Streams one row per (host, query, answer) to an XLSX, CSV or JSONL file.
+    
+    Rows are written as they are given and never collected, so exports of any size run in
+    constant memory. XLSX is written by XlsxStreamWriter, which continues on a new sheet
+    once one reaches Excel's row limit.
+    """
+    
+    COLUMNS = ("profile", "host", "query", "answer_index", "answer", "error",
+               "exit_code", "eval_time_ms", "duration")
+    FORMATS = ("xlsx", "csv", "jsonl")
+    
+    def __init__(self, path: str, file_format: Optional[str] = None):
+        self.path = path
+        self.format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {self.format or path} "
+                             f"(use {', '.join(self.FORMATS)})")
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._workbook = None
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self._open()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @classmethod
+    def export(cls, results: Iterable[HostResult], path: str, file_format: Optional[str] = None) -> int:
+        """Write every result to path and return the number of rows"""
+        with cls(path, file_format) as exporter:
+            exporter.write_results(results)
+            return exporter.rows
+    
+    def write_results(self, results: Iterable[HostResult]):
+        for result in results:
+            self.write_result(result)
+    
+    def write_result(self, result: HostResult):
+        """One row per answer, or a single row without an answer if there were none"""
+        for row in self.result_rows(result):
+            self.write_row(row)
+    
+    @classmethod
+    def result_rows(cls, result: HostResult):
+        """Rows for one result, in COLUMNS order"""
+        prefix = (result.profile_name, result.host, result.query)
+        fields = cls.result_fields(result)
+        answers = result.answer_set.answers if result.answer_set else []
+        if not answers:
+            yield prefix + (None, None) + fields
+            return
+        for index, answer in enumerate(answers, 1):
+            yield prefix + (index, answer) + fields
+    
+    @staticmethod
+    def result_fields(result: HostResult) -> tuple:
+        """The columns after "answer", which are the same for every row of a result"""
+        answer_set = result.answer_set
+        errors = list(answer_set.errors) if answer_set else []
+        if result.error.strip():
+            errors.append(result.error.strip())
+        eval_time_ms = answer_set.eval_time_ms if answer_set else None
+        return ("; ".join(errors), result.exit_code, eval_time_ms, round(result.duration, 4))
+    
+    def write_row(self, row: Sequence[Any]):
+        """Write one row given in COLUMNS order"""
+        if self.format == "xlsx":
+            self._workbook.append(row)
+        elif self.format == "csv":
+            self._writer.writerow(row)
+        else:
+            self._file.write(self._encode(dict(zip(self.COLUMNS, row))) + "\n")
+        self.rows += 1
+    
+    def close(self):
+        """Finish the file"""
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _open(self):
+        if self.format == "xlsx":
+            self._workbook = XlsxStreamWriter(self.path, header=self.COLUMNS)
+            return
+        
+        self._file = open(self.path, 'w', newline='' if self.format == "csv" else None, encoding='utf-8')
+        if self.format == "csv":
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self.COLUMNS)
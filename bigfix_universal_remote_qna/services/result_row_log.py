@@ -0,0 +1,112 @@
+import itertools
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.services.result_exporter import ResultExporter
+
+
+class ResultRowLog:
+    """Export rows of the results shown this session, kept in a temporary JSONL file.
+    
+    Each result is flattened into ResultExporter rows as it arrives and appended to disk, so
+    everything shown can be exported later without holding the results in memory. A streamed
+    result is recorded answer by answer (begin, append_answer, finish); its error, exit code
+    and timings are only known at the end and are joined to its rows on export.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="bigfix_qna_rows_", suffix=".jsonl", dir=directory)
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self._lock = threading.Lock()
+        # Streamed results still running: id -> [profile, host, query] and answers so far
+        self._streams: Dict[int, List] = {}
+        self._next_stream = itertools.count()
+        self._lines = 0
+        self.rows = 0
+    
+    def append(self, result: HostResult):
+        """Record a result's rows (safe from any thread)"""
+        lines = [self._encode(row) for row in ResultExporter.result_rows(result)]
+        with self._lock:
+            self._write(lines, len(lines))
+    
+    def begin(self, profile_name: str, host: str, query: str) -> int:
+        """Start recording a streamed result, returning its id"""
+        with self._lock:
+            stream_id = next(self._next_stream)
+            self._streams[stream_id] = [[profile_name, host, query], 0]
+        return stream_id
+    
+    def append_answer(self, stream_id: int, answer: str):
+        """Record the next answer of a streamed result as it arrives"""
+        with self._lock:
+            stream = self._streams.get(stream_id)
+            if stream is None:
+                # Cleared while the result was streaming
+                return
+            stream[1] += 1
+            self._write([self._encode({"stream": stream_id, "row": stream[0] + [stream[1], answer]})], 1)
+    
+    def finish(self, stream_id: int, result: HostResult):
+        """Complete a streamed result; result gives its error, exit code and timings"""
+        with self._lock:
+            if stream_id not in self._streams:
+                return
+            prefix, answers = self._streams.pop(stream_id)
+            fields = list(ResultExporter.result_fields(result))
+            if answers:
+                self._write([self._encode({"finish": stream_id, "fields": fields})], 0)
+            else:
+                self._write([self._encode(prefix + [None, None] + fields)], 1)
+    
+    def export(self, path: str, file_format: Optional[str] = None) -> int:
+        """Stream the recorded rows to an XLSX, CSV or JSONL file and return how many were written"""
+        with self._lock:
+            self._file.flush()
+            lines = self._lines
+        
+        # Rows appended while exporting are past the count taken above and are left out;
+        # a first pass collects the closing fields of streamed results (one entry per result)
+        fields = {}
+        with open(self.path, encoding="utf-8") as source:
+            for line in itertools.islice(source, lines):
+                if line.startswith('{"finish"'):
+                    record = json.loads(line)
+                    fields[record["finish"]] = record["fields"]
+        
+        with open(self.path, encoding="utf-8") as source, ResultExporter(path, file_format) as exporter:
+            for line in itertools.islice(source, lines):
+                record = json.loads(line)
+                if isinstance(record, list):
+                    exporter.write_row(record)
+                elif "stream" in record:
+                    # A result still running (or stopped) has no closing fields yet
+                    exporter.write_row(record["row"] + fields.get(record["stream"], ["", None, None, None]))
+        return exporter.rows
+    
+    def clear(self):
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            self._streams.clear()
+            self._lines = 0
+            self.rows = 0
+    
+    def close(self):
+        """Close and delete the temporary file"""
+        with self._lock:
+            self._file.close()
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+    
+    def _write(self, lines: List[str], rows: int):
+        """Append lines to the file (lock held)"""
+        self._file.write("\n".join(lines) + "\n")
+        self._lines += len(lines)
+        self.rows += rows
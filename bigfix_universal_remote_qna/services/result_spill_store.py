@@ -0,0 +1,109 @@
+import mmap
+import os
+import re
+import tempfile
+from array import array
+from bisect import bisect_right
+from typing import List, Optional
+
+
+_NEWLINE = re.compile(b"\n")
+
+class ResultSpillStore:
+    """Append-only on-disk store of result text with a line-offset index, read through mmap"""
+    
+    def __init__(self, directory: Optional[str] = None):
+        fd, self.path = tempfile.mkstemp(prefix="bigfix_qna_results_", suffix=".log", dir=directory)
+        self._file = os.fdopen(fd, "w+b")
+        self._size = 0
+        # Byte offset where each line starts; line N spans line_starts[N]..line_starts[N+1]
+        self._line_starts = array("Q", [0])
+        self._map: Optional[mmap.mmap] = None
+        self._map_size = 0
+    
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting a trailing partial line"""
+        if self._size == 0:
+            return 0
+        if self._line_starts[-1] == self._size:
+            return len(self._line_starts) - 1
+        return len(self._line_starts)
+    
+    @property
+    def size(self) -> int:
+        """Bytes stored"""
+        return self._size
+    
+    def append(self, text: str):
+        """Append text to the spill file and index its line breaks"""
+        data = text.encode("utf-8")
+        if not data:
+            return
+        
+        self._file.seek(self._size)
+        self._file.write(data)
+        self._file.flush()
+        
+        base = self._size
+        self._line_starts.extend(base + match.end() for match in _NEWLINE.finditer(data))
+        self._size += len(data)
+    
+    def get_lines(self, start: int, count: int) -> List[str]:
+        """Read up to count lines starting at line index start"""
+        total = self.line_count
+        start = max(0, min(start, total))
+        end = min(total, start + count)
+        if start >= end:
+            return []
+        
+        view = self._view()
+        begin = self._line_starts[start]
+        finish = self._line_starts[end] if end < len(self._line_starts) else self._size
+        return view[begin:finish].decode("utf-8", errors="replace").split("\n")[:end - start]
+    
+    def search(self, needle: str, from_line: int = 0) -> Optional[int]:
+        """Line index of the next line containing needle at or after from_line, wrapping once"""
+        pattern = needle.encode("utf-8")
+        if not pattern or self._size == 0:
+            return None
+        
+        view = self._view()
+        start = self._line_starts[min(max(from_line, 0), len(self._line_starts) - 1)]
+        offset = view.find(pattern, start)
+        if offset == -1 and start > 0:
+            offset = view.find(pattern, 0)
+        if offset == -1:
+            return None
+        return bisect_right(self._line_starts, offset) - 1
+    
+    def clear(self):
+        """Discard all stored text"""
+        self._close_map()
+        self._file.seek(0)
+        self._file.truncate()
+        self._size = 0
+        self._line_starts = array("Q", [0])
+    
+    def close(self):
+        """Close and delete the spill file"""
+        self._close_map()
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+    
+    def _view(self) -> mmap.mmap:
+        """Memory map covering everything written so far, remapped as the file grows"""
+        if self._map is None or self._map_size != self._size:
+            self._close_map()
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._map_size = self._size
+        return self._map
+    
+    def _close_map(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._map_size = 0
@@ -1,24 +1,110 @@
 import base64
 import hashlib
-from cryptography.fernet import Fernet
+import hmac
+import os
+import threading
+from typing import Dict, Optional
 
 class SecurityManager:
     """Handles password encryption and security operations"""
     
+    KEY_ITERATIONS = 100000
+    # Passwords encrypted with the master key carry this prefix; others use a per-profile key
+    MASTER_KEY_PREFIX = "mk:"
+    
+    def __init__(self):
+        self._key_cache: Dict[str, bytes] = {}
+        self._master_key: Optional[bytes] = None
+        self._lock = threading.Lock()
+    
     @staticmethod
-    def generate_key(seed: str) -> bytes:
-        """Generate encryption key from seed"""
+    def derive_key(seed: str, salt: bytes = b'salt_') -> bytes:
+        """Derive an encryption key from seed (slow by design, never cached)"""
         return base64.urlsafe_b64encode(
-            hashlib.pbkdf2_hmac('sha256', seed.encode(), b'salt_', 100000)
+            hashlib.pbkdf2_hmac('sha256', seed.encode(), salt, SecurityManager.KEY_ITERATIONS)
         )
     
+    def generate_key(self, seed: str) -> bytes:
+        """Generate encryption key from seed, reusing keys derived earlier in this session"""
+        with self._lock:
+            key = self._key_cache.get(seed)
+        if key is None:
+            key = self.derive_key(seed)
+            with self._lock:
+                self._key_cache[seed] = key
+        return key
+    
+    def invalidate_key(self, seed: Optional[str] = None):
+        """Forget the cached key for seed, or every cached key"""
+        with self._lock:
+            if seed is None:
+                self._key_cache.clear()
+            else:
+                self._key_cache.pop(seed, None)
+    
+    def wipe(self):
+        """Forget all cached keys and lock the master key"""
+        with self._lock:
+            self._key_cache.clear()
+            self._master_key = None
+    
+    @property
+    def unlocked(self) -> bool:
+        return self._master_key is not None
+    
+    def create_master_key(self, passphrase: str) -> str:
+        """Create and unlock a new master key, returning the record to store in settings"""
+        salt = os.urandom(16)
+        key = self.derive_key(passphrase, salt)
+        with self._lock:
+            self._master_key = key
+        return (base64.urlsafe_b64encode(salt).decode() + "$" +
+                base64.urlsafe_b64encode(self._verifier(key)).decode())
+    
+    def unlock(self, passphrase: str, record: str) -> bool:
+        """Unlock the master key described by record; False if the passphrase is wrong"""
+        try:
+            salt, verifier = (base64.urlsafe_b64decode(part) for part in record.split("$"))
+        except Exception:
+            return False
+        key = self.derive_key(passphrase, salt)
+        if not hmac.compare_digest(self._verifier(key), verifier):
+            return False
+        with self._lock:
+            self._master_key = key
+        return True
+    
+    def encrypt_profile_password(self, password: str, seed: str) -> str:
+        """Encrypt a profile password with the master key if unlocked, else the per-profile key"""
+        if not password:
+            return ""
+        master_key = self._master_key
+        if master_key is not None:
+            encrypted = self.encrypt_password(password, master_key)
+            return self.MASTER_KEY_PREFIX + encrypted if encrypted else ""
+        return self.encrypt_password(password, self.generate_key(seed))
+    
+    def decrypt_profile_password(self, encrypted_password: str, seed: str) -> str:
+        """Decrypt a profile password; master-key passwords need the store to be unlocked"""
+        if encrypted_password.startswith(self.MASTER_KEY_PREFIX):
+            master_key = self._master_key
+            if master_key is None:
+                raise RuntimeError("Profile store is locked: unlock the master key first")
+            return self.decrypt_password(encrypted_password[len(self.MASTER_KEY_PREFIX):], master_key)
+        return self.decrypt_password(encrypted_password, self.generate_key(seed))
+    
+    @staticmethod
+    def _verifier(key: bytes) -> bytes:
+        """Value stored to check a passphrase without storing the key itself"""
+        return hashlib.sha256(b'verifier_' + key).digest()
+    
     @staticmethod
     def encrypt_password(password: str, key: bytes) -> str:
         """Encrypt password using key"""
         if not password:
             return ""
         try:
-            fernet = Fernet(key)
+            fernet = SecurityManager._fernet(key)
             encrypted = fernet.encrypt(password.encode())
             return base64.urlsafe_b64encode(encrypted).decode()
         except Exception:
@@ -30,9 +116,15 @@ class SecurityManager:
         if not encrypted_password:
             return ""
         try:
-            fernet = Fernet(key)
+            fernet = SecurityManager._fernet(key)
             encrypted_bytes = base64.urlsafe_b64decode(encrypted_password.encode())
             decrypted = fernet.decrypt(encrypted_bytes)
             return decrypted.decode()
         except Exception:
             return ""
+    
+    @staticmethod
+    def _fernet(key: bytes):
+        """Fernet cipher for key; cryptography is imported on first use to keep startup fast"""
+        from cryptography.fernet import Fernet
+        return Fernet(key)
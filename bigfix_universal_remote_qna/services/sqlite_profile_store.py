@@ -0,0 +1,232 @@
+import sqlite3
+import threading
+from typing import Callable, Iterable, List, Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+
+
+class SQLiteProfileStore:
+    """Profile inventory in SQLite with indexed targeting by OS, tag, group, site and last-seen.
+    
+    Tags are indexed in profile_tags for targeting and also kept, sorted and joined, in the
+    profile's own row, so reading profiles never has to gather them per row.
+    """
+    
+    _COLUMNS = ("name", "host", "port", "username", "password", "os", "qna_path",
+                "grp", "site", "last_seen", "detected_os", "transport", "tags")
+    
+    _TAG_SEPARATOR = "\x1f"
+    
+    # OS used for targeting: what a probe detected, else what the profile says
+    _TARGET_OS = "(CASE WHEN detected_os != '' THEN detected_os ELSE os END)"
+    
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            position INTEGER NOT NULL UNIQUE,
+            name TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            port INTEGER NOT NULL DEFAULT 22,
+            username TEXT NOT NULL DEFAULT '',
+            password TEXT NOT NULL DEFAULT '',
+            os TEXT NOT NULL DEFAULT '',
+            qna_path TEXT NOT NULL DEFAULT '',
+            grp TEXT NOT NULL DEFAULT '',
+            site TEXT NOT NULL DEFAULT '',
+            last_seen REAL NOT NULL DEFAULT 0,
+            detected_os TEXT NOT NULL DEFAULT '',
+            transport TEXT NOT NULL DEFAULT 'ssh',
+            tags TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE IF NOT EXISTS profile_tags (
+            name TEXT NOT NULL REFERENCES profiles(name) ON DELETE CASCADE,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (tag, name)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_profile_tags_name ON profile_tags(name);
+        CREATE INDEX IF NOT EXISTS idx_profiles_target_os ON profiles({target_os}, site);
+        CREATE INDEX IF NOT EXISTS idx_profiles_grp ON profiles(grp);
+        CREATE INDEX IF NOT EXISTS idx_profiles_site ON profiles(site, grp);
+        CREATE INDEX IF NOT EXISTS idx_profiles_last_seen ON profiles(last_seen);
+        CREATE INDEX IF NOT EXISTS idx_profiles_detected_os ON profiles(detected_os);
+    """
+    
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(self._SCHEMA.format(target_os=self._TARGET_OS))
+        self._add_missing_columns()
+    
+    def _add_missing_columns(self):
+        """Upgrade databases created before a column existed"""
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(profiles)")}
+        if "transport" not in existing:
+            self._conn.execute("ALTER TABLE profiles ADD COLUMN transport TEXT NOT NULL DEFAULT 'ssh'")
+            self._conn.commit()
+        if "tags" not in existing:
+            with self._conn:
+                self._conn.execute("ALTER TABLE profiles ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+                tags = {}
+                for name, tag in self._conn.execute("SELECT name, tag FROM profile_tags"):
+                    tags.setdefault(name, []).append(tag)
+                self._conn.executemany("UPDATE profiles SET tags = ? WHERE name = ?",
+                                       [(self._join_tags(names), name) for name, names in tags.items()])
+    
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+    
+    def count(self) -> int:
+        """Number of stored profiles"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+    
+    def get_all_profiles(self) -> List[ConnectionProfile]:
+        """All profiles in insertion order"""
+        return self._query("ORDER BY p.position")
+    
+    def get_profile_names(self) -> List[str]:
+        """Names of all profiles in insertion order"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT name FROM profiles ORDER BY position")]
+    
+    def get_profile_index(self, profile_name: str) -> int:
+        """Position of a profile among all profiles, or -1"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM profiles WHERE position < p.position) "
+                "FROM profiles p WHERE name = ?", (profile_name,)).fetchone()
+        return row[0] if row else -1
+    
+    def get_profile_at(self, index: int) -> Optional[ConnectionProfile]:
+        """Profile at a position among all profiles, or None"""
+        if index < 0:
+            return None
+        profiles = self._query("ORDER BY p.position LIMIT 1 OFFSET ?", (index,))
+        return profiles[0] if profiles else None
+    
+    def get_profile_by_name(self, profile_name: str) -> Optional[ConnectionProfile]:
+        """Profile with the given name, or None"""
+        profiles = self._query("WHERE p.name = ?", (profile_name,))
+        return profiles[0] if profiles else None
+    
+    def get_profiles_by_names(self, profile_names: List[str]) -> List[ConnectionProfile]:
+        """Profiles with the given names, preserving the requested order"""
+        by_name = {}
+        names = list(dict.fromkeys(profile_names))
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            for profile in self._query(f"WHERE p.name IN ({','.join('?' * len(chunk))})", chunk):
+                by_name[profile.name] = profile
+        return [by_name[name] for name in profile_names if name in by_name]
+    
+    def select(self, os: Optional[str] = None, tags: Iterable[str] = (), group: Optional[str] = None,
+               site: Optional[str] = None, seen_since: Optional[float] = None,
+               name_like: Optional[str] = None) -> List[ConnectionProfile]:
+        """Profiles matching every given criterion; a profile must carry all of tags.
+        
+        os matches the detected OS when one was recorded, else the configured OS.
+        name_like is a SQL LIKE pattern matched against name and host.
+        """
+        clauses, params = [], []
+        if os:
+            # Must match the indexed expression exactly for SQLite to use the index
+            clauses.append(f"{self._TARGET_OS} = ?")
+            params.append(os)
+        # Tags alone drive the query from the (tag, name) key; next to an indexed OS, group or
+        # site they are only checked for the profiles that index already narrowed down
+        tag_clause = ("EXISTS (SELECT 1 FROM profile_tags t WHERE t.tag = ? AND t.name = p.name)"
+                      if os or group or site else
+                      "p.name IN (SELECT t.name FROM profile_tags t WHERE t.tag = ?)")
+        for tag in dict.fromkeys(tags):
+            clauses.append(tag_clause)
+            params.append(tag)
+        if group:
+            clauses.append("p.grp = ?")
+            params.append(group)
+        if site:
+            clauses.append("p.site = ?")
+            params.append(site)
+        if seen_since is not None:
+            clauses.append("p.last_seen >= ?")
+            params.append(seen_since)
+        if name_like:
+            clauses.append("(p.name LIKE ? OR p.host LIKE ?)")
+            params += [name_like, name_like]
+        
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        return self._query(f"{where} ORDER BY p.position", params)
+    
+    def save_profile(self, profile: ConnectionProfile,
+                     confirm_overwrite: Optional[Callable[[str], bool]] = None) -> bool:
+        """Insert or update a profile, asking confirm_overwrite before replacing one"""
+        if confirm_overwrite is not None and self.get_profile_index(profile.name) >= 0:
+            if not confirm_overwrite(profile.name):
+                return False
+        self.save_profiles([profile])
+        return True
+    
+    def save_profiles(self, profiles: Iterable[ConnectionProfile]) -> int:
+        """Insert or update many profiles in one transaction, keeping existing positions"""
+        count = 0
+        with self._lock, self._conn:
+            next_position = self._conn.execute(
+                "SELECT COALESCE(MAX(position), -1) + 1 FROM profiles").fetchone()[0]
+            for profile in profiles:
+                row = self._conn.execute(
+                    "SELECT position FROM profiles WHERE name = ?", (profile.name,)).fetchone()
+                if row:
+                    position = row[0]
+                else:
+                    position, next_position = next_position, next_position + 1
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO profiles (position, {', '.join(self._COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' * len(self._COLUMNS))})",
+                    (position,) + self._to_row(profile)
+                )
+                self._conn.execute("DELETE FROM profile_tags WHERE name = ?", (profile.name,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO profile_tags (name, tag) VALUES (?, ?)",
+                    [(profile.name, tag) for tag in profile.tags]
+                )
+                count += 1
+            if count > 1000:
+                # Refresh planner statistics after a bulk load
+                self._conn.execute("ANALYZE")
+        return count
+    
+    def delete_profile(self, profile_name: str) -> bool:
+        """Delete a profile; False if it does not exist"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM profiles WHERE name = ?", (profile_name,))
+            return cursor.rowcount > 0
+    
+    def _query(self, suffix: str, params: Iterable = ()) -> List[ConnectionProfile]:
+        """Profiles from SELECT ... FROM profiles p <suffix>"""
+        columns = ", ".join(f"p.{column}" for column in self._COLUMNS)
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {columns} FROM profiles p {suffix}", list(params)).fetchall()
+        from_row = self._from_row
+        return [from_row(row) for row in rows]
+    
+    @classmethod
+    def _join_tags(cls, tags: Iterable[str]) -> str:
+        return cls._TAG_SEPARATOR.join(sorted(set(tags)))
+    
+    @classmethod
+    def _to_row(cls, profile: ConnectionProfile) -> tuple:
+        return (profile.name, profile.host, profile.port, profile.username, profile.password,
+                profile.os, profile.qna_path, profile.group, profile.site, profile.last_seen,
+                profile.detected_os, profile.transport, cls._join_tags(profile.tags))
+    
+    @staticmethod
+    def _from_row(row: tuple) -> ConnectionProfile:
+        (name, host, port, username, password, os, qna_path, group, site, last_seen, detected_os,
+         transport, tags) = row
+        return ConnectionProfile(
+            name, host, port, username, password, os, qna_path,
+            tags.split("\x1f") if tags else [], group, site, last_seen, detected_os, transport
+        )
@@ -0,0 +1,228 @@
+import hashlib
+import hmac
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+
+if TYPE_CHECKING:
+    import paramiko
+
+
+PoolKey = Tuple[str, int, str, str]
+
+
+class _PooledConnection:
+    """One shared SSH client plus its bookkeeping"""
+    
+    def __init__(self):
+        self.client: Optional["paramiko.SSHClient"] = None
+        self.users = 0
+        self.last_used = time.monotonic()
+        self.ready = threading.Event()
+        self.error: Optional[Exception] = None
+    
+    def is_alive(self) -> bool:
+        transport = self.client.get_transport() if self.client else None
+        return transport is not None and transport.is_active()
+    
+    def close(self):
+        if self.client:
+            self.client.close()
+            self.client = None
+
+
+class SSHConnectionPool:
+    """Keeps keep-alive SSH connections open, one per (host, port, username, password)"""
+    
+    def __init__(self, max_connections: int = 20, idle_timeout: int = 300,
+                 keepalive_interval: int = 30):
+        self.max_connections = max(1, max_connections)
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        
+        self._connections: "OrderedDict[PoolKey, _PooledConnection]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._reaper: Optional[threading.Thread] = None
+        self._stop_reaper = threading.Event()
+        # Keys hold a keyed hash of the password rather than the password itself
+        self._secret = os.urandom(16)
+    
+    def key_for(self, profile: ConnectionProfile) -> PoolKey:
+        """Pool key for a profile; a connection is only reused with the password it was opened with"""
+        fingerprint = hmac.new(self._secret, (profile.password or "").encode(), hashlib.sha256).hexdigest()
+        return (profile.host, int(profile.port), profile.username, fingerprint)
+    
+    def acquire(self, profile: ConnectionProfile, timeout: int = 30) -> "paramiko.SSHClient":
+        """Get a connected client for the profile, reusing an open transport when possible"""
+        key = self.key_for(profile)
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            with self._condition:
+                self._start_reaper()
+                entry = self._connections.get(key)
+                
+                if entry is not None and entry.ready.is_set() and not entry.is_alive():
+                    # Dead transport: drop it and fall through to reconnect
+                    self._discard(key, entry)
+                    entry = None
+                
+                if entry is None:
+                    if not self._make_room(deadline):
+                        raise ConnectionError(
+                            f"Failed to connect: connection pool is full "
+                            f"({self.max_connections} open connections in use)"
+                        )
+                    entry = _PooledConnection()
+                    entry.users = 1
+                    self._connections[key] = entry
+                    owner = True
+                else:
+                    entry.users += 1
+                    owner = False
+                
+                self._connections.move_to_end(key)
+            
+            if owner:
+                self._open(key, entry, profile, timeout)
+            else:
+                entry.ready.wait(max(0, deadline - time.monotonic()))
+            
+            with self._condition:
+                if entry.ready.is_set() and entry.error is None and entry.is_alive():
+                    entry.last_used = time.monotonic()
+                    return entry.client
+                
+                entry.users -= 1
+                error = entry.error
+                if entry.ready.is_set():
+                    self._discard(key, entry)
+                self._condition.notify_all()
+            
+            if owner or error is not None or time.monotonic() >= deadline:
+                raise ConnectionError(f"Failed to connect: {error or 'timed out waiting for connection'}")
+    
+    def ensure_alive(self, profile: ConnectionProfile, timeout: int = 30) -> "paramiko.SSHClient":
+        """Return the profile's live client, reconnecting in place if its transport died"""
+        key = self.key_for(profile)
+        with self._condition:
+            entry = self._connections.get(key)
+            if entry is None:
+                raise RuntimeError("Not connected to remote machine")
+            if entry.ready.is_set() and entry.is_alive():
+                entry.last_used = time.monotonic()
+                return entry.client
+            users = entry.users
+            self._discard(key, entry)
+        
+        client = self.acquire(profile, timeout=timeout)
+        with self._condition:
+            # Carry the existing holders over to the replacement connection
+            self._connections[key].users += max(0, users - 1)
+        return client
+    
+    def release(self, profile: ConnectionProfile):
+        """Hand a client back to the pool; it stays open until idle for idle_timeout"""
+        key = self.key_for(profile)
+        with self._condition:
+            entry = self._connections.get(key)
+            if entry is not None and entry.users > 0:
+                entry.users -= 1
+                entry.last_used = time.monotonic()
+            self._condition.notify_all()
+    
+    def reap_idle(self):
+        """Close connections that have been unused for longer than idle_timeout"""
+        now = time.monotonic()
+        with self._condition:
+            for key, entry in list(self._connections.items()):
+                if not entry.ready.is_set() or entry.users > 0:
+                    continue
+                if now - entry.last_used >= self.idle_timeout or not entry.is_alive():
+                    self._discard(key, entry)
+            self._condition.notify_all()
+    
+    def close_all(self):
+        """Close every pooled connection and stop the idle reaper"""
+        self._stop_reaper.set()
+        with self._condition:
+            self._reaper = None
+            for key, entry in list(self._connections.items()):
+                self._discard(key, entry)
+            self._condition.notify_all()
+    
+    @staticmethod
+    def configure_transport(client: "paramiko.SSHClient", keepalive_interval: int = 0):
+        """Tune a newly connected client's transport for small, latency-bound messages.
+        
+        Queries and answers are small writes; Nagle's algorithm would hold each one back for
+        a delayed ACK, so it is turned off.
+        """
+        transport = client.get_transport()
+        if transport is None:
+            return
+        transport.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if keepalive_interval > 0:
+            transport.set_keepalive(keepalive_interval)
+    
+    def _open(self, key: PoolKey, entry: _PooledConnection, profile: ConnectionProfile,
+              timeout: int):
+        """Connect a new pool entry outside the pool lock"""
+        # paramiko is slow to import, so it is only loaded once a connection is made
+        import paramiko
+        
+        try:
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(
+                hostname=profile.host,
+                port=profile.port,
+                username=profile.username,
+                password=profile.password,
+                timeout=timeout,
+                banner_timeout=timeout,
+                auth_timeout=timeout
+            )
+            self.configure_transport(client, self.keepalive_interval)
+            entry.client = client
+        except Exception as e:
+            entry.error = e
+        finally:
+            entry.ready.set()
+    
+    def _make_room(self, deadline: float) -> bool:
+        """Evict the least recently used idle connection if at capacity (lock held)"""
+        while len(self._connections) >= self.max_connections:
+            for key, entry in self._connections.items():
+                if entry.users == 0 and entry.ready.is_set():
+                    self._discard(key, entry)
+                    break
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+    
+    def _discard(self, key: PoolKey, entry: _PooledConnection):
+        """Remove and close an entry (lock held)"""
+        if self._connections.get(key) is entry:
+            del self._connections[key]
+        entry.close()
+    
+    def _start_reaper(self):
+        """Start the background idle reaper on first use (lock held)"""
+        if self._reaper is not None or self.idle_timeout <= 0:
+            return
+        self._stop_reaper.clear()
+        self._reaper = threading.Thread(target=self._reap_loop, name="ssh-pool-reaper", daemon=True)
+        self._reaper.start()
+    
+    def _reap_loop(self):
+        interval = max(1, min(self.idle_timeout, 30))
+        while not self._stop_reaper.wait(interval):
+            self.reap_idle()
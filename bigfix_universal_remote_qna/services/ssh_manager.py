@@ -1,18 +1,32 @@
-from typing import Any, Dict
+import time
+from typing import Optional
 from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
-import paramiko  
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.transport import Transport
 
-from bigfix_universal_remote_qna.models.os_type import OSType
-
-class SSHManager:
+class SSHManager(Transport):
     """Handles SSH connections and command execution"""
     
-    def __init__(self):
+    def __init__(self, pool: Optional[SSHConnectionPool] = None,
+                 tracker: Optional[LatencyTracker] = None):
+        super().__init__(tracker=tracker)
         self.client = None
-        self.connected = False
+        self.pool = pool
     
-    def connect(self, profile: ConnectionProfile) -> bool:
-        """Establish SSH connection"""
+    def _connect(self, profile: ConnectionProfile, timeout: int) -> bool:
+        """Connect through the pool when there is one, otherwise directly"""
+        if self.pool is not None:
+            # Pooled connections are shared; hand back any previous one first
+            self.disconnect()
+            self.client = self.pool.acquire(profile, timeout=timeout)
+            self.profile = profile
+            self.connected = True
+            return True
+        
+        # paramiko is slow to import, so it is only loaded once a connection is made
+        import paramiko
+        
         try:
             self.client = paramiko.SSHClient()
             self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
@@ -22,9 +36,13 @@ class SSHManager:
                 port=profile.port,
                 username=profile.username,
                 password=profile.password,
-                timeout=30
+                timeout=timeout,
+                banner_timeout=timeout,
+                auth_timeout=timeout
             )
+            SSHConnectionPool.configure_transport(self.client)
             
+            self.profile = profile
             self.connected = True
             return True
             
@@ -34,39 +52,43 @@ class SSHManager:
     
     def disconnect(self):
         """Close SSH connection"""
-        if self.client:
+        if self.pool is not None and self.client and self.profile:
+            self.pool.release(self.profile)
+        elif self.client:
             self.client.close()
-            self.client = None
+        self.client = None
+        self.profile = None
         self.connected = False
     
-    def execute_command(self, command: str, timeout: int = 60) -> Dict[str, Any]:
-        """Execute command on remote machine"""
+    def _open_channel(self, command: str, timeout: Optional[int] = None, query: str = ""):
+        """Open a new channel on the current transport and start a command on it"""
         if not self.connected or not self.client:
             raise RuntimeError("Not connected to remote machine")
         
+        if self.pool is not None:
+            # Transparently replace a pooled transport that died while idle
+            self.client = self.pool.ensure_alive(self.profile)
+        
         try:
-            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
-            
-            output = stdout.read().decode()
-            error = stderr.read().decode()
-            exit_code = stdout.channel.recv_exit_status()
-            
-            return {
-                'output': output,
-                'error': error,
-                'exit_code': exit_code,
-                'success': exit_code == 0
-            }
-            
+            start = time.perf_counter()
+            channel = self.client.get_transport().open_session(timeout=timeout)
+            channel.exec_command(command)
+            self._record("channel_open", time.perf_counter() - start, query)
+            return channel
         except Exception as e:
             raise RuntimeError(f"Command execution failed: {str(e)}")
     
-    def test_file_exists(self, file_path: str, os_type: str) -> bool:
-        """Test if file exists on remote machine"""
-        if os_type == OSType.WINDOWS.value:
-            test_cmd = f'if exist "{file_path}" echo EXISTS'
-        else:
-            test_cmd = f'test -f "{file_path}" && echo EXISTS'
+    def upload_text(self, content: str, remote_path: str):
+        """Write text to a file on the remote machine over SFTP"""
+        if not self.connected or not self.client:
+            raise RuntimeError("Not connected to remote machine")
         
-        result = self.execute_command(test_cmd)
-        return "EXISTS" in result['output']
\ No newline at end of file
+        try:
+            sftp = self.client.open_sftp()
+            try:
+                with sftp.open(remote_path, 'w') as remote_file:
+                    remote_file.write(content.encode())
+            finally:
+                sftp.close()
+        except Exception as e:
+            raise RuntimeError(f"File upload failed: {str(e)}")
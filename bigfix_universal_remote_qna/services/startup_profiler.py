@@ -0,0 +1,51 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """Times the import and initialization phases of application startup"""
+    
+    def __init__(self, budget_ms: int = None):
+        if budget_ms is None:
+            budget_ms = int(os.environ.get("BIGFIX_QNA_STARTUP_BUDGET_MS", 1000))
+        self.budget_ms = budget_ms
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.total_ms = None
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, (time.perf_counter() - start) * 1000.0))
+    
+    def finish(self) -> Dict:
+        """Mark startup complete (window shown) and return the report"""
+        if self.total_ms is None:
+            self.total_ms = (time.perf_counter() - self.started) * 1000.0
+        return self.report()
+    
+    @property
+    def over_budget(self) -> bool:
+        return self.total_ms is not None and self.total_ms > self.budget_ms
+    
+    def report(self) -> Dict:
+        """Startup timings in milliseconds"""
+        return {
+            'total_ms': round(self.total_ms or 0.0, 1),
+            'budget_ms': self.budget_ms,
+            'phases': {name: round(ms, 1) for name, ms in self.phases},
+        }
+    
+    def print_report(self):
+        """Print a one-line summary, flagging startups slower than the budget"""
+        phases = ", ".join(f"{name} {ms:.0f}ms" for name, ms in self.phases)
+        if self.over_budget:
+            print(f"✗ Startup took {self.total_ms:.0f}ms (budget {self.budget_ms}ms): {phases}")
+        else:
+            print(f"✓ Startup took {self.total_ms:.0f}ms: {phases}")
@@ -0,0 +1,130 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken
+from bigfix_universal_remote_qna.services.command_stream import CommandStream
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+
+
+class Transport(ABC):
+    """Runs commands for QnA on a target machine.
+    
+    Implementations provide the connection and a channel per command; the channel follows
+    the subset of paramiko's Channel API that CommandStream and QnASession use.
+    """
+    
+    # Whether closing a channel also stops the processes it started (so no kill command is needed)
+    closing_stops_process = False
+    
+    def __init__(self, tracker: Optional[LatencyTracker] = None):
+        self.connected = False
+        self.tracker = tracker
+        self.profile: Optional[ConnectionProfile] = None
+    
+    def connect(self, profile: ConnectionProfile, timeout: int = 30) -> bool:
+        """Establish the connection"""
+        start = time.perf_counter()
+        connected = self._connect(profile, timeout)
+        self._record("connect", time.perf_counter() - start)
+        return connected
+    
+    @abstractmethod
+    def _connect(self, profile: ConnectionProfile, timeout: int) -> bool:
+        """Open the underlying connection"""
+    
+    @abstractmethod
+    def disconnect(self):
+        """Close the connection"""
+    
+    @abstractmethod
+    def _open_channel(self, command: str, timeout: Optional[int] = None, query: str = ""):
+        """Start a command and return its channel"""
+    
+    @abstractmethod
+    def upload_text(self, content: str, remote_path: str):
+        """Write text to a file on the target machine"""
+    
+    def execute_command(self, command: str, timeout: int = 60, query: str = "",
+                        cancel_token: Optional[CancelToken] = None, kill_command: str = "") -> Dict[str, Any]:
+        """Execute command on the target machine (see stream_command for cancellation)"""
+        stream = self.stream_command(command, timeout=timeout, query=query,
+                                     cancel_token=cancel_token, kill_command=kill_command)
+        output = []
+        error = []
+        
+        try:
+            for stream_name, text in stream:
+                (output if stream_name == CommandStream.STDOUT else error).append(text)
+            exit_code = stream.exit_code
+        except RuntimeError:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Command execution failed: {str(e)}")
+        
+        return {
+            'output': "".join(output),
+            'error': "".join(error),
+            'exit_code': exit_code,
+            'success': exit_code == 0
+        }
+    
+    def stream_command(self, command: str, timeout: int = 60,
+                       on_chunk: Optional[Callable[[str, str], None]] = None,
+                       query: str = "", cancel_token: Optional[CancelToken] = None,
+                       kill_command: str = "") -> CommandStream:
+        """Start a command and return a stream of its decoded output as it arrives.
+        
+        query labels the timings recorded for this command. Cancelling cancel_token closes
+        the channel; the thread reading the stream then runs kill_command (built by
+        QnACommandBuilder.build_kill_command) to stop the remote QnA and raises QueryCancelled.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        channel = self._open_channel(command, timeout=timeout, query=query)
+        try:
+            channel.shutdown_write()
+        except Exception as e:
+            channel.close()
+            raise RuntimeError(f"Command execution failed: {str(e)}")
+        
+        def on_finish(first_byte: float, transfer: float):
+            self._record("first_byte", first_byte, query)
+            self._record("transfer", transfer, query)
+        
+        on_cancel = None
+        if kill_command and not self.closing_stops_process:
+            on_cancel = lambda: self.kill_remote(kill_command)
+        
+        return CommandStream(channel, timeout=timeout, on_chunk=on_chunk,
+                             on_finish=on_finish if self.tracker else None,
+                             cancel_token=cancel_token, on_cancel=on_cancel)
+    
+    def kill_remote(self, kill_command: str):
+        """Run a kill command for a cancelled query; failures are reported, not raised"""
+        if self.closing_stops_process or not self.connected:
+            return
+        try:
+            self.execute_command(kill_command, timeout=15)
+        except Exception as e:
+            print(f"✗ Could not stop the remote QnA process: {e}")
+    
+    def open_process(self, command: str):
+        """Start a long-running command and return its channel for interactive stdin/stdout"""
+        return self._open_channel(command)
+    
+    def _record(self, phase: str, seconds: float, query: str = ""):
+        """Record a timing sample for the connected host, if timings are tracked"""
+        if self.tracker is not None and self.profile is not None:
+            self.tracker.record(phase, seconds, host=self.profile.host, query=query)
+    
+    def test_file_exists(self, file_path: str, os_type: str) -> bool:
+        """Test if file exists on the target machine"""
+        if os_type == OSType.WINDOWS.value:
+            test_cmd = f'if exist "{file_path}" echo EXISTS'
+        else:
+            test_cmd = f'test -f "{file_path}" && echo EXISTS'
+        
+        result = self.execute_command(test_cmd)
+        return "EXISTS" in result['output']
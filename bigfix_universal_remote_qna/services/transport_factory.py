@@ -0,0 +1,50 @@
+from typing import Callable, Dict, Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.transport_type import TransportType
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+from bigfix_universal_remote_qna.services.transport import Transport
+
+
+TransportBuilder = Callable[[Optional[SSHConnectionPool], Optional[LatencyTracker]], Transport]
+
+
+class TransportFactory:
+    """Creates the transport a profile asks for; backends are imported only when first used"""
+    
+    @staticmethod
+    def _ssh(pool: Optional[SSHConnectionPool], tracker: Optional[LatencyTracker]) -> Transport:
+        from bigfix_universal_remote_qna.services.ssh_manager import SSHManager
+        return SSHManager(pool=pool, tracker=tracker)
+    
+    @staticmethod
+    def _local(pool: Optional[SSHConnectionPool], tracker: Optional[LatencyTracker]) -> Transport:
+        from bigfix_universal_remote_qna.services.local_transport import LocalTransport
+        return LocalTransport(tracker=tracker)
+    
+    @staticmethod
+    def _fake(pool: Optional[SSHConnectionPool], tracker: Optional[LatencyTracker]) -> Transport:
+        from bigfix_universal_remote_qna.services.fake_transport import FakeTransport
+        return FakeTransport(tracker=tracker)
+    
+    _builders: Dict[str, TransportBuilder] = {
+        TransportType.SSH.value: _ssh,
+        TransportType.LOCAL.value: _local,
+        TransportType.FAKE.value: _fake,
+    }
+    
+    @classmethod
+    def register(cls, name: str, builder: TransportBuilder):
+        """Register (or replace) the builder used for profiles whose transport is name"""
+        cls._builders[name] = builder
+    
+    @classmethod
+    def create(cls, profile: Optional[ConnectionProfile] = None,
+               pool: Optional[SSHConnectionPool] = None,
+               tracker: Optional[LatencyTracker] = None) -> Transport:
+        """Unconnected transport for a profile's backend (SSH when there is no profile)"""
+        name = (profile.transport if profile is not None else None) or TransportType.SSH.value
+        builder = cls._builders.get(name)
+        if builder is None:
+            raise ValueError(f"Unknown transport: {name}")
+        return builder(pool, tracker)
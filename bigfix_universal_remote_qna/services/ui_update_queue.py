@@ -0,0 +1,104 @@
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class UIUpdateQueue:
+    """Collects UI updates from worker threads and applies them on the Tk main loop in batches"""
+    
+    def __init__(self, root, frame_budget_ms: int = 16, interval_ms: int = 30,
+                 max_chars_per_frame: int = 256 * 1024, tracker=None):
+        self.root = root
+        self.frame_budget = frame_budget_ms / 1000.0
+        self.interval_ms = interval_ms
+        self.max_chars_per_frame = max_chars_per_frame
+        self.tracker = tracker
+        
+        # deque.append/popleft are atomic, so workers never need a lock
+        self._pending = deque()
+        self._carry: Optional[tuple] = None
+        self._after_id = None
+    
+    def start(self):
+        """Start draining updates on the Tk main loop"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+    
+    def stop(self):
+        """Stop draining; pending updates are discarded"""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
+        self._carry = None
+    
+    def post(self, callback: Callable[..., Any], *args, **kwargs):
+        """Run callback(*args, **kwargs) on the Tk main loop (safe from any thread)"""
+        self._pending.append(("call", callback, args, kwargs))
+    
+    def append_text(self, widget, text: str):
+        """Append text to a Text widget on the Tk main loop, coalescing with other appends"""
+        if text:
+            self._pending.append(("text", widget, text))
+    
+    def _drain(self):
+        """Apply queued updates until the frame budget is spent, then reschedule"""
+        started = time.perf_counter()
+        deadline = started + self.frame_budget
+        busy = bool(self._carry or self._pending)
+        text_widget = None
+        text_parts = []
+        text_size = 0
+        
+        try:
+            while time.perf_counter() < deadline:
+                item = self._next_item()
+                if item is None:
+                    break
+                
+                if item[0] == "text":
+                    _, widget, text = item
+                    if widget is not text_widget:
+                        self._flush_text(text_widget, text_parts)
+                        text_widget, text_parts, text_size = widget, [], 0
+                    
+                    room = self.max_chars_per_frame - text_size
+                    if len(text) > room:
+                        # Very large outputs are spread over several frames
+                        text_parts.append(text[:room])
+                        self._carry = ("text", widget, text[room:])
+                        break
+                    text_parts.append(text)
+                    text_size += len(text)
+                else:
+                    self._flush_text(text_widget, text_parts)
+                    text_widget, text_parts, text_size = None, [], 0
+                    _, callback, args, kwargs = item
+                    try:
+                        callback(*args, **kwargs)
+                    except Exception as e:
+                        print(f"✗ UI update failed: {e}")
+            
+            self._flush_text(text_widget, text_parts)
+            if busy and self.tracker is not None:
+                self.tracker.record("render", time.perf_counter() - started)
+        finally:
+            delay = 1 if (self._carry or self._pending) else self.interval_ms
+            self._after_id = self.root.after(delay, self._drain)
+    
+    def _next_item(self) -> Optional[tuple]:
+        if self._carry is not None:
+            item, self._carry = self._carry, None
+            return item
+        try:
+            return self._pending.popleft()
+        except IndexError:
+            return None
+    
+    @staticmethod
+    def _flush_text(widget, parts):
+        """Insert coalesced text with a single widget call"""
+        if widget is None or not parts:
+            return
+        widget.insert("end", "".join(parts))
+        widget.see("end")
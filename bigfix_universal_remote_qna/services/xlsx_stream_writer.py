@@ -0,0 +1,166 @@
+import math
+import re
+import zipfile
+from typing import Any, List, Optional, Sequence
+from xml.sax.saxutils import escape, quoteattr
+
+
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+_SPECIAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff&<>]")
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+class XlsxStreamWriter:
+    """Write-only XLSX writer that streams rows straight into the zipped sheet XML.
+    
+    Strings are written inline rather than into a shared-strings table, so memory stays
+    constant however many rows are written; a full sheet continues on a new one, which
+    starts with the header again.
+    """
+    
+    MAX_ROWS = 1048576
+    MAX_CELL_CHARS = 32767
+    FLUSH_ROWS = 2000
+    
+    def __init__(self, path: str, header: Optional[Sequence[Any]] = None,
+                 sheet_name: str = "Results", compresslevel: int = 1):
+        self.header = header
+        self.sheet_name = sheet_name
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED,
+                                    compresslevel=compresslevel)
+        self._sheets: List[str] = []
+        self._stream = None
+        self._buffer: List[str] = []
+        self._row = 0
+        self._columns: List[str] = []
+        self._new_sheet()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def append(self, values: Sequence[Any]):
+        """Write one row; None leaves a cell empty"""
+        if self._row >= self.MAX_ROWS:
+            self._new_sheet()
+        self._row += 1
+        row = self._row
+        while len(self._columns) < len(values):
+            self._columns.append(self._column_name(len(self._columns)))
+        
+        cells = []
+        for column, value in zip(self._columns, values):
+            kind = type(value)
+            if kind is str:
+                cells.append(f'<c r="{column}{row}" t="inlineStr"><is><t xml:space="preserve">'
+                             f'{self._text(value)}</t></is></c>')
+            elif value is None:
+                continue
+            elif kind is bool:
+                cells.append(f'<c r="{column}{row}" t="b"><v>{int(value)}</v></c>')
+            elif kind is int or (kind is float and math.isfinite(value)):
+                cells.append(f'<c r="{column}{row}"><v>{value!r}</v></c>')
+            else:
+                cells.append(f'<c r="{column}{row}" t="inlineStr"><is><t xml:space="preserve">'
+                             f'{self._text(str(value))}</t></is></c>')
+        self._buffer.append(f'<row r="{row}">{"".join(cells)}</row>')
+        if len(self._buffer) >= self.FLUSH_ROWS:
+            self._flush()
+    
+    def close(self):
+        """Finish the last sheet and write the workbook parts"""
+        if self._zip is None:
+            return
+        self._end_sheet()
+        self._write_package()
+        self._zip.close()
+        self._zip = None
+    
+    def _new_sheet(self):
+        self._end_sheet()
+        number = len(self._sheets) + 1
+        self._sheets.append(self.sheet_name if number == 1 else f"{self.sheet_name} {number}")
+        self._stream = self._zip.open(f"xl/worksheets/sheet{number}.xml", "w", force_zip64=True)
+        self._stream.write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode("utf-8"))
+        self._row = 0
+        if self.header:
+            self.append(self.header)
+    
+    def _end_sheet(self):
+        if self._stream is None:
+            return
+        self._flush()
+        self._stream.write(b"</sheetData></worksheet>")
+        self._stream.close()
+        self._stream = None
+    
+    def _flush(self):
+        if self._buffer:
+            self._stream.write("".join(self._buffer).encode("utf-8"))
+            self._buffer = []
+    
+    def _write_package(self):
+        """Content types, relationships, workbook and styles for the sheets written"""
+        numbers = range(1, len(self._sheets) + 1)
+        sheet_types = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="application/'
+            f'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>' for n in numbers)
+        self._zip.writestr("[Content_Types].xml", (
+            f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{sheet_types}</Types>'))
+        self._zip.writestr("_rels/.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+        
+        sheets = "".join(f'<sheet name={quoteattr(name)} sheetId="{n}" r:id="rId{n}"/>'
+                         for n, name in zip(numbers, self._sheets))
+        self._zip.writestr("xl/workbook.xml", (
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheets>{sheets}</sheets></workbook>'))
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{n}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+            for n in numbers)
+        self._zip.writestr("xl/_rels/workbook.xml.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">{sheet_rels}'
+            f'<Relationship Id="rId{len(self._sheets) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'))
+        self._zip.writestr("xl/styles.xml", (
+            f'{_XML_HEADER}<styleSheet xmlns="{_MAIN_NS}">'
+            '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'))
+    
+    @classmethod
+    def _text(cls, value: str) -> str:
+        """Escaped cell text without characters XML cannot hold, cut to Excel's cell limit"""
+        if _SPECIAL.search(value) is None:
+            return value[:cls.MAX_CELL_CHARS]
+        return escape(_ILLEGAL_XML.sub("", value)[:cls.MAX_CELL_CHARS])
+    
+    @staticmethod
+    def _column_name(index: int) -> str:
+        """Spreadsheet column letters for a zero-based index (0 -> A, 26 -> AA)"""
+        name = ""
+        index += 1
+        while index:
+            index, remainder = divmod(index - 1, 26)
+            name = chr(ord("A") + remainder) + name
+        return name
@@ -1,19 +1,35 @@
-from pyutils_lib.services.stat_timer import StatTimer         # type: ignore
-from pyutils_lib.services.config_manager import ConfigManager # type: ignore
-from bigfix_universal_remote_qna.services.qna_remote_debugger import QnARemoteDebugger
-import tkinter as tk
+import sys
+from bigfix_universal_remote_qna.services.startup_profiler import StartupProfiler
 
 
 def main():
     """Main entry point for the application"""
-    root = tk.Tk()
-    app = QnARemoteDebugger(root)
+    profiler = StartupProfiler()
+    
+    with profiler.phase("import tkinter"):
+        import tkinter as tk
+    with profiler.phase("import app"):
+        from bigfix_universal_remote_qna.services.qna_remote_debugger import QnARemoteDebugger
+    with profiler.phase("create window"):
+        root = tk.Tk()
+    with profiler.phase("init app"):
+        app = QnARemoteDebugger(root, profiler=profiler)
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    
+    # --startup-report: show the window, report startup timings and exit (non-zero if over budget)
+    report_only = "--startup-report" in sys.argv[1:]
+    
+    def on_first_idle():
+        profiler.finish()
+        profiler.print_report()
+        if report_only:
+            app.on_closing()
+    
+    root.after_idle(on_first_idle)
     root.mainloop()
+    
+    if report_only and profiler.over_budget:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
-
-
-
-
@@ -2,4 +2,10 @@ from invoke import task
 
 @task
 def hi(c, name="Yashwanth"):
-    print("Hi {}!".format(name))
\ No newline at end of file
+    print("Hi {}!".format(name))
+
+
+@task
+def bench(c, hosts="1 10 100 1000", transport="ssh"):
+    """Benchmark fleet queries against simulated hosts and fail on regressions"""
+    c.run(f"python benchmarks/qna_benchmark.py --hosts {hosts} --transport {transport} --fail-on-regression")
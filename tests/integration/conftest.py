@@ -0,0 +1,27 @@
+import pytest
+from benchmarks.qna_simulator import SimulatedSSHServer
+from bigfix_universal_remote_qna.services.fake_transport import FakeQnA
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+from simulated_hosts import ANSWERS, TEST_TRANSPORT, FakeFleet
+
+
+@pytest.fixture
+def fake_fleet():
+    fleet = FakeFleet()
+    TransportFactory.register(TEST_TRANSPORT, fleet.create)
+    yield fleet
+    TransportFactory._builders.pop(TEST_TRANSPORT, None)
+
+
+@pytest.fixture(scope="module")
+def ssh_server():
+    pytest.importorskip("paramiko")
+    with SimulatedSSHServer(FakeQnA(ANSWERS)) as server:
+        yield server
+
+
+@pytest.fixture(scope="module")
+def shell_ssh_server():
+    pytest.importorskip("paramiko")
+    with SimulatedSSHServer(shell=True) as server:
+        yield server
@@ -0,0 +1,87 @@
+import threading
+from typing import Optional
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.os_type import OSType
+from bigfix_universal_remote_qna.services.buffered_channel import BufferedChannel
+from bigfix_universal_remote_qna.services.fake_transport import FakeQnA, FakeTransport
+
+
+ANSWERS = {"version of client": "11.0.1.104", "names of files": ["a.txt", "b.txt"]}
+
+TEST_TRANSPORT = "test-fake"
+
+
+class TricklingChannel(BufferedChannel):
+    """QnA that prints another answer every interval seconds and never finishes"""
+    
+    def __init__(self, interval: float):
+        super().__init__()
+        self._stopped = threading.Event()
+        threading.Thread(target=self._trickle, args=(interval,), daemon=True).start()
+    
+    def _trickle(self, interval: float):
+        count = 0
+        while not self._stopped.wait(interval):
+            self.feed_stdout(f"A: {count}\n".encode())
+            count += 1
+    
+    def _terminate(self):
+        self._stopped.set()
+
+
+class TricklingTransport(FakeTransport):
+    """FakeTransport whose QnA keeps streaming, recording the kill commands it is sent"""
+    
+    closing_stops_process = False
+    
+    def __init__(self, interval: float, **kwargs):
+        super().__init__(**kwargs)
+        self.interval = interval
+        self.channels = []
+        self.kill_commands = []
+    
+    def kill_remote(self, kill_command: str):
+        self.kill_commands.append(kill_command)
+    
+    def _qna_channel(self, script: Optional[str], missing: str = ""):
+        channel = TricklingChannel(self.interval)
+        self.channels.append(channel)
+        return channel
+
+
+class FakeFleet:
+    """FakeTransports handed out for TEST_TRANSPORT profiles, sharing one FakeQnA.
+    
+    With trickle set, every host's QnA streams an answer each trickle seconds and never ends.
+    """
+    
+    def __init__(self, unreachable=(), latency: float = 0.0, trickle: Optional[float] = None):
+        self.qna = FakeQnA(ANSWERS)
+        self.unreachable = set(unreachable)
+        self.latency = latency
+        self.trickle = trickle
+        self.transports = []
+    
+    def create(self, pool, tracker):
+        if self.trickle is not None:
+            transport = TricklingTransport(self.trickle, qna=self.qna, unreachable=self.unreachable,
+                                           tracker=tracker)
+        else:
+            transport = FakeTransport(qna=self.qna, unreachable=self.unreachable, latency=self.latency,
+                                      tracker=tracker)
+        self.transports.append(transport)
+        return transport
+    
+    @property
+    def commands(self):
+        return [command for transport in self.transports for command in transport.commands]
+    
+    @staticmethod
+    def profiles(*hosts: str, os_type: str = OSType.LINUX.value):
+        return [ConnectionProfile(name=host, host=host, os=os_type, transport=TEST_TRANSPORT) for host in hosts]
+
+
+def ssh_profile(server, name: str = "simulated", qna_path: str = "/opt/BESClient/bin/qna"):
+    """Profile for a SimulatedSSHServer, which accepts any password"""
+    return ConnectionProfile(name=name, host=server.host, port=server.port, username="test", password="test",
+                             os=OSType.LINUX.value, qna_path=qna_path)
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import pytest
+from bigfix_universal_remote_qna.models.os_type import DEFAULT_QNA_PATHS
+from bigfix_universal_remote_qna.services.async_qna_client import AsyncQnAClient
+from simulated_hosts import FakeFleet, ssh_profile
+
+
+pytestmark = pytest.mark.integration_tests
+
+
+def _client(**kwargs) -> AsyncQnAClient:
+    return AsyncQnAClient(default_qna_paths=DEFAULT_QNA_PATHS, **kwargs)
+
+
+def test_run_query_connects_parses_and_releases(fake_fleet):
+    async def run():
+        async with _client() as client:
+            return await client.run_query(FakeFleet.profiles("a")[0], "names of files")
+    
+    result = asyncio.run(run())
+    assert result.success and result.profile_name == "a"
+    assert result.answer_set.answers == ["a.txt", "b.txt"]
+    assert not fake_fleet.transports[0].connected
+
+
+def test_queries_share_a_connection_they_were_given(fake_fleet):
+    async def run():
+        async with _client() as client:
+            transport = await client.connect(FakeFleet.profiles("a")[0])
+            first = await client.run_query(transport, "version of client")
+            chunks = [item async for item in client.stream_query(transport, "names of files")]
+            connected = transport.connected
+            await client.disconnect(transport)
+            return first, chunks, connected
+    
+    first, chunks, connected = asyncio.run(run())
+    assert first.answer_set.answers == ["11.0.1.104"]
+    assert "".join(text for stream, text in chunks if stream == "stdout").count("A: ") == 2
+    assert connected and len(fake_fleet.transports) == 1
+
+
+def test_gather_fleet_reports_failures_per_host_in_profile_order(fake_fleet):
+    fake_fleet.unreachable.add("b")
+    
+    async def run():
+        async with _client() as client:
+            return await client.gather_fleet(FakeFleet.profiles("a", "b", "c"), "version of client")
+    
+    results = asyncio.run(run())
+    assert [result.profile_name for result in results] == ["a", "b", "c"]
+    assert [result.success for result in results] == [True, False, True]
+    assert results[1].error == "Failed to connect: b is unreachable"
+
+
+def test_gather_fleet_times_out_slow_hosts(fake_fleet):
+    fake_fleet.latency = 30.0
+    
+    async def run():
+        async with _client() as client:
+            return await client.gather_fleet(FakeFleet.profiles("a", "b"), "version of client", timeout=1)
+    
+    start = time.monotonic()
+    results = asyncio.run(run())
+    assert time.monotonic() - start < 10
+    assert all("did not finish within 1s" in result.error for result in results)
+    assert all(not transport.connected for transport in fake_fleet.transports)
+
+
+def test_concurrency_is_limited(fake_fleet):
+    fake_fleet.latency = 0.3
+    
+    async def run():
+        async with _client(max_concurrency=2) as client:
+            return await client.gather_fleet(FakeFleet.profiles("a", "b", "c", "d"), "version of client")
+    
+    start = time.monotonic()
+    results = asyncio.run(run())
+    # Four hosts, two at a time
+    assert time.monotonic() - start >= 0.55
+    assert all(result.success for result in results)
+
+
+def test_cancelling_the_gather_disconnects_every_host(fake_fleet):
+    fake_fleet.latency = 30.0
+    
+    async def run():
+        async with _client() as client:
+            task = asyncio.ensure_future(client.gather_fleet(FakeFleet.profiles("a", "b"), "version of client"))
+            await asyncio.sleep(0.3)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+    
+    start = time.monotonic()
+    asyncio.run(run())
+    assert time.monotonic() - start < 10
+    assert len(fake_fleet.transports) == 2
+    assert all(not transport.connected for transport in fake_fleet.transports)
+
+
+def test_over_ssh(ssh_server):
+    async def run():
+        async with _client() as client:
+            return await client.gather_fleet([ssh_profile(ssh_server, name=f"host-{index}") for index in range(3)],
+                                             "version of client")
+    
+    assert [result.answer_set.answers for result in asyncio.run(run())] == [["11.0.1.104"]] * 3
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.async_qna_client import AsyncQnAClient
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken, QueryCancelled
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+from bigfix_universal_remote_qna.services.local_transport import LocalTransport
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.qna_session import QnASession
+from bigfix_universal_remote_qna.services.ssh_manager import SSHManager
+from simulated_hosts import FakeFleet, ssh_profile
+
+
+pytestmark = pytest.mark.integration_tests
+
+SIMULATOR = os.path.join(os.path.dirname(__file__), "..", "..", "benchmarks", "qna_simulator.py")
+
+
+def _tagged_pids(tag: str):
+    found = subprocess.run(["pgrep", "-f", tag], capture_output=True, text=True)
+    return found.stdout.split()
+
+
+def _child_pids(pid: str):
+    return subprocess.run(["pgrep", "-P", pid], capture_output=True, text=True).stdout.split()
+
+
+@pytest.mark.skipif(shutil.which("pgrep") is None, reason="needs pgrep")
+@pytest.mark.parametrize("shell", [shell for shell in ("sh", "bash", "zsh") if shutil.which(shell)])
+def test_tagged_shell_survives_exec_optimisation(shell):
+    tag = f"qna-run-{uuid.uuid4().hex[:16]}"
+    process = subprocess.Popen([shell, "-c", QnACommandBuilder.tag_command("sleep 30", tag, "linux")])
+    try:
+        deadline = time.monotonic() + 10
+        while not _tagged_pids(tag) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        # bash 5.1+ and zsh exec a final simple command, which would replace the tagged shell
+        assert _tagged_pids(tag) == [str(process.pid)]
+        
+        subprocess.run(["sh", "-c", QnACommandBuilder.build_kill_command(tag, "/qna", "linux")],
+                       check=True, timeout=30)
+        assert process.wait(timeout=10) != 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+
+
+@pytest.mark.skipif(os.name == "nt" or shutil.which("pgrep") is None, reason="needs sh and pgrep")
+def test_session_shell_keeps_its_tag_and_is_killed_by_it():
+    transport = LocalTransport()
+    transport.connect(ConnectionProfile(name="local", host="localhost", os="linux", transport="local"))
+    session = QnASession(transport, os.path.abspath(SIMULATOR), "linux")
+    try:
+        assert session.query('"ready"', timeout=30)['answer_set'].answers == ["ready"]
+        assert _tagged_pids(session._tag)
+        
+        kill_command = QnACommandBuilder.build_kill_command(session._tag, session.qna_path, "linux")
+        subprocess.run(["sh", "-c", kill_command], check=True, timeout=30)
+        deadline = time.monotonic() + 10
+        while session.alive and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not session.alive
+    finally:
+        session.close()
+
+
+def _wait_for(condition, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.mark.parametrize("use_batch", [False, True])
+def test_cancelled_fleet_run_stops_hosts_in_progress(fake_fleet, use_batch):
+    fake_fleet.latency = 30.0
+    cancel_token = CancelToken()
+    threading.Timer(0.2, cancel_token.cancel).start()
+    start = time.monotonic()
+    results = list(FleetExecutor(max_workers=2).execute_many(
+        FakeFleet.profiles("a", "b", "c", "d"), ["version of client", "names of files"],
+        use_batch=use_batch, cancel_token=cancel_token))
+    
+    assert time.monotonic() - start < 10
+    # Hosts not started yet are skipped; the running ones report the cancellation
+    assert results
+    assert all(result.error == "Query cancelled" and not result.success for result in results)
+
+
+def test_cancelled_stream_raises():
+    transport = FakeFleet().create(None, None)
+    transport.latency = 30.0
+    transport.connect(FakeFleet.profiles("a")[0])
+    cancel_token = CancelToken()
+    stream = transport.stream_command('echo "version of client" | "/opt/BESClient/bin/qna"',
+                                      cancel_token=cancel_token)
+    threading.Timer(0.2, cancel_token.cancel).start()
+    with pytest.raises(QueryCancelled):
+        list(stream)
+
+
+@pytest.mark.skipif(os.name == "nt" or shutil.which("pgrep") is None, reason="needs sh and pgrep")
+def test_cancel_over_ssh_kills_the_remote_qna(shell_ssh_server, monkeypatch):
+    # The simulator started by the SSH stand-in's shell takes 60 s per query
+    monkeypatch.setenv("QNA_SIM_DELAY_MS", "60000")
+    transport = SSHManager()
+    transport.connect(ssh_profile(shell_ssh_server, qna_path=os.path.abspath(SIMULATOR)))
+    cancel_token = CancelToken()
+    command = QnACommandBuilder.tag_command(
+        QnACommandBuilder.build_command("version of client", transport.profile.qna_path, "linux"),
+        cancel_token.tag, "linux")
+    kill_command = QnACommandBuilder.build_kill_command(cancel_token.tag, transport.profile.qna_path, "linux")
+    
+    outcome = []
+    
+    def run():
+        try:
+            outcome.append(transport.execute_command(command, timeout=120, cancel_token=cancel_token,
+                                                     kill_command=kill_command))
+        except QueryCancelled as e:
+            outcome.append(e)
+    
+    runner = threading.Thread(target=run)
+    runner.start()
+    try:
+        assert _wait_for(lambda: _tagged_pids(cancel_token.tag))
+        cancel_token.cancel()
+        runner.join(30)
+        assert isinstance(outcome[0], QueryCancelled)
+        assert _wait_for(lambda: not _tagged_pids(cancel_token.tag))
+    finally:
+        cancel_token.cancel()
+        transport.disconnect()
+
+
+@pytest.mark.skipif(os.name == "nt" or shutil.which("pgrep") is None, reason="needs sh and pgrep")
+def test_cancelled_async_query_kills_the_remote_qna(shell_ssh_server, monkeypatch):
+    monkeypatch.setenv("QNA_SIM_DELAY_MS", "60000")
+    profile = ssh_profile(shell_ssh_server, qna_path=os.path.abspath(SIMULATOR))
+    # Unique word of the query, so the remote shell running it can be found
+    word = f"query{uuid.uuid4().hex}"
+    
+    async def cancel_query():
+        async with AsyncQnAClient() as client:
+            task = asyncio.ensure_future(client.run_query(profile, f"name of {word}"))
+            assert await asyncio.to_thread(_wait_for, lambda: _tagged_pids(word))
+            shells = _tagged_pids(word)
+            processes = shells + [pid for shell in shells for pid in _child_pids(shell)]
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return processes
+    
+    processes = asyncio.run(cancel_query())
+    assert len(processes) > 1
+    # Killed before the connection was released, not left running for the full minute
+    assert _wait_for(lambda: not any(os.path.exists(f"/proc/{pid}") for pid in processes), timeout=5)
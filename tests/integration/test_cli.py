@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+
+pytestmark = pytest.mark.integration_tests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SIMULATOR = os.path.join(ROOT, "benchmarks", "qna_simulator.py")
+LOCAL = ["--transport", "local", "--host", "me@localhost", "--qna-path", SIMULATOR]
+
+
+def _run_cli(tmp_path, *args, code: str = "import sys\nfrom bigfix_universal_remote_qna.cli import main\n"
+                                          "sys.exit(main(sys.argv[1:]))"):
+    env = dict(os.environ, HOME=str(tmp_path), USERPROFILE=str(tmp_path), PYTHONPATH=ROOT)
+    return subprocess.run([sys.executable, "-c", code, *args], capture_output=True, text=True,
+                          env=env, cwd=str(tmp_path), timeout=120)
+
+
+@pytest.mark.parametrize("args, message", [
+    (["run", "--host", "me@localhost"], "No queries given"),
+    (["run", "--query", "names of (files", "--host", "me@localhost"], "Not sending any query"),
+    (["run", "--query", "version of client"], "No targets given"),
+])
+def test_usage_problems_exit_with_2(tmp_path, args, message):
+    completed = _run_cli(tmp_path, *args)
+    assert completed.returncode == 2
+    assert message in completed.stderr
+    assert completed.stdout == ""
+
+
+@pytest.mark.skipif(os.name == "nt", reason="runs the simulator as a local QnA executable")
+def test_answers_are_written_as_json_lines(tmp_path):
+    completed = _run_cli(tmp_path, "run", *LOCAL, "--query", "version of client", "--query", '"x"')
+    assert completed.returncode == 0, completed.stderr
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [record['query'] for record in records] == ["version of client", '"x"']
+    assert all(record['success'] and record['profile'] == "me@localhost" for record in records)
+    assert records[1]['answers'] == ["x"]
+
+
+def test_failed_hosts_exit_with_1(tmp_path):
+    pytest.importorskip("paramiko")
+    # Nothing listens on port 1
+    completed = _run_cli(tmp_path, "run", "--host", "me@127.0.0.1:1", "--query", "version of client",
+                         "--timeout", "5")
+    assert completed.returncode == 1
+    record = json.loads(completed.stdout)
+    assert not record['success'] and record['stderr']
+
+
+@pytest.mark.skipif(os.name == "nt", reason="runs the simulator as a local QnA executable")
+def test_run_never_imports_tkinter(tmp_path):
+    # A None entry makes any import of tkinter fail
+    code = ("import sys\nsys.modules['tkinter'] = None\n"
+            "from bigfix_universal_remote_qna.cli import main\nsys.exit(main(sys.argv[1:]))")
+    completed = _run_cli(tmp_path, "run", *LOCAL, "--query", '"x"', "--probe", code=code)
+    assert completed.returncode == 0, completed.stderr
+    assert json.loads(completed.stdout)['answers'] == ["x"]
@@ -0,0 +1,109 @@
+import re
+import time
+import pytest
+from bigfix_universal_remote_qna.models.os_type import OSType, DEFAULT_QNA_PATHS
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+from bigfix_universal_remote_qna.services.host_probe_cache import HostProbeCache
+from bigfix_universal_remote_qna.services.host_prober import HostProber
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+from bigfix_universal_remote_qna.services.query_result_cache import QueryResultCache
+from simulated_hosts import FakeFleet, ssh_profile
+
+
+pytestmark = pytest.mark.integration_tests
+
+QUERIES = ["version of client", "names of files", "bogus"]
+
+
+def _by_host(results):
+    found = {}
+    for result in results:
+        found.setdefault(result.profile_name, []).append(result)
+    return found
+
+
+@pytest.mark.parametrize("use_batch", [False, True])
+@pytest.mark.parametrize("os_type", [OSType.LINUX.value, OSType.WINDOWS.value])
+def test_every_host_answers_every_query_in_order(fake_fleet, use_batch, os_type):
+    executor = FleetExecutor(max_workers=4, default_qna_paths=DEFAULT_QNA_PATHS)
+    profiles = FakeFleet.profiles("a", "b", "c", os_type=os_type)
+    results = _by_host(executor.execute_many(profiles, QUERIES, use_batch=use_batch))
+    
+    assert sorted(results) == ["a", "b", "c"]
+    for host_results in results.values():
+        assert [result.query for result in host_results] == QUERIES
+        assert all(result.success and result.exit_code == 0 for result in host_results)
+        assert host_results[0].answer_set.answers == ["11.0.1.104"]
+        assert host_results[1].answer_set.answers == ["a.txt", "b.txt"]
+        assert host_results[2].answer_set.errors == ['The operator "bogus" is not defined.']
+    if use_batch:
+        assert len(fake_fleet.commands) == 3
+
+
+def test_unreachable_host_fails_alone(fake_fleet):
+    fake_fleet.unreachable.add("b")
+    results = _by_host(FleetExecutor(default_qna_paths=DEFAULT_QNA_PATHS).execute_many(
+        FakeFleet.profiles("a", "b"), QUERIES[:2]))
+    
+    assert all(result.success for result in results["a"])
+    assert [result.error for result in results["b"]] == ["Failed to connect: b is unreachable"] * 2
+    assert not any(result.success for result in results["b"])
+
+
+def test_cached_results_skip_the_host(fake_fleet):
+    executor = FleetExecutor(cache=QueryResultCache(), default_qna_paths=DEFAULT_QNA_PATHS)
+    profiles = FakeFleet.profiles("a")
+    first = list(executor.execute_many(profiles, QUERIES[:2]))
+    transports = len(fake_fleet.transports)
+    
+    second = list(executor.execute_many(profiles, QUERIES[:2]))
+    assert len(fake_fleet.transports) == transports
+    assert [result.answer_set.answers for result in second] == [result.answer_set.answers for result in first]
+    
+    executor.bypass_cache = True
+    list(executor.execute_many(profiles, QUERIES[:2]))
+    assert len(fake_fleet.transports) == transports + 1
+
+
+def test_probed_path_is_used_for_running_and_caching(fake_fleet):
+    prober = HostProber(DEFAULT_QNA_PATHS, HostProbeCache())
+    executor = FleetExecutor(cache=QueryResultCache(), prober=prober, default_qna_paths={})
+    profiles = FakeFleet.profiles("a")
+    
+    first = list(executor.execute_many(profiles, QUERIES[:1]))
+    assert first[0].success
+    assert prober.cached(profiles[0]).qna_path == DEFAULT_QNA_PATHS[OSType.LINUX.value]
+    assert DEFAULT_QNA_PATHS[OSType.LINUX.value] in fake_fleet.commands[-1]
+    
+    # Probe and result both come from their caches now: no connection at all
+    transports = len(fake_fleet.transports)
+    assert list(executor.execute_many(profiles, QUERIES[:1]))[0].answer_set.answers == ["11.0.1.104"]
+    assert len(fake_fleet.transports) == transports
+
+
+@pytest.mark.parametrize("use_batch", [False, True])
+def test_host_timeout_stops_a_host_that_keeps_streaming(fake_fleet, use_batch):
+    # Output every 0.1 s never trips the idle timeout; only the host's deadline ends it
+    fake_fleet.trickle = 0.1
+    start = time.monotonic()
+    results = list(FleetExecutor(host_timeout=1, default_qna_paths=DEFAULT_QNA_PATHS).execute_many(
+        FakeFleet.profiles("a", "b"), QUERIES[:2], use_batch=use_batch))
+    
+    assert time.monotonic() - start < 5
+    assert len(results) == 4
+    assert all(result.error == "Timed out after 1s" and not result.success for result in results)
+    for transport in fake_fleet.transports:
+        assert transport.channels and all(channel.closed for channel in transport.channels)
+        # The remote QnA is killed by the tag its command carried
+        tag = re.search(r"qna-run-[0-9a-f]{16}", transport.commands[-1]).group()
+        assert transport.kill_commands == [QnACommandBuilder.build_kill_command(
+            tag, DEFAULT_QNA_PATHS[OSType.LINUX.value], OSType.LINUX.value)]
+
+
+def test_fleet_over_ssh(ssh_server):
+    profiles = [ssh_profile(ssh_server, name=f"host-{index}") for index in range(3)]
+    for use_batch in (False, True):
+        results = list(FleetExecutor(max_workers=3).execute_many(profiles, QUERIES[:2], use_batch=use_batch))
+        assert len(results) == 6
+        assert all(result.success for result in results)
+        assert {tuple(result.answer_set.answers) for result in results} == {("11.0.1.104",), ("a.txt", "b.txt")}
@@ -0,0 +1,91 @@
+import os
+import sys
+import threading
+import time
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.transport_type import TransportType
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken, QueryCancelled
+from bigfix_universal_remote_qna.services.fleet_executor import FleetExecutor
+from bigfix_universal_remote_qna.services.local_transport import LocalTransport
+from bigfix_universal_remote_qna.services.transport_factory import TransportFactory
+
+
+pytestmark = [
+    pytest.mark.integration_tests,
+    pytest.mark.skipif(os.name == "nt", reason="uses sh and /proc"),
+]
+
+SIMULATOR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                         "benchmarks", "qna_simulator.py")
+
+
+def _profile(**kwargs) -> ConnectionProfile:
+    return ConnectionProfile("local", "localhost", os="linux", transport=TransportType.LOCAL.value, **kwargs)
+
+
+@pytest.fixture
+def transport():
+    transport = TransportFactory.create(_profile())
+    transport.connect(_profile())
+    yield transport
+    transport.disconnect()
+
+
+def _alive(pid: int) -> bool:
+    """Whether pid runs; a zombie nobody reaped yet counts as gone"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except OSError:
+        return False
+
+
+def test_profiles_with_the_local_transport_get_one(transport):
+    assert isinstance(transport, LocalTransport)
+
+
+def test_commands_report_output_errors_and_exit_code(transport):
+    result = transport.execute_command("echo out; echo err >&2; exit 3")
+    assert result == {'output': "out\n", 'error': "err\n", 'exit_code': 3, 'success': False}
+
+
+def test_files_and_processes(transport, tmp_path):
+    path = str(tmp_path / "queries.qna")
+    transport.upload_text("version of client\n", path)
+    assert transport.test_file_exists(path, "linux")
+    assert not transport.test_file_exists(path + ".missing", "linux")
+    
+    channel = transport.open_process("cat")
+    channel.sendall(b"hello\n")
+    channel.shutdown_write()
+    assert channel.recv(100) == b"hello\n"
+    assert channel.recv_exit_status() == 0
+
+
+def test_cancel_kills_the_whole_process_group(transport):
+    cancel_token = CancelToken()
+    stream = transport.stream_command("sleep 60 & echo $!; wait", cancel_token=cancel_token)
+    chunks = iter(stream)
+    child = int(next(chunks)[1])
+    assert _alive(child)
+    
+    threading.Timer(0.1, cancel_token.cancel).start()
+    with pytest.raises(QueryCancelled):
+        list(chunks)
+    deadline = time.monotonic() + 5
+    while _alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
+
+
+def test_fleet_runs_qna_locally():
+    profiles = [_profile(qna_path=SIMULATOR)]
+    results = list(FleetExecutor().execute_many(profiles, ["version of client", '"local"']))
+    assert all(result.success for result in results)
+    assert results[1].answer_set.answers == ["local"]
+
+
+def test_missing_qna_fails_cleanly():
+    results = list(FleetExecutor().execute_many([_profile(qna_path=sys.prefix + "/no-such-qna")], ["1"]))
+    assert not results[0].success and results[0].exit_code != 0
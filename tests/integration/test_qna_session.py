@@ -0,0 +1,75 @@
+import threading
+import pytest
+from bigfix_universal_remote_qna.models.os_type import OSType, DEFAULT_QNA_PATHS
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken, QueryCancelled
+from bigfix_universal_remote_qna.services.fake_transport import FakeTransport
+from bigfix_universal_remote_qna.services.qna_session import QnASession
+from bigfix_universal_remote_qna.services.ssh_manager import SSHManager
+from simulated_hosts import ANSWERS, FakeFleet, ssh_profile
+
+
+pytestmark = pytest.mark.integration_tests
+
+
+@pytest.mark.parametrize("os_type", [OSType.LINUX.value, OSType.WINDOWS.value])
+def test_session_answers_queries_one_after_another(os_type):
+    transport = FakeTransport(ANSWERS)
+    transport.connect(FakeFleet.profiles("a", os_type=os_type)[0])
+    session = QnASession(transport, DEFAULT_QNA_PATHS[os_type], os_type)
+    try:
+        first = session.query("version of client")
+        channel = session.channel
+        second = session.query("names of files")
+        third = session.query("bogus")
+        
+        assert first['answer_set'].answers == ["11.0.1.104"]
+        assert second['answer_set'].answers == ["a.txt", "b.txt"]
+        assert third['answer_set'].errors == ['The operator "bogus" is not defined.']
+        assert all(result['success'] for result in (first, second, third))
+        # One QnA process serves every query
+        assert session.channel is channel
+        assert len(transport.commands) == 1
+    finally:
+        session.close()
+    assert not session.alive
+
+
+def test_session_restarts_after_close():
+    transport = FakeTransport(ANSWERS)
+    transport.connect(FakeFleet.profiles("a")[0])
+    session = QnASession(transport, "/opt/BESClient/bin/qna", OSType.LINUX.value)
+    session.query("version of client")
+    session.close()
+    assert session.query("version of client")['answer_set'].answers == ["11.0.1.104"]
+    assert len(transport.commands) == 2
+    session.close()
+
+
+def test_cancelled_session_query_raises():
+    class SilentTransport(FakeTransport):
+        def open_process(self, command):
+            channel = super().open_process(command)
+            # QnA that never answers
+            channel._write_input = lambda data: None
+            return channel
+    
+    transport = SilentTransport()
+    transport.connect(FakeFleet.profiles("a")[0])
+    session = QnASession(transport, "/opt/BESClient/bin/qna", OSType.LINUX.value)
+    cancel_token = CancelToken()
+    threading.Timer(0.2, cancel_token.cancel).start()
+    with pytest.raises(QueryCancelled):
+        session.query("version of client", timeout=30, cancel_token=cancel_token)
+    assert not session.alive
+
+
+def test_session_over_ssh(ssh_server):
+    transport = SSHManager()
+    transport.connect(ssh_profile(ssh_server))
+    session = QnASession(transport, "/opt/BESClient/bin/qna", OSType.LINUX.value)
+    try:
+        assert session.query("version of client")['answer_set'].answers == ["11.0.1.104"]
+        assert session.query("names of files")['answer_set'].answers == ["a.txt", "b.txt"]
+    finally:
+        session.close()
+        transport.disconnect()
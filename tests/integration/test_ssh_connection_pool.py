@@ -0,0 +1,82 @@
+import dataclasses
+import pytest
+from bigfix_universal_remote_qna.services.ssh_connection_pool import SSHConnectionPool
+from simulated_hosts import ssh_profile
+
+
+pytestmark = pytest.mark.integration_tests
+
+
+@pytest.fixture
+def pool():
+    pool = SSHConnectionPool(idle_timeout=0)
+    yield pool
+    pool.close_all()
+
+
+def test_key_depends_on_the_password_without_holding_it(ssh_server, pool):
+    profile = dataclasses.replace(ssh_profile(ssh_server), password="s3cret")
+    other = dataclasses.replace(profile, password="other")
+    
+    assert pool.key_for(profile) == pool.key_for(dataclasses.replace(profile))
+    assert pool.key_for(profile) != pool.key_for(other)
+    assert not any("s3cret" in str(part) for part in pool.key_for(profile))
+    # Fingerprints are keyed per pool, so they say nothing outside it
+    assert SSHConnectionPool().key_for(profile) != pool.key_for(profile)
+
+
+def test_connections_are_shared_and_reaped_once_idle(ssh_server, pool):
+    profile = ssh_profile(ssh_server)
+    first = pool.acquire(profile)
+    assert pool.acquire(profile) is first
+    assert pool.acquire(dataclasses.replace(profile, password="other")) is not first
+    
+    pool.release(profile)
+    pool.reap_idle()
+    # Still held once
+    assert first.get_transport() is not None and first.get_transport().is_active()
+    
+    pool.release(profile)
+    pool.reap_idle()
+    assert first.get_transport() is None
+    assert pool.acquire(profile) is not first
+
+
+def test_ensure_alive_reconnects_a_dead_transport_in_place(ssh_server, pool):
+    profile = ssh_profile(ssh_server)
+    client = pool.acquire(profile)
+    pool.acquire(profile)
+    assert pool.ensure_alive(profile) is client
+    
+    client.get_transport().close()
+    replacement = pool.ensure_alive(profile)
+    assert replacement is not client and replacement.get_transport().is_active()
+    
+    # Both holders moved over to the replacement
+    pool.release(profile)
+    pool.reap_idle()
+    assert replacement.get_transport() is not None
+    pool.release(profile)
+    pool.reap_idle()
+    assert replacement.get_transport() is None
+
+
+def test_ensure_alive_needs_a_connection(ssh_server, pool):
+    with pytest.raises(RuntimeError):
+        pool.ensure_alive(ssh_profile(ssh_server))
+
+
+def test_full_pool_waits_for_an_idle_connection(ssh_server):
+    pool = SSHConnectionPool(max_connections=1, idle_timeout=0)
+    try:
+        profile = ssh_profile(ssh_server)
+        other = dataclasses.replace(profile, password="other")
+        first = pool.acquire(profile)
+        with pytest.raises(ConnectionError, match="pool is full"):
+            pool.acquire(other, timeout=1)
+        
+        pool.release(profile)
+        assert pool.acquire(other) is not first
+        assert first.get_transport() is None
+    finally:
+        pool.close_all()
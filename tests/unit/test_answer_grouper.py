@@ -0,0 +1,68 @@
+import pytest
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.models.qna_answer_set import QnAAnswerSet
+from bigfix_universal_remote_qna.services.answer_grouper import AnswerGrouper
+
+
+pytestmark = pytest.mark.unit_tests
+
+QUERY = "version of client"
+
+
+def _answered(name, *answers, errors=()):
+    return HostResult(profile_name=name, host=f"{name}.example.com", query=QUERY, exit_code=0, success=True,
+                      answer_set=QnAAnswerSet(query=QUERY, answers=list(answers), errors=list(errors)))
+
+
+def _failed(name, error):
+    return HostResult(profile_name=name, host=f"{name}.example.com", query=QUERY, error=error)
+
+
+def test_identical_answers_share_a_group():
+    grouper = AnswerGrouper()
+    for name in ("a", "b", "c"):
+        grouper.add(_answered(name, "11.0"))
+    grouper.add(_answered("d", "10.0"))
+    
+    groups = grouper.groups(QUERY)
+    assert [(group.answers, group.hosts) for group in groups] == [(("11.0",), ["a", "b", "c"]),
+                                                                  (("10.0",), ["d"])]
+    assert len(grouper) == 2
+    assert grouper.host_count == 4
+
+
+def test_a_host_reported_again_moves_and_empty_groups_go():
+    grouper = AnswerGrouper()
+    grouper.add(_answered("a", "11.0"))
+    grouper.add(_answered("a", "11.0"))
+    assert grouper.group_of("a", QUERY).hosts == ["a"]
+    
+    grouper.add(_answered("a", "12.0"))
+    assert len(grouper) == 1
+    assert grouper.group_of("a", QUERY).answers == ("12.0",)
+
+
+def test_connection_errors_group_without_the_host_name():
+    grouper = AnswerGrouper()
+    grouper.add(_failed("a", "Failed to connect: a.example.com is unreachable\ndetails"))
+    grouper.add(_failed("b", "Failed to connect: b.example.com is unreachable"))
+    group = grouper.group_of("a", QUERY)
+    assert group.hosts == ["a", "b"]
+    assert group.error == "Failed to connect: <host> is unreachable"
+
+
+def test_qna_errors_are_answers_not_failures():
+    grouper = AnswerGrouper()
+    result = _answered("a", errors=["Singular expression refers to nonexistent object."])
+    result.success = False
+    assert grouper.add(result).error == "Singular expression refers to nonexistent object."
+
+
+def test_summary_and_describe():
+    grouper = AnswerGrouper()
+    for name in ("a", "b", "c"):
+        grouper.add(_answered(name, "x", "y"))
+    grouper.add(_answered("d"))
+    assert grouper.summary(QUERY, max_hosts=2) == ("3 hosts: x | y\n    a, b ... and 1 more\n"
+                                                   "1 host: (no answers)\n    d")
+    assert AnswerGrouper.describe(grouper.group_of("a", QUERY), width=4) == "x..."
@@ -0,0 +1,96 @@
+import select
+import threading
+import time
+import pytest
+from bigfix_universal_remote_qna.services.buffered_channel import BufferedChannel
+from bigfix_universal_remote_qna.services.cancel_token import CancelToken, QueryCancelled
+from bigfix_universal_remote_qna.services.command_stream import CommandStream
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+def _finished_channel(*stdout: bytes, stderr: bytes = b"", exit_status: int = 0) -> BufferedChannel:
+    channel = BufferedChannel()
+    for data in stdout:
+        channel.feed_stdout(data)
+    channel.feed_stderr(stderr)
+    channel.finish(exit_status)
+    return channel
+
+
+def test_characters_split_across_chunks_are_decoded_whole():
+    encoded = "A: café ✓\n".encode()
+    # One byte per recv splits both multi-byte characters
+    stream = CommandStream(_finished_channel(encoded), chunk_size=1)
+    chunks = list(stream)
+    
+    assert "".join(text for _, text in chunks) == "A: café ✓\n"
+    assert all("�" not in text for _, text in chunks)
+    assert stream.exit_code == 0
+
+
+def test_truncated_character_is_replaced_at_the_end():
+    stream = CommandStream(_finished_channel("A: é".encode()[:-1]))
+    assert "".join(text for _, text in stream) == "A: �"
+
+
+def test_lines_join_partial_lines_per_stream():
+    channel = _finished_channel(b"A: o", b"ne\r\nA: tw", b"o", stderr=b"E: bad\n", exit_status=3)
+    seen = []
+    stream = CommandStream(channel, on_chunk=lambda name, text: seen.append(name),
+                           on_finish=lambda first_byte, transfer: seen.append("finished"))
+    
+    lines = list(stream.lines())
+    assert [text for name, text in lines if name == "stdout"] == ["A: one", "A: two"]
+    assert [text for name, text in lines if name == "stderr"] == ["E: bad"]
+    assert stream.exit_code == 3
+    assert seen[-1] == "finished" and "stderr" in seen
+    assert channel.closed
+
+
+def test_silence_longer_than_the_timeout_fails():
+    channel = BufferedChannel()
+    channel.feed_stdout(b"A: 1\n")
+    stream = iter(CommandStream(channel, timeout=0.2))
+    assert next(stream) == ("stdout", "A: 1\n")
+    with pytest.raises(RuntimeError, match="no output for 0.2s"):
+        next(stream)
+    assert channel.closed
+
+
+def test_steady_output_keeps_the_stream_alive():
+    channel = BufferedChannel()
+    
+    def trickle():
+        for _ in range(5):
+            channel.feed_stdout(b"A: x\n")
+            time.sleep(0.1)
+        channel.finish(0)
+    
+    threading.Thread(target=trickle, daemon=True).start()
+    assert len(list(CommandStream(channel, timeout=0.3).lines())) == 5
+
+
+def test_cancel_closes_the_channel_and_runs_on_cancel():
+    channel = BufferedChannel()
+    cancel_token = CancelToken()
+    cancelled = []
+    stream = CommandStream(channel, cancel_token=cancel_token, on_cancel=lambda: cancelled.append(True))
+    threading.Timer(0.1, cancel_token.cancel).start()
+    
+    with pytest.raises(QueryCancelled):
+        list(stream)
+    assert channel.closed and cancelled == [True]
+
+
+def test_buffered_channel_is_selectable_only_with_something_to_read():
+    channel = BufferedChannel()
+    assert select.select([channel], [], [], 0)[0] == []
+    channel.feed_stdout(b"data")
+    assert select.select([channel], [], [], 0)[0] == [channel]
+    assert channel.recv(100) == b"data"
+    assert select.select([channel], [], [], 0)[0] == []
+    channel.finish(0)
+    assert select.select([channel], [], [], 0)[0] == [channel]
+    assert channel.recv(100) == b"" and channel.recv_exit_status() == 0
@@ -0,0 +1,144 @@
+import json
+import time
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_probe import HostProbe
+from bigfix_universal_remote_qna.models.os_type import DEFAULT_QNA_PATHS, OSType
+from bigfix_universal_remote_qna.models.transport_type import TransportType
+from bigfix_universal_remote_qna.services.host_probe_cache import HostProbeCache
+from bigfix_universal_remote_qna.services.host_prober import HostProber
+
+
+pytestmark = pytest.mark.unit_tests
+
+WINDOWS_QNA = DEFAULT_QNA_PATHS[OSType.WINDOWS.value]
+LINUX_QNA = DEFAULT_QNA_PATHS[OSType.LINUX.value]
+MAC_QNA = DEFAULT_QNA_PATHS[OSType.MAC.value]
+
+
+class FakeTransport:
+    def __init__(self, profile: ConnectionProfile, output: str):
+        self.profile = profile
+        self.output = output
+        self.commands = []
+    
+    def execute_command(self, command: str, timeout: int = 30):
+        self.commands.append(command)
+        return {'output': self.output, 'error': "", 'exit_code': 0, 'success': True}
+
+
+@pytest.fixture
+def prober():
+    return HostProber(DEFAULT_QNA_PATHS, HostProbeCache())
+
+
+def test_windows_output(prober):
+    probe = prober.parse(f'\r\nMicrosoft Windows [Version 10.0.20348.2340]\r\n"QNA={WINDOWS_QNA}"\r\n')
+    assert (probe.os, probe.os_version, probe.qna_path) == ("windows", "10.0.20348.2340", WINDOWS_QNA)
+    assert probe.probed_at > 0
+
+
+def test_unix_output(prober):
+    probe = prober.parse(f"Linux\nQNA={MAC_QNA}\nQNA={LINUX_QNA}\n")
+    # A Linux path wins over a macOS one found first
+    assert (probe.os, probe.os_version, probe.qna_path) == ("linux", "Linux", LINUX_QNA)
+    assert prober.parse("Darwin\n").os == "mac"
+    assert prober.parse("FreeBSD\nQNA=/opt/qna\n").os == "linux"
+
+
+def test_own_path_is_preferred(prober):
+    probe = prober.parse(f"Linux\nQNA={MAC_QNA}\nQNA=/home/qna\n", own_path="/home/qna")
+    assert probe.qna_path == "/home/qna"
+
+
+def test_unknown_output_has_no_os(prober):
+    for output in ("", "\n\n", "sh: 1: ver: not found\n"):
+        probe = prober.parse(output)
+        assert probe.os == "" and probe.qna_path == ""
+
+
+def test_candidates_put_the_profile_path_first(prober):
+    profile = ConnectionProfile("a", "10.0.0.1", qna_path="/home/qna")
+    windows, unix = prober.candidates(profile)
+    assert windows[0] == WINDOWS_QNA and unix[0] == "/home/qna"
+    assert len(unix) == len(set(unix))
+    
+    windows, unix = prober.candidates(ConnectionProfile("a", "10.0.0.1", qna_path=r"D:\QnA.exe"))
+    assert windows[0] == r"D:\QnA.exe" and r"D:\QnA.exe" not in unix
+    
+    command = HostProber.build_command(windows, unix)
+    assert command.startswith("ver && (") and "|| (uname -s && (" in command
+    assert f'echo "QNA={WINDOWS_QNA}"' in command and f"echo QNA={LINUX_QNA}" in command
+
+
+def test_windows_paths_are_told_apart():
+    assert HostProber.is_windows_path(r"C:\QnA.exe")
+    assert HostProber.is_windows_path(r"%ProgramFiles%\QnA.exe")
+    assert HostProber.is_windows_path(r"\\server\share\QnA.exe")
+    assert not HostProber.is_windows_path("/opt/BESClient/bin/qna")
+
+
+def test_missing_qna_is_recognised():
+    assert HostProber.qna_missing(127, "")
+    assert HostProber.qna_missing(9009, "")
+    assert HostProber.qna_missing(1, "'QnA.exe' is not recognized as an internal or external command")
+    assert not HostProber.qna_missing(1, "Error: syntax error")
+    assert not HostProber.qna_missing(0, None)
+
+
+def test_probes_are_cached_until_forced(prober):
+    transport = FakeTransport(ConnectionProfile("a", "10.0.0.1"), f"Linux\nQNA={LINUX_QNA}\n")
+    assert prober.probe(transport).qna_path == LINUX_QNA
+    assert prober.probe(transport).os == "linux"
+    assert len(transport.commands) == 1
+    
+    prober.probe(transport, force=True)
+    prober.invalidate(transport.profile)
+    prober.probe(transport)
+    assert len(transport.commands) == 3
+
+
+def test_failed_probes_expire_after_negative_ttl(monkeypatch):
+    cache = HostProbeCache(ttl=100, negative_ttl=10)
+    known, unknown = ConnectionProfile("a", "10.0.0.1"), ConnectionProfile("b", "10.0.0.2")
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    cache.put(known, HostProbe(os="linux", probed_at=1000.0))
+    cache.put(unknown, HostProbe(probed_at=1000.0))
+    
+    monkeypatch.setattr(time, "time", lambda: 1050.0)
+    assert cache.get(known).os == "linux"
+    assert cache.get(unknown) is None
+    monkeypatch.setattr(time, "time", lambda: 1101.0)
+    assert cache.get(known) is None
+
+
+def test_keys_include_the_transport():
+    cache = HostProbeCache()
+    ssh = ConnectionProfile("a", "10.0.0.1")
+    local = ConnectionProfile("a", "10.0.0.1", transport=TransportType.LOCAL.value)
+    cache.put(ssh, HostProbe(os="linux", probed_at=time.time()))
+    assert cache.get(local) is None
+    
+    cache.put(local, HostProbe(os="windows", probed_at=time.time()))
+    cache.invalidate(ssh)
+    assert cache.get(ssh) is None and cache.get(local).os == "windows"
+    cache.invalidate()
+    assert cache.get(local) is None
+
+
+def test_file_round_trip_drops_expired_and_bad_entries(tmp_path):
+    cache_file = str(tmp_path / "probes.json")
+    cache = HostProbeCache(cache_file, ttl=100, negative_ttl=10)
+    fresh, stale = ConnectionProfile("a", "10.0.0.1"), ConnectionProfile("b", "10.0.0.2")
+    cache.put(fresh, HostProbe(os="linux", qna_path=LINUX_QNA, probed_at=time.time()))
+    cache.put(stale, HostProbe(probed_at=time.time() - 60))
+    with open(cache_file) as f:
+        data = json.load(f)
+    data["ssh:10.0.0.3:22"] = {"os": "linux", "unknown_field": 1}
+    with open(cache_file, 'w') as f:
+        json.dump(data, f)
+    
+    reloaded = HostProbeCache(cache_file, ttl=100, negative_ttl=10)
+    assert reloaded.get(fresh) == cache.get(fresh)
+    assert reloaded.get(stale) is None
+    assert list(reloaded._entries) == [HostProbeCache.key_for(fresh)]
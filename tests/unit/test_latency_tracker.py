@@ -0,0 +1,67 @@
+import csv
+import json
+import pytest
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+def test_nearest_rank_percentiles():
+    tracker = LatencyTracker()
+    for value in range(1, 101):
+        tracker.record("total", float(value))
+    
+    assert tracker.percentiles("total") == {'count': 100, 'p50': 50.0, 'p95': 95.0, 'p99': 99.0, 'max': 100.0}
+    assert tracker.percentiles("connect") is None
+    
+    single = LatencyTracker()
+    single.record("total", 2.0)
+    assert single.percentiles("total") == {'count': 1, 'p50': 2.0, 'p95': 2.0, 'p99': 2.0, 'max': 2.0}
+
+
+def test_samples_are_kept_per_host_and_per_query():
+    tracker = LatencyTracker()
+    tracker.record("total", 1.0, host="a", query="version  of\nclient")
+    tracker.record("total", 3.0, host="b", query="version of client")
+    
+    assert tracker.percentiles("total")['count'] == 2
+    assert tracker.percentiles("total", LatencyTracker.SCOPE_HOST, "a")['max'] == 1.0
+    # Whitespace in queries does not split their samples
+    assert tracker.percentiles("total", LatencyTracker.SCOPE_QUERY, "version of client")['count'] == 2
+
+
+def test_window_and_key_limits():
+    tracker = LatencyTracker(window=10, max_keys=3)
+    for value in range(20):
+        tracker.record("total", float(value))
+    assert tracker.percentiles("total") == {'count': 10, 'p50': 14.0, 'p95': 19.0, 'p99': 19.0, 'max': 19.0}
+    
+    tracker.record("total", 1.0, host="a")
+    tracker.record("total", 1.0, host="b")
+    tracker.record("total", 1.0, host="c")
+    # The least recently recorded host is forgotten; the overall samples never are
+    assert tracker.percentiles("total", LatencyTracker.SCOPE_HOST, "a") is None
+    assert tracker.percentiles("total", LatencyTracker.SCOPE_HOST, "c") is not None
+    assert tracker.percentiles("total") is not None
+
+
+def test_measure_summary_and_exports(tmp_path):
+    tracker = LatencyTracker()
+    with tracker.measure("connect", host="a"):
+        pass
+    tracker.record("total", 5.0)
+    rows = tracker.summary()
+    assert rows[0]['phase'] == "total"
+    assert {(row['scope'], row['key'], row['phase']) for row in rows} == {
+        ("all", "", "total"), ("all", "", "connect"), ("host", "a", "connect")}
+    
+    tracker.export_csv(str(tmp_path / "latency.csv"))
+    with open(tmp_path / "latency.csv", newline='', encoding='utf-8') as f:
+        assert len(list(csv.DictReader(f))) == 3
+    tracker.export_json(str(tmp_path / "latency.json"))
+    with open(tmp_path / "latency.json", encoding='utf-8') as f:
+        assert json.load(f) == rows
+    
+    tracker.reset()
+    assert tracker.summary() == []
@@ -0,0 +1,58 @@
+import pytest
+
+
+pytestmark = pytest.mark.unit_tests
+
+tk = pytest.importorskip("tkinter")
+
+from bigfix_universal_remote_qna.services.paged_results_viewer import PagedResultsViewer  # noqa: E402
+
+
+@pytest.fixture
+def viewer():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("needs a display")
+    root.withdraw()
+    viewer = PagedResultsViewer(root)
+    viewer.visible_rows = 15
+    viewer.insert("end", "".join(f"A: item {index}\n" for index in range(100)))
+    viewer._render()
+    yield viewer
+    root.destroy()
+
+
+def _shown(viewer):
+    return viewer.text.get("1.0", "end-1c").split("\n")
+
+
+def test_only_the_visible_page_is_in_the_widget_and_it_follows_the_tail(viewer):
+    assert _shown(viewer) == [f"A: item {index}" for index in range(85, 100)]
+    assert viewer.position_var.get() == "Lines 86-100 of 100"
+    
+    viewer.insert("end", "A: item 100\n")
+    viewer._render()
+    assert _shown(viewer)[-1] == "A: item 100"
+
+
+def test_goto_and_scroll_are_clamped_to_the_lines_there_are(viewer):
+    viewer.goto_line(1)
+    assert _shown(viewer)[0] == "A: item 0"
+    assert not viewer.follow_tail
+    
+    viewer.scroll_lines(-10)
+    assert viewer.top_line == 0
+    viewer.goto_line(50)
+    assert viewer.position_var.get() == "Lines 50-64 of 100"
+    
+    viewer.scroll_lines(1000)
+    assert viewer.top_line == 85 and viewer.follow_tail
+
+
+def test_find_next_centres_the_match(viewer):
+    viewer.search_var.set("item 42")
+    viewer.find_next()
+    assert viewer.top_line == 42 - 15 // 2
+    assert "A: item 42" in _shown(viewer)
+    assert viewer.text.tag_ranges("match")
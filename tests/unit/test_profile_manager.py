@@ -0,0 +1,106 @@
+import json
+import os
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.profile_manager import ProfileManager
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+@pytest.fixture
+def profiles_file(tmp_path):
+    return str(tmp_path / "profiles.json")
+
+
+@pytest.fixture
+def manager(profiles_file):
+    manager = ProfileManager(None, None, profiles_file=profiles_file)
+    manager.save_profiles([ConnectionProfile(f"host{index}", f"10.0.0.{index}") for index in range(5)])
+    return manager
+
+
+@pytest.fixture
+def reads(manager, monkeypatch):
+    """Number of times the profiles file was parsed"""
+    count = []
+    read_entries = ProfileManager._read_entries
+    monkeypatch.setattr(ProfileManager, "_read_entries",
+                        staticmethod(lambda path: count.append(path) or read_entries(path)))
+    return count
+
+
+def test_lookups_use_the_index(manager):
+    assert manager.get_profile_index("host3") == 3
+    assert manager.get_profile_index("missing") == -1
+    assert manager.get_profile_by_name("host2").host == "10.0.0.2"
+    assert manager.get_profile_at(4).name == "host4"
+    assert manager.get_profile_at(5) is None
+    assert [profile.name for profile in manager.get_profiles_by_names(["host4", "missing", "host1"])] == \
+        ["host4", "host1"]
+    
+    assert manager.delete_profile("host1")
+    assert manager.get_profile_index("host3") == 2
+    assert manager.get_profile_names() == ["host0", "host2", "host3", "host4"]
+
+
+def test_file_is_read_again_only_when_it_changes(manager, profiles_file, reads):
+    for _ in range(3):
+        manager.get_profile_by_name("host1")
+        manager.get_all_profiles()
+    manager.save_profile(ConnectionProfile("host9", "10.0.0.9"))
+    manager.get_profile_index("host9")
+    assert reads == []
+    
+    # Another process rewrites the file
+    with open(profiles_file, 'w') as f:
+        json.dump([{"name": "other", "host": "10.1.1.1"}], f)
+    assert manager.get_profile_names() == ["other"]
+    assert len(reads) == 1
+
+
+def test_writes_are_atomic_and_keep_untouched_entries(manager, profiles_file, monkeypatch):
+    serialized = []
+    dumps = json.dumps
+    monkeypatch.setattr(json, "dumps", lambda value, **kwargs: serialized.append(value) or dumps(value, **kwargs))
+    manager.save_profile(ConnectionProfile("host3", "10.9.9.9"))
+    # Only the changed profile is serialized again
+    assert [value['name'] for value in serialized] == ["host3"]
+    with open(profiles_file) as f:
+        after = f.read()
+    assert [entry['host'] for entry in json.loads(after)] == ["10.0.0.0", "10.0.0.1", "10.0.0.2", "10.9.9.9", "10.0.0.4"]
+    
+    def fail(source, target):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr(os, "replace", fail)
+    assert not manager.save_profile(ConnectionProfile("host3", "10.8.8.8"))
+    assert not manager.save_profile(ConnectionProfile("new", "10.8.8.8"))
+    assert not manager.delete_profile("host0")
+    monkeypatch.undo()
+    
+    with open(profiles_file) as f:
+        assert f.read() == after
+    assert manager.get_profile_by_name("host3").host == "10.9.9.9"
+    assert manager.get_profile_index("new") == -1
+    assert manager.get_profile_index("host0") == 0
+    assert [name for name in os.listdir(os.path.dirname(profiles_file)) if name.endswith(".tmp")] == []
+
+
+def test_overwrite_needs_confirmation(manager):
+    assert not manager.save_profile(ConnectionProfile("host0", "10.7.7.7"), confirm_overwrite=lambda name: False)
+    assert manager.get_profile_by_name("host0").host == "10.0.0.0"
+    assert manager.save_profile(ConnectionProfile("host0", "10.7.7.7"), confirm_overwrite=lambda name: True)
+    assert manager.get_profile_by_name("host0").host == "10.7.7.7"
+
+
+def test_sqlite_store_imports_the_json_profiles_once(manager, profiles_file, tmp_path):
+    db_file = str(tmp_path / "profiles.db")
+    with_db = ProfileManager(None, None, profiles_file=profiles_file, db_file=db_file)
+    assert with_db.get_profile_names() == manager.get_profile_names()
+    assert with_db.delete_profile("host0")
+    with_db.store.close()
+    
+    reopened = ProfileManager(None, None, profiles_file=profiles_file, db_file=db_file)
+    assert reopened.get_profile_index("host0") == -1
+    reopened.store.close()
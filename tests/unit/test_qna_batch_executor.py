@@ -0,0 +1,52 @@
+import pytest
+from bigfix_universal_remote_qna.services.qna_batch_executor import QnABatchExecutor
+
+
+pytestmark = pytest.mark.unit_tests
+
+QUERIES = ["version of client", "names of files", "now"]
+MARKERS = ["__m0__", "__m1__", "__m2__"]
+
+
+def _run(output, error="", exit_code=0):
+    return {'output': output, 'error': error, 'exit_code': exit_code, 'success': exit_code == 0}
+
+
+def test_demultiplex_splits_on_the_sentinels():
+    output = ("Q: A: 11.0\nT: 1 ms\nQ: A: __m0__\nT: 0 ms\n"
+              "Q: A: a\nA: b\nQ: A: __m1__\n"
+              "Q: E: Singular expression refers to nonexistent object.\nQ: A: __m2__\n")
+    results = QnABatchExecutor.demultiplex(QUERIES, MARKERS, _run(output))
+    
+    assert [result['query'] for result in results] == QUERIES
+    assert [result['answer_set'].query for result in results] == QUERIES
+    assert results[0]['answer_set'].answers == ["11.0"]
+    assert results[0]['answer_set'].eval_time_ms == 1.0
+    assert results[1]['answer_set'].answers == ["a", "b"]
+    # QnA's own errors are answers of a successful run
+    assert results[2]['answer_set'].errors == ["Singular expression refers to nonexistent object."]
+    assert all(result['success'] for result in results)
+
+
+def test_sentinel_output_is_not_an_answer():
+    results = QnABatchExecutor.demultiplex(QUERIES[:1], MARKERS[:1], _run("Q: A: x\nQ: A: __m0__\nT: 0 ms\n"))
+    assert results[0]['answer_set'].answers == ["x"]
+    assert "__m0__" not in results[0]['output']
+
+
+def test_queries_never_reached_fail():
+    results = QnABatchExecutor.demultiplex(QUERIES, MARKERS, _run("Q: A: 11.0\nQ: A: __m0__\nQ: A: a\n",
+                                                                  exit_code=0))
+    assert results[0]['success'] and results[0]['exit_code'] == 0
+    assert results[1]['answer_set'].answers == ["a"]
+    for result in results[1:]:
+        assert not result['success']
+        assert result['exit_code'] == 1
+        assert result['error'] == "QnA exited with code 0"
+
+
+def test_every_query_shares_the_run_stderr_and_exit_code():
+    output = "Q: A: 1\nQ: A: __m0__\nQ: A: 2\nQ: A: __m1__\nQ: A: 3\nQ: A: __m2__\n"
+    results = QnABatchExecutor.demultiplex(QUERIES, MARKERS, _run(output, error="crash\n", exit_code=2))
+    assert [(result['error'], result['exit_code'], result['success']) for result in results] == \
+        [("crash\n", 2, False)] * 3
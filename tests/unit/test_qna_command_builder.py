@@ -0,0 +1,55 @@
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.fake_transport import FakeTransport
+from bigfix_universal_remote_qna.services.qna_command_builder import QnACommandBuilder
+
+
+pytestmark = pytest.mark.unit_tests
+
+TAG = "qna-run-0123456789abcdef"
+
+
+def test_unix_tag_keeps_the_shell_alive():
+    command = QnACommandBuilder.tag_command('"/opt/BESClient/bin/qna"', TAG, "linux")
+    assert command == f': {TAG}; "/opt/BESClient/bin/qna"; exit $?'
+
+
+def test_windows_tag_is_set_in_the_cmd_line():
+    command = QnACommandBuilder.tag_command('echo x | "C:\\QnA.exe"', TAG, "windows")
+    assert command == f'set QNA_RUN_TAG={TAG}&& echo x | "C:\\QnA.exe"'
+
+
+def test_empty_tag_leaves_the_command_alone():
+    assert QnACommandBuilder.tag_command('"/qna"', "", "linux") == '"/qna"'
+    assert QnACommandBuilder.tag_command('"C:\\QnA.exe"', "", "windows") == '"C:\\QnA.exe"'
+
+
+def test_unix_kill_targets_the_tagged_shell_only():
+    command = QnACommandBuilder.build_kill_command(TAG, "/opt/BESClient/bin/qna", "linux")
+    assert f"pgrep -f '[q]{TAG[1:]}'" in command
+    assert TAG not in command
+
+
+def test_windows_kill_targets_the_tagged_cmd_only():
+    command = QnACommandBuilder.build_kill_command(TAG, "C:\\QnA.exe", "windows")
+    assert command.startswith("powershell ")
+    assert "Get-CimInstance Win32_Process" in command
+    assert f"-match 'QNA_RUN_TAG=[q]{TAG[1:]}'" in command
+    assert "taskkill /F /T /PID $_.ProcessId" in command
+    # Neither the kill command's own shell nor other QnA processes match
+    assert f"QNA_RUN_TAG={TAG}" not in command
+    assert "IMAGENAME" not in command
+
+
+@pytest.mark.parametrize("os_type, qna_path", [
+    ("linux", "/opt/BESClient/bin/qna"),
+    ("windows", "C:\\Program Files (x86)\\BigFix Enterprise\\BES Client\\QnA.exe"),
+])
+def test_tagged_commands_still_run(os_type, qna_path):
+    transport = FakeTransport(answers={"version of client": "11.0.1"})
+    transport.connect(ConnectionProfile(name="fake", host="fake", os=os_type, transport="fake"))
+    command = QnACommandBuilder.tag_command(
+        QnACommandBuilder.build_command("version of client", qna_path, os_type), TAG, os_type)
+    result = transport.execute_command(command)
+    assert result['exit_code'] == 0
+    assert "A: 11.0.1" in result['output']
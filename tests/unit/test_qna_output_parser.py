@@ -0,0 +1,81 @@
+import pytest
+from bigfix_universal_remote_qna.services.qna_output_parser import QnAOutputParser
+
+
+pytestmark = pytest.mark.unit_tests
+
+OUTPUT = (
+    "Q: version of client\n"
+    "A: 11.0.1.104\n"
+    "T: 0.052 ms\n"
+    "I: singular version\n"
+    "Q: names of files\n"
+    "A: a.txt\n"
+    "A: b.txt\n"
+    "T: 1.5 s\n"
+    "Q: E: The operator \"foo\" is not defined.\n"
+)
+
+
+def test_parse_splits_output_per_query():
+    answer_sets = QnAOutputParser.parse(OUTPUT)
+    assert [answer_set.query for answer_set in answer_sets] == ["version of client", "names of files", ""]
+    assert answer_sets[0].answers == ["11.0.1.104"]
+    assert answer_sets[0].answer_type == "singular version"
+    assert answer_sets[0].eval_time_ms == pytest.approx(0.052)
+    assert answer_sets[1].answers == ["a.txt", "b.txt"]
+    assert answer_sets[1].answer_count == 2
+    assert answer_sets[1].eval_time_ms == pytest.approx(1500.0)
+    assert answer_sets[2].errors == ['The operator "foo" is not defined.']
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64])
+def test_feed_in_chunks_matches_whole_parse(size):
+    parser = QnAOutputParser()
+    answer_sets = []
+    for start in range(0, len(OUTPUT), size):
+        answer_sets.extend(parser.feed(OUTPUT[start:start + size]))
+    answer_sets.extend(parser.close())
+    assert answer_sets == QnAOutputParser.parse(OUTPUT)
+
+
+def test_answers_on_the_prompt_line_and_crlf():
+    answer_set = QnAOutputParser.parse_block("Q: A: first\r\nA: second\r\nT: 10 us\r\n")
+    assert answer_set.answers == ["first", "second"]
+    assert answer_set.eval_time_ms == pytest.approx(0.01)
+
+
+def test_unmarked_lines_continue_the_last_answer():
+    assert QnAOutputParser.parse_block("A: line one\nline two\n").answers == ["line one\nline two"]
+
+
+def test_close_flushes_a_partial_last_line():
+    parser = QnAOutputParser()
+    assert parser.feed("Q: x\nA: 1") == []
+    answer_sets = parser.close()
+    assert answer_sets[0].answers == ["1"]
+
+
+def test_keep_answers_false_counts_and_reports_answers():
+    seen = []
+    parser = QnAOutputParser(on_answer=lambda answer_set, answer: seen.append(answer), keep_answers=False)
+    answer_sets = parser.feed(OUTPUT) + parser.close()
+    assert seen == ["11.0.1.104", "a.txt", "b.txt"]
+    assert answer_sets[1].answers == []
+    assert answer_sets[1].answer_count == 2
+
+
+def test_to_result_keeps_qna_errors_in_the_output():
+    answer_set = QnAOutputParser.parse_block('A: 1\nE: Singular expression refers to nonexistent object.\n')
+    result = QnAOutputParser.to_result(answer_set, stderr="warning\n", exit_code=0)
+    assert result['output'] == "A: 1\nE: Singular expression refers to nonexistent object.\n"
+    assert result['error'] == "warning\n"
+    assert result['success'] is True
+    assert QnAOutputParser.to_result(answer_set, exit_code=3)['success'] is False
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1.5 ms", 1.5), ("250 us", 0.25), ("250 µs", 0.25), ("2 s", 2000.0), ("3", 3.0), ("", None), ("x ms", None),
+])
+def test_parse_time(value, expected):
+    assert QnAOutputParser.parse_time(value) == (pytest.approx(expected) if expected is not None else None)
@@ -0,0 +1,88 @@
+import pytest
+from bigfix_universal_remote_qna.services.query_history_store import QueryHistoryStore
+
+
+pytestmark = pytest.mark.unit_tests
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def store():
+    store = QueryHistoryStore(half_life_days=1.0)
+    yield store
+    store.close()
+
+
+def test_runs_and_results_are_counted(store):
+    store.add_runs(["version of client", "version of client", "  "], when=10 * DAY)
+    store.add_result("version of client", host="host-a", duration=2.0)
+    store.add_result("version of client", host="host-a", duration=4.0)
+    store.add_result("version of client", host="host-b")
+    store.add_result("never run", host="host-a")
+    
+    entry = store.get("version of client")
+    assert entry.run_count == 2
+    assert entry.last_run == 10 * DAY
+    assert entry.avg_duration == pytest.approx(3.0)
+    assert entry.host_count == 2
+    assert store.hosts("version of client") == ["host-a", "host-b"]
+    assert store.count() == 1
+    assert store.get("never run") is None
+
+
+def test_recent_runs_outrank_older_frequent_ones(store):
+    for day in range(3):
+        store.add_run("old favourite", when=day * DAY)
+    store.add_run("new query", when=5 * DAY)
+    assert [entry.query for entry in store.top()] == ["new query", "old favourite"]
+
+
+def test_search_matches_every_word_and_a_prefix(store):
+    store.add_runs(["name of operating system", "version of client", "names of files"], when=DAY)
+    assert [entry.query for entry in store.search("operating sys")] == ["name of operating system"]
+    assert {entry.query for entry in store.search("of")} == {
+        "name of operating system", "version of client", "names of files"}
+    assert store.search("client version")[0].query == "version of client"
+    assert store.search("registry") == []
+    # Text without words lists the top queries
+    assert len(store.search("  ")) == 3
+
+
+def test_dense_searches_use_the_ranked_window(store, monkeypatch):
+    monkeypatch.setattr(QueryHistoryStore, "DENSE", 2)
+    store.add_runs([f"name of thing {i}" for i in range(5)], when=DAY)
+    store.add_run("name of thing 3", when=2 * DAY)
+    found = store.search("name of", limit=2)
+    assert found[0].query == "name of thing 3"
+    assert len(found) == 2
+
+
+def test_delete(store):
+    store.add_run("now", when=DAY)
+    assert store.delete("now")
+    assert not store.delete("now")
+    assert store.search("now") == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("name of", '"name" "of"*'),
+    ("name of ", '"name" "of"'),
+    ('"c:\\"', '"c"'),
+    ("()", ""),
+])
+def test_match_expression(text, expected):
+    assert QueryHistoryStore.match_expression(text) == expected
+
+
+def test_history_file_persists(tmp_path):
+    db_file = str(tmp_path / "history.db")
+    store = QueryHistoryStore(db_file)
+    store.add_run("version of client", when=DAY)
+    store.close()
+    
+    reopened = QueryHistoryStore(db_file)
+    try:
+        assert reopened.get("version of client").run_count == 1
+    finally:
+        reopened.close()
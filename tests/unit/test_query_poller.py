@@ -0,0 +1,68 @@
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.models.host_result import HostResult
+from bigfix_universal_remote_qna.models.qna_answer_set import QnAAnswerSet
+from bigfix_universal_remote_qna.services.query_poller import QueryPoller
+
+
+pytestmark = pytest.mark.unit_tests
+
+QUERY = "names of files"
+
+
+@pytest.fixture
+def poller():
+    return QueryPoller([ConnectionProfile(name="a", host="a.example.com")], [QUERY], on_delta=lambda delta: None)
+
+
+def _answered(*answers, errors=()):
+    return HostResult(profile_name="a", host="a.example.com", query=QUERY, exit_code=0, success=True,
+                      answer_set=QnAAnswerSet(query=QUERY, answers=list(answers), errors=list(errors)))
+
+
+def _failed(error="", exit_code=-1):
+    return HostResult(profile_name="a", host="a.example.com", query=QUERY, error=error, exit_code=exit_code)
+
+
+def test_first_result_reports_every_answer(poller):
+    delta = poller._compare(_answered("x", "y", "x"))
+    assert delta.first
+    assert delta.added == ["x", "y"]
+    assert delta.removed == []
+    assert (delta.profile_name, delta.host, delta.query) == ("a", "a.example.com", QUERY)
+
+
+def test_unchanged_answers_report_nothing(poller):
+    poller._compare(_answered("x", "y"))
+    assert poller._compare(_answered("y", "x")) is None
+
+
+def test_changes_report_additions_and_removals(poller):
+    poller._compare(_answered("x", "y"))
+    delta = poller._compare(_answered("y", "z"))
+    assert not delta.first
+    assert delta.added == ["z"]
+    assert delta.removed == ["x"]
+
+
+def test_failure_keeps_the_answers_and_recovery_reports_no_change(poller):
+    poller._compare(_answered("x"))
+    failed = poller._compare(_failed("Failed to connect"))
+    assert failed.error == "Failed to connect"
+    assert (failed.added, failed.removed) == ([], [])
+    assert poller._compare(_failed("Failed to connect")) is None
+    
+    recovered = poller._compare(_answered("x"))
+    assert (recovered.added, recovered.removed, recovered.error) == ([], [], "")
+
+
+def test_failure_without_stderr_names_the_exit_code(poller):
+    assert poller._compare(_failed(exit_code=3)).error == "Exit code 3"
+
+
+def test_qna_errors_are_answers(poller):
+    result = _answered(errors=["Singular expression refers to nonexistent object."])
+    result.success = False
+    delta = poller._compare(result)
+    assert delta.error == "Singular expression refers to nonexistent object."
+    assert poller._compare(result) is None
@@ -0,0 +1,78 @@
+import time
+import pytest
+from bigfix_universal_remote_qna.services.query_result_cache import QueryResultCache
+
+
+pytestmark = pytest.mark.unit_tests
+
+RESULT = {'output': "A: 1\n", 'error': "", 'exit_code': 0, 'success': True}
+
+
+def test_hit_returns_a_copy_with_its_age():
+    cache = QueryResultCache()
+    assert cache.put("h:22", "/qna", "version of client", RESULT)
+    cached = cache.get("h:22", "/qna", "version of client")
+    assert cached['output'] == "A: 1\n"
+    assert cached['cache_age'] >= 0
+    cached['output'] = "changed"
+    assert cache.get("h:22", "/qna", "version of client")['output'] == "A: 1\n"
+
+
+def test_key_includes_host_and_qna_path_and_ignores_whitespace_outside_strings():
+    cache = QueryResultCache()
+    cache.put("h:22", "/qna", 'names of  files whose (name of it = "a  b")', RESULT)
+    assert cache.get("h:22", "/qna", ' names of files whose (name of it = "a  b") ') is not None
+    assert cache.get("h:22", "/qna", 'names of files whose (name of it = "a b")') is None
+    assert cache.get("h:23", "/qna", 'names of files whose (name of it = "a  b")') is None
+    assert cache.get("h:22", "/other", 'names of files whose (name of it = "a  b")') is None
+
+
+def test_failures_and_oversized_results_are_not_cached():
+    cache = QueryResultCache(max_result_chars=10)
+    assert not cache.put("h", "/qna", "q", dict(RESULT, success=False, exit_code=1))
+    assert not cache.put("h", "/qna", "q", dict(RESULT, output="A: " + "x" * 20))
+    assert cache.stats()['entries'] == 0
+
+
+def test_entries_expire(monkeypatch):
+    cache = QueryResultCache(default_ttl=10)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.put("h", "/qna", "q", RESULT)
+    assert not QueryResultCache(default_ttl=0).put("h", "/qna", "q", RESULT)
+    
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("h", "/qna", "q") is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryResultCache(max_entries=2)
+    cache.put("h", "/qna", "a", RESULT)
+    cache.put("h", "/qna", "b", RESULT)
+    cache.get("h", "/qna", "a")
+    cache.put("h", "/qna", "c", RESULT)
+    assert cache.get("h", "/qna", "b") is None
+    assert cache.get("h", "/qna", "a") is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_invalidate_one_host():
+    cache = QueryResultCache()
+    cache.put("a", "/qna", "q", RESULT)
+    cache.put("b", "/qna", "q", RESULT)
+    cache.invalidate("a")
+    assert cache.get("a", "/qna", "q") is None
+    assert cache.get("b", "/qna", "q") is not None
+
+
+def test_save_and_load(tmp_path):
+    cache_file = str(tmp_path / "cache.json")
+    cache = QueryResultCache(cache_file=cache_file)
+    cache.put("h", "/qna", "a", RESULT)
+    cache.put("h", "/qna", "slow", RESULT)
+    cache.save()
+    
+    loaded = QueryResultCache(cache_file=cache_file)
+    assert loaded.get("h", "/qna", "a")['output'] == "A: 1\n"
+    assert loaded.stats()['entries'] == 2
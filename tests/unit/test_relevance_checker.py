@@ -0,0 +1,47 @@
+import pytest
+from bigfix_universal_remote_qna.services.relevance_checker import RelevanceChecker
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+@pytest.mark.parametrize("query", [
+    "name of operating system",
+    'names of files of folder "c:\\"',
+    'number of processes whose (name of it = "x")',
+    "version of client as string",
+    "if exists file \"x\" then 1 else 2",
+    "(1;2)",
+    "1 | 2",
+    "not exists regapp \"besclient.exe\"",
+    '(it as string) whose (it contains "1") of (1;2;3)',
+    "(it) whose (it > 1) of (1;2;3)",
+    "(it) whose (it > 1) whose (it < 3) of (1;2;3)",
+    "number of (it) whose (it > 1) of (1;2;3)",
+    "it whose (it > 1) of (1;2)",
+    'there exists file "x"',
+    'not there exists file "x"',
+])
+def test_well_formed_queries_pass(query):
+    assert RelevanceChecker.check(query) is None
+
+
+@pytest.mark.parametrize("query, position, length, message", [
+    ("(name of operating system", 0, 1, "never closed"),
+    ('"abc', 0, 4, "Unterminated string"),
+    ("x == 1", 2, 2, "use '='"),
+    ("a && b", 2, 2, "use 'and'"),
+    ("a || b", 2, 2, "use 'or'"),
+    ("if true then 1", 8, 4, "without a matching 'else'"),
+    ('exists file "x" and', 16, 3, "needs an operand after it"),
+    ("()", 0, 2, "Empty parentheses"),
+    ("whose (it > 1)", 0, 5, "nothing before it"),
+    ("it", 0, 2, "only defined inside"),
+    ('(it as string) whose (it contains "1")', 1, 2, "only defined inside"),
+    ("x of (it) whose (it > 1)", 6, 2, "only defined inside"),
+])
+def test_issues_point_at_the_problem(query, position, length, message):
+    issue = RelevanceChecker.check(query)
+    assert issue is not None
+    assert (issue.position, issue.length) == (position, length)
+    assert message in issue.message
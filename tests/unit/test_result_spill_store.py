@@ -0,0 +1,56 @@
+import os
+import pytest
+from bigfix_universal_remote_qna.services.result_spill_store import ResultSpillStore
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultSpillStore(directory=str(tmp_path))
+    yield store
+    store.close()
+
+
+def test_lines_are_indexed_across_appends(store):
+    assert store.line_count == 0
+    assert store.get_lines(0, 10) == []
+    store.append("A: one\nA: t")
+    assert store.line_count == 2
+    store.append("wo\n")
+    assert store.line_count == 2
+    store.append("A: café\nA: last")
+    
+    assert store.line_count == 4
+    assert store.size == len("A: one\nA: two\nA: café\nA: last".encode())
+    assert store.get_lines(0, 10) == ["A: one", "A: two", "A: café", "A: last"]
+    assert store.get_lines(1, 2) == ["A: two", "A: café"]
+    assert store.get_lines(3, 5) == ["A: last"]
+    assert store.get_lines(-5, 1) == ["A: one"]
+    assert store.get_lines(4, 1) == []
+
+
+def test_search_finds_the_line_and_wraps_once(store):
+    store.append("".join(f"A: item {index}\n" for index in range(100)))
+    
+    assert store.search("item 42") == 42
+    assert store.search("item 4", from_line=5) == 40
+    # Past the last match the search starts over from the top
+    assert store.search("item 4", from_line=50) == 4
+    assert store.search("missing") is None
+    assert store.search("") is None
+
+
+def test_clear_and_close(store):
+    store.append("A: 1\nA: 2\n")
+    assert store.search("2") == 1
+    store.clear()
+    assert store.line_count == 0 and store.size == 0
+    assert store.search("2") is None
+    
+    store.append("A: 3\n")
+    assert store.get_lines(0, 5) == ["A: 3"]
+    path = store.path
+    store.close()
+    assert not os.path.exists(path)
@@ -0,0 +1,81 @@
+import hashlib
+import pytest
+from bigfix_universal_remote_qna.services.security_manager import SecurityManager
+
+
+pytestmark = pytest.mark.unit_tests
+
+pytest.importorskip("cryptography")
+
+
+@pytest.fixture
+def derivations(monkeypatch):
+    """Seeds derived through PBKDF2, with the iteration count lowered to keep tests fast"""
+    monkeypatch.setattr(SecurityManager, "KEY_ITERATIONS", 1000)
+    seeds = []
+    pbkdf2_hmac = hashlib.pbkdf2_hmac
+    
+    def counting(name, password, salt, iterations):
+        seeds.append(password.decode())
+        return pbkdf2_hmac(name, password, salt, iterations)
+    
+    monkeypatch.setattr(hashlib, "pbkdf2_hmac", counting)
+    return seeds
+
+
+def test_keys_are_derived_once_per_seed_until_invalidated(derivations):
+    manager = SecurityManager()
+    key = manager.generate_key("admin@host")
+    assert manager.generate_key("admin@host") == key
+    assert derivations == ["admin@host"]
+    
+    manager.invalidate_key("admin@host")
+    assert manager.generate_key("admin@host") == key
+    manager.generate_key("other@host")
+    manager.wipe()
+    manager.generate_key("other@host")
+    assert derivations == ["admin@host", "admin@host", "other@host", "other@host"]
+
+
+def test_per_profile_passwords_round_trip(derivations):
+    manager = SecurityManager()
+    encrypted = manager.encrypt_profile_password("s3cret", "admin@host")
+    assert encrypted and "s3cret" not in encrypted
+    assert not encrypted.startswith(SecurityManager.MASTER_KEY_PREFIX)
+    assert manager.decrypt_profile_password(encrypted, "admin@host") == "s3cret"
+    # Another session derives the same key
+    assert SecurityManager().decrypt_profile_password(encrypted, "admin@host") == "s3cret"
+    assert manager.encrypt_profile_password("", "admin@host") == ""
+
+
+def test_master_key_replaces_per_profile_derivations(derivations):
+    manager = SecurityManager()
+    record = manager.create_master_key("passphrase")
+    assert manager.unlocked
+    del derivations[:]
+    
+    encrypted = [manager.encrypt_profile_password("s3cret", f"user@host{index}") for index in range(5)]
+    assert all(value.startswith(SecurityManager.MASTER_KEY_PREFIX) for value in encrypted)
+    assert [manager.decrypt_profile_password(value, "ignored") for value in encrypted] == ["s3cret"] * 5
+    assert derivations == []
+    
+    # A new session unlocks once with the stored record
+    session = SecurityManager()
+    with pytest.raises(RuntimeError, match="locked"):
+        session.decrypt_profile_password(encrypted[0], "user@host0")
+    assert not session.unlock("wrong", record)
+    assert not session.unlock("passphrase", "not a record")
+    assert session.unlock("passphrase", record)
+    assert session.decrypt_profile_password(encrypted[0], "user@host0") == "s3cret"
+    
+    session.wipe()
+    assert not session.unlocked
+    with pytest.raises(RuntimeError):
+        session.decrypt_profile_password(encrypted[0], "user@host0")
+
+
+def test_bad_ciphertext_decrypts_to_nothing(derivations):
+    manager = SecurityManager()
+    assert manager.decrypt_profile_password("garbage", "admin@host") == ""
+    other = manager.encrypt_profile_password("s3cret", "admin@host")
+    assert manager.decrypt_profile_password(other, "someone@else") == ""
@@ -0,0 +1,96 @@
+import sqlite3
+import pytest
+from bigfix_universal_remote_qna.models.connection_profile import ConnectionProfile
+from bigfix_universal_remote_qna.services.sqlite_profile_store import SQLiteProfileStore
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+def _profiles():
+    return [
+        ConnectionProfile("web1", "10.0.0.1", os="Linux", tags=["prod", "web"], site="east", group="g1"),
+        ConnectionProfile("db1", "10.0.0.2", os="Linux", tags=["prod", "db"], site="west", group="g1"),
+        ConnectionProfile("win1", "10.0.0.3", os="Windows", tags=["test"], site="east", group="g2",
+                          detected_os="Linux", last_seen=50.0),
+        ConnectionProfile("win2", "win2.example.com", os="Windows", site="east", last_seen=100.0),
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    store.save_profiles(_profiles())
+    yield store
+    store.close()
+
+
+def _names(profiles):
+    return [profile.name for profile in profiles]
+
+
+def test_profiles_round_trip_with_sorted_tags(store):
+    profile = store.get_profile_by_name("db1")
+    assert profile == ConnectionProfile("db1", "10.0.0.2", os="Linux", tags=["db", "prod"],
+                                        site="west", group="g1")
+    assert store.get_profile_by_name("win2").tags == []
+    assert store.get_profile_by_name("missing") is None
+
+
+def test_select_criteria(store):
+    assert _names(store.select(tags=["prod"])) == ["web1", "db1"]
+    assert _names(store.select(tags=["prod", "db"])) == ["db1"]
+    assert _names(store.select(tags=["prod", "test"])) == []
+    # The detected OS wins over the configured one
+    assert _names(store.select(os="Linux")) == ["web1", "db1", "win1"]
+    assert _names(store.select(os="Linux", tags=["prod"], site="east")) == ["web1"]
+    assert _names(store.select(group="g1", tags=["db"])) == ["db1"]
+    assert _names(store.select(site="east", seen_since=60.0)) == ["win2"]
+    assert _names(store.select(name_like="%example%")) == ["win2"]
+    assert _names(store.select()) == ["web1", "db1", "win1", "win2"]
+
+
+def test_updates_keep_position_and_replace_tags(store):
+    store.save_profile(ConnectionProfile("web1", "10.0.0.9", tags=["staging"]))
+    assert store.get_profile_names() == ["web1", "db1", "win1", "win2"]
+    assert store.get_profile_by_name("web1").tags == ["staging"]
+    assert _names(store.select(tags=["prod"])) == ["db1"]
+    assert _names(store.select(tags=["staging"])) == ["web1"]
+    
+    assert store.delete_profile("db1")
+    assert _names(store.select(tags=["prod"])) == []
+    assert store.get_profile_index("win1") == 1
+
+
+def test_tags_column_is_backfilled_from_profile_tags(tmp_path):
+    db_file = str(tmp_path / "old.db")
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        CREATE TABLE profiles (
+            position INTEGER NOT NULL UNIQUE,
+            name TEXT PRIMARY KEY,
+            host TEXT NOT NULL,
+            port INTEGER NOT NULL DEFAULT 22,
+            username TEXT NOT NULL DEFAULT '',
+            password TEXT NOT NULL DEFAULT '',
+            os TEXT NOT NULL DEFAULT '',
+            qna_path TEXT NOT NULL DEFAULT '',
+            grp TEXT NOT NULL DEFAULT '',
+            site TEXT NOT NULL DEFAULT '',
+            last_seen REAL NOT NULL DEFAULT 0,
+            detected_os TEXT NOT NULL DEFAULT ''
+        );
+        CREATE TABLE profile_tags (name TEXT NOT NULL, tag TEXT NOT NULL, PRIMARY KEY (tag, name));
+        INSERT INTO profiles (position, name, host) VALUES (0, 'a', 'h1'), (1, 'b', 'h2');
+        INSERT INTO profile_tags VALUES ('a', 'web'), ('a', 'prod');
+    """)
+    conn.close()
+    
+    store = SQLiteProfileStore(db_file)
+    try:
+        assert store.get_profile_by_name("a").tags == ["prod", "web"]
+        assert store.get_profile_by_name("b").tags == []
+        assert store.get_profile_by_name("b").transport == "ssh"
+        assert _names(store.select(tags=["web"])) == ["a"]
+    finally:
+        store.close()
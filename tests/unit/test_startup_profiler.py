@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+import time
+import pytest
+from bigfix_universal_remote_qna.services.startup_profiler import StartupProfiler
+
+
+pytestmark = pytest.mark.unit_tests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, "perf_counter", clock)
+    return clock
+
+
+def test_phases_and_total_are_reported_in_ms(clock):
+    profiler = StartupProfiler(budget_ms=500)
+    with profiler.phase("imports"):
+        clock.now += 0.2
+    with pytest.raises(ValueError):
+        with profiler.phase("ui"):
+            clock.now += 0.05
+            raise ValueError("failed phases are timed too")
+    clock.now += 0.1
+    
+    assert profiler.report()['total_ms'] == 0.0
+    report = profiler.finish()
+    assert report == {'total_ms': 350.0, 'budget_ms': 500, 'phases': {'imports': 200.0, 'ui': 50.0}}
+    assert not profiler.over_budget
+    
+    # The window is shown once; later calls keep the first total
+    clock.now += 1.0
+    assert profiler.finish()['total_ms'] == 350.0
+
+
+def test_slow_startups_are_flagged(clock, capsys):
+    profiler = StartupProfiler(budget_ms=100)
+    with profiler.phase("imports"):
+        clock.now += 0.3
+    assert not profiler.over_budget
+    profiler.finish()
+    profiler.print_report()
+    
+    assert profiler.over_budget
+    assert capsys.readouterr().out == "✗ Startup took 300ms (budget 100ms): imports 300ms\n"
+
+
+def test_fast_startups_pass(clock, capsys):
+    profiler = StartupProfiler(budget_ms=100)
+    clock.now += 0.05
+    profiler.finish()
+    profiler.print_report()
+    assert capsys.readouterr().out == "✓ Startup took 50ms: \n"
+
+
+def test_budget_comes_from_the_environment(monkeypatch):
+    monkeypatch.setenv("BIGFIX_QNA_STARTUP_BUDGET_MS", "250")
+    assert StartupProfiler().budget_ms == 250
+    monkeypatch.delenv("BIGFIX_QNA_STARTUP_BUDGET_MS")
+    assert StartupProfiler().budget_ms == 1000
+
+
+def test_services_the_window_needs_do_not_load_heavy_modules():
+    # Fresh interpreter, so modules other tests imported do not count
+    code = ("import sys\n"
+            "import bigfix_universal_remote_qna.services.profile_manager\n"
+            "import bigfix_universal_remote_qna.services.security_manager\n"
+            "import bigfix_universal_remote_qna.services.ssh_manager\n"
+            "import bigfix_universal_remote_qna.services.transport_factory\n"
+            "print(' '.join(name for name in ('paramiko', 'cryptography') if name in sys.modules))")
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                               env=dict(os.environ, PYTHONPATH=ROOT))
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ""
@@ -0,0 +1,117 @@
+import pytest
+from bigfix_universal_remote_qna.services.latency_tracker import LatencyTracker
+from bigfix_universal_remote_qna.services.ui_update_queue import UIUpdateQueue
+
+
+pytestmark = pytest.mark.unit_tests
+
+
+class FakeRoot:
+    """Tk root stand-in that records after() calls instead of running a main loop"""
+    
+    def __init__(self):
+        self.scheduled = []
+        self.cancelled = []
+    
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+        return len(self.scheduled)
+    
+    def after_cancel(self, after_id):
+        self.cancelled.append(after_id)
+    
+    def run_next(self):
+        delay, callback = self.scheduled.pop(0)
+        callback()
+        return delay
+
+
+class FakeText:
+    def __init__(self, log):
+        self.log = log
+    
+    def insert(self, index, text):
+        self.log.append(("insert", self, text))
+    
+    def see(self, index):
+        pass
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+def test_appends_are_coalesced_and_kept_in_order_with_calls(root):
+    log = []
+    output, errors = FakeText(log), FakeText(log)
+    queue = UIUpdateQueue(root)
+    queue.start()
+    queue.append_text(output, "A: 1\n")
+    queue.append_text(output, "A: 2\n")
+    queue.post(log.append, "status")
+    queue.append_text(errors, "E: bad\n")
+    queue.append_text(output, "")
+    
+    assert root.run_next() == queue.interval_ms
+    assert log == [("insert", output, "A: 1\nA: 2\n"), "status", ("insert", errors, "E: bad\n")]
+    # Idle again: the next drain comes after the normal interval
+    assert root.scheduled[0][0] == queue.interval_ms
+
+
+def test_large_text_is_spread_over_frames(root):
+    log = []
+    output = FakeText(log)
+    queue = UIUpdateQueue(root, max_chars_per_frame=10)
+    queue.start()
+    queue.append_text(output, "x" * 25)
+    queue.post(log.append, "done")
+    
+    root.run_next()
+    assert log == [("insert", output, "x" * 10)]
+    # More is waiting, so the next frame follows at once
+    assert root.scheduled[0][0] == 1
+    root.run_next()
+    root.run_next()
+    assert log == [("insert", output, "x" * 10)] * 2 + [("insert", output, "x" * 5), "done"]
+
+
+def test_failing_callback_does_not_stop_the_drain(root, capsys):
+    log = []
+    queue = UIUpdateQueue(root)
+    queue.start()
+    queue.post(lambda: 1 / 0)
+    queue.post(log.append, "after")
+    root.run_next()
+    
+    assert log == ["after"]
+    assert "✗ UI update failed" in capsys.readouterr().out
+    assert root.scheduled
+
+
+def test_stop_discards_pending_updates(root):
+    log = []
+    queue = UIUpdateQueue(root)
+    queue.start()
+    queue.start()
+    assert len(root.scheduled) == 1
+    queue.post(log.append, "never")
+    queue.stop()
+    
+    assert root.cancelled == [1]
+    root.scheduled.clear()
+    queue.start()
+    root.run_next()
+    assert log == []
+
+
+def test_render_time_is_tracked_for_busy_frames_only(root):
+    tracker = LatencyTracker()
+    queue = UIUpdateQueue(root, tracker=tracker)
+    queue.start()
+    root.run_next()
+    assert tracker.percentiles("render") is None
+    
+    queue.post(lambda: None)
+    root.run_next()
+    assert tracker.percentiles("render")['count'] == 1
@@ -0,0 +1,52 @@
+import math
+import zipfile
+import pytest
+from bigfix_universal_remote_qna.services.xlsx_stream_writer import XlsxStreamWriter
+
+
+pytestmark = pytest.mark.unit_tests
+
+HEADER = ["Profile", "Answer", "Count"]
+
+
+def test_rows_round_trip_through_openpyxl(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "results.xlsx")
+    with XlsxStreamWriter(path, header=HEADER) as writer:
+        writer.append(["a", "11.0 <&> \"x\"", 3])
+        writer.append(["b", None, 2.5])
+        writer.append(["c", True, math.nan])
+        writer.append(["d", "bad\x01char", 0])
+    
+    sheet = openpyxl.load_workbook(path).active
+    assert sheet.title == "Results"
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+        HEADER,
+        ["a", "11.0 <&> \"x\"", 3],
+        ["b", None, 2.5],
+        ["c", True, "nan"],
+        ["d", "badchar", 0],
+    ]
+
+
+def test_full_sheet_continues_on_a_new_one_with_the_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(XlsxStreamWriter, "MAX_ROWS", 3)
+    monkeypatch.setattr(XlsxStreamWriter, "FLUSH_ROWS", 1)
+    path = str(tmp_path / "results.xlsx")
+    with XlsxStreamWriter(path, header=HEADER) as writer:
+        for index in range(5):
+            writer.append(["host", str(index), index])
+    
+    with zipfile.ZipFile(path) as package:
+        names = package.namelist()
+        second = package.read("xl/worksheets/sheet2.xml").decode()
+        workbook = package.read("xl/workbook.xml").decode()
+    assert {"xl/worksheets/sheet1.xml", "xl/worksheets/sheet2.xml", "xl/worksheets/sheet3.xml"} <= set(names)
+    assert '<row r="1">' in second and ">Profile<" in second
+    assert 'name="Results 2"' in workbook
+
+
+def test_close_twice_is_harmless(tmp_path):
+    writer = XlsxStreamWriter(str(tmp_path / "results.xlsx"))
+    writer.close()
+    writer.close()